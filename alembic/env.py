@@ -22,6 +22,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 from app.database import Base
 from app.models.conversation_log import ConversationLog  # noqa: F401
+from app.models.topic_cluster import TopicCluster  # noqa: F401
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,47 @@
+"""Add topic_cluster table and conversation_log.topic_id
+
+Revision ID: 7c1f4a9d2e10
+Revises: 0536e23fe446
+Create Date: 2026-10-16 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1f4a9d2e10'
+down_revision: Union[str, Sequence[str], None] = '0536e23fe446'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'topic_cluster',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('label', sa.String(length=100), nullable=False),
+        sa.Column('centroid', sa.LargeBinary(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_topic_cluster_id'), 'topic_cluster', ['id'], unique=False)
+    op.add_column('conversation_log', sa.Column('topic_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_conversation_log_topic_id'), 'conversation_log', ['topic_id'], unique=False)
+    op.create_foreign_key(
+        'fk_conversation_log_topic_id', 'conversation_log', 'topic_cluster', ['topic_id'], ['id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_conversation_log_topic_id', 'conversation_log', type_='foreignkey')
+    op.drop_index(op.f('ix_conversation_log_topic_id'), table_name='conversation_log')
+    op.drop_column('conversation_log', 'topic_id')
+    op.drop_index(op.f('ix_topic_cluster_id'), table_name='topic_cluster')
+    op.drop_table('topic_cluster')
@@ -0,0 +1,27 @@
+import json
+
+
+def format_sse(data: dict, event: str | None = None) -> str:
+    """
+    Server-Sent Events 프레임 문자열 생성
+
+    Args:
+        data: JSON으로 직렬화할 페이로드
+        event: 이벤트 이름 (None이면 기본 "message" 이벤트)
+
+    Example:
+        >>> format_sse({"token": "안녕"})
+        'data: {"token": "안녕"}\\n\\n'
+    """
+    payload = json.dumps(data, ensure_ascii=False)
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+
+# SSE 응답 공통 헤더 (프록시 버퍼링 방지)
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
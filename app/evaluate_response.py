@@ -12,8 +12,9 @@ import os
 import json
 import pandas as pd
 from sqlalchemy import create_engine
-from openai import OpenAI
 from dotenv import load_dotenv
+from app.services.llm_client import get_openai_client
+from app.services.result_cache import cached_result
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
@@ -27,10 +28,29 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise ValueError("❌ OPENAI_API_KEY is not set in .env file")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# 공유 커넥션 풀을 사용하는 OpenAI 클라이언트 (레지스트리)
+client = get_openai_client(purpose="evaluation")
 engine = create_engine(DATABASE_URL)
 
+EVALUATION_MODEL = "gpt-4o-mini"
+# 프롬프트를 바꾸면 버전을 올려 결과 캐시를 무효화
+EVALUATION_PROMPT_VERSION = "evaluation-v1"
 
+
+def _is_valid_evaluation(result: dict) -> bool:
+    """API 오류 / JSON 파싱 실패로 만든 기본값 결과는 캐싱하지 않음"""
+    if result["comment"].startswith("Error:"):
+        return False
+    return any(result[k] for k in ("relevance", "clarity", "emotion"))
+
+
+@cached_result(
+    "evaluate_response",
+    EVALUATION_PROMPT_VERSION,
+    EVALUATION_MODEL,
+    key_args=("answer", "question"),
+    should_cache=_is_valid_evaluation,
+)
 def evaluate_response(answer: str, question: str) -> dict:
     """
     OpenAI API를 사용하여 AI 응답의 품질을 평가합니다.
@@ -68,7 +88,7 @@ def evaluate_response(answer: str, question: str) -> dict:
     try:
         # ✅ 최신 OpenAI API 문법 (chat.completions.create)
         response = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=EVALUATION_MODEL,
             messages=[
                 {"role": "system", "content": "You are an AI response quality evaluator. Return only valid JSON."},
                 {"role": "user", "content": prompt}
@@ -123,7 +143,7 @@ def run_evaluation():
 
     동작:
         1. conversation_log 테이블에서 최근 10개의 대화 로그 조회
-        2. 각 대화에 대해 evaluate_response() 함수 호출
+        2. 각 대화에 대해 evaluate_response() 함수 호출 (이미 평가한 질문/답변은 결과 캐시 사용)
         3. 평가 결과를 conversation_evaluation 테이블에 저장
     """
     print("📊 Starting evaluation process...")
@@ -165,7 +185,9 @@ def run_evaluation():
         "relevance": [e["relevance"] for e in evaluations],
         "clarity": [e["clarity"] for e in evaluations],
         "emotion": [e["emotion"] for e in evaluations],
-        "comment": [e["comment"] for e in evaluations]
+        "comment": [e["comment"] for e in evaluations],
+        # 평가 시각 (app/vector_retrain.py가 이후 평가된 대화만 다시 판정하는 워터마크로 사용)
+        "evaluated_at": pd.Timestamp.now(),
     })
 
     # 4. 결과를 conversation_evaluation 테이블에 저장 (기존 테이블 덮어쓰기)
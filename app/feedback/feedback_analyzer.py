@@ -3,33 +3,48 @@
 피드백 감정 분석 모듈 (한글 지원)
 
 OpenAI GPT 기반 감정 분석으로 한글 피드백의 감정과 점수를 추출합니다.
+명확한 긍정/부정 피드백은 로컬 감정 분류기로 먼저 처리하고, 애매한 경우에만 GPT를 호출합니다.
 """
 import logging
-from typing import Dict, Optional
+from typing import Dict
 
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
-from app.core.config import settings
+from app.services.llm_client import get_chat_model
+from app.services.result_cache import cached_result
+from app.services.sentiment_classifier import classify_sentiment
 
 logger = logging.getLogger(__name__)
 
-# LLM 초기화 (싱글톤 패턴)
-_llm_instance: Optional[ChatOpenAI] = None
+FEEDBACK_MODEL = "gpt-4o-mini"
+# 프롬프트를 바꾸면 버전을 올려 결과 캐시를 무효화
+FEEDBACK_PROMPT_VERSION = "feedback-v1"
 
-
-def get_llm() -> ChatOpenAI:
-    """LLM 인스턴스 반환 (lazy initialization)"""
-    global _llm_instance
-    if _llm_instance is None:
-        _llm_instance = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.3,  # 감정 분류는 일관성이 중요
-            openai_api_key=settings.OPENAI_API_KEY,
-        )
-    return _llm_instance
+# 한글 레이블 -> 영어 레이블
+_ENGLISH_LABELS = {
+    "긍정": "positive",
+    "부정": "negative",
+    "중립": "neutral",
+}
 
 
+def get_llm() -> ChatOpenAI:
+    """LLM 인스턴스 반환 (공유 클라이언트 레지스트리의 싱글톤)"""
+    return get_chat_model(
+        FEEDBACK_MODEL,
+        temperature=0.3,  # 감정 분류는 일관성이 중요
+        purpose="feedback_analysis",
+    )
+
+
+@cached_result(
+    "feedback_analyzer",
+    FEEDBACK_PROMPT_VERSION,
+    FEEDBACK_MODEL,
+    key_args=("feedback_text", "polarity_threshold_positive", "polarity_threshold_negative"),
+    should_cache=lambda result: "error" not in result,
+)
 def analyze_feedback(
     feedback_text: str,
     polarity_threshold_positive: float = 0.1,
@@ -59,6 +74,15 @@ def analyze_feedback(
         logger.warning("빈 피드백 텍스트가 입력되었습니다.")
         raise ValueError("피드백 텍스트는 비어있을 수 없습니다.")
 
+    # 로컬 분류기가 확신하면 GPT 호출 생략
+    prediction = classify_sentiment(feedback_text)
+    if prediction:
+        return {
+            "sentiment": _ENGLISH_LABELS[prediction.label],
+            "score": round(max(-1.0, min(1.0, prediction.score)), 3),
+            "korean_label": prediction.label,
+        }
+
     try:
         llm = get_llm()
 
@@ -101,12 +125,7 @@ def analyze_feedback(
             score = _estimate_score_from_label(korean_label)
 
         # 한글 레이블 -> 영어 레이블 변환
-        sentiment_mapping = {
-            "긍정": "positive",
-            "부정": "negative",
-            "중립": "neutral",
-        }
-        english_label = sentiment_mapping.get(korean_label, "neutral")
+        english_label = _ENGLISH_LABELS.get(korean_label, "neutral")
 
         # 점수 범위 검증 및 보정
         score = max(-1.0, min(1.0, score))
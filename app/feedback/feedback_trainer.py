@@ -10,13 +10,12 @@ from datetime import datetime, timedelta
 from collections import Counter
 
 from sqlalchemy.orm import Session
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
 from app.database import get_db
 from app.models.feedback_log import FeedbackLog
 from app.models.conversation_log import ConversationLog
-from app.core.config import settings
+from app.services.llm_client import get_chat_model
 
 logger = logging.getLogger(__name__)
 
@@ -262,11 +261,7 @@ def _generate_suggestions_with_gpt(
         [{"category": "카테고리", "suggestion": "제안 내용"}, ...]
     """
     try:
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.7,
-            openai_api_key=settings.OPENAI_API_KEY,
-        )
+        llm = get_chat_model("gpt-4o-mini", temperature=0.7, purpose="feedback_suggestion")
 
         # 분석 결과 요약
         sample_qa = analysis.get("sample_qa_pairs", [])
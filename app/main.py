@@ -5,8 +5,10 @@ from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
 from app.database import get_db
 from app.core.config import settings
-from app.routers import report, maintenance, feedback
+from app.routers import report, maintenance, feedback, metrics
 from app.utils import slack_command_handler
+from app.services.semantic_cache import get_semantic_cache
+from app.services.analysis_worker import analysis_worker
 
 app = FastAPI(
     title="AI Career 6 Months",
@@ -31,6 +33,7 @@ app.include_router(conversation.router, prefix="/api", tags=["conversation"])
 app.include_router(personal_chat.router, prefix="/api", tags=["personal_chat"])
 app.include_router(insights.router, prefix="/api", tags=["insights"])
 app.include_router(feedback.router, prefix="/api", tags=["feedback"])
+app.include_router(metrics.router, prefix="/api", tags=["metrics"])
 app.include_router(report.router)
 app.include_router(maintenance.router)
 app.include_router(slack_command_handler.router, tags=["slack"])
@@ -42,6 +45,19 @@ def health_check(db=Depends(get_db)):
     return {"status": "ok", "db_time": str(result[0]), "openai_key": bool(settings.OPENAI_API_KEY)}
 
 
+@app.on_event("startup")
+async def start_workers():
+    """대화 분석 백그라운드 워커 시작"""
+    analysis_worker.start()
+
+
+@app.on_event("shutdown")
+async def stop_workers():
+    """워커 중지 후 메모리 캐시를 디스크에 저장"""
+    await analysis_worker.stop()
+    get_semantic_cache().flush()
+
+
 # @app.get("/")
 # def root():
 #    return {"message": "🚀 AI Career 6 Months API is running!"}
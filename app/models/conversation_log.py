@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func
 from app.database import Base
 
 
@@ -11,4 +11,5 @@ class ConversationLog(Base):
     answer = Column(Text, nullable=False)
     sentiment = Column(String(2000), nullable=True)  # ✅ 감정 결과
     topic = Column(String(1000), nullable=True)     # ✅ 주제 결과
+    topic_id = Column(Integer, ForeignKey("topic_cluster.id"), nullable=True, index=True)  # ✅ 정규화된 주제
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime, func
+from app.database import Base
+
+
+class TopicCluster(Base):
+    __tablename__ = "topic_cluster"
+
+    id = Column(Integer, primary_key=True, index=True)
+    label = Column(String(100), nullable=False)  # 대표 주제 (클러스터를 만든 첫 원문 주제)
+    centroid = Column(LargeBinary, nullable=False)  # 정규화된 float32 임베딩 평균
+    size = Column(Integer, nullable=False, default=1)  # 배정된 원문 주제 수
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from app.core.utils import format_sse, SSE_HEADERS
 from app.services.vectorstore import get_vectorstore
-from app.services.llm_service import get_ai_response
+from app.services.llm_service import aget_ai_response, astream_ai_response
 
 router = APIRouter()
 
@@ -26,5 +28,27 @@ class ChatRequest(BaseModel):
 
 @router.post("/chat")
 async def chat(request: ChatRequest):
-    answer = get_ai_response(request.question)
+    answer = await aget_ai_response(request.question)
     return {"user_input": request.question, "ai_answer": answer}
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    /api/chat의 SSE 스트리밍 버전
+
+    - data: {"token": "..."} 이벤트로 토큰 조각을 전송
+    - 마지막에 event: done 으로 전체 답변을 전송
+    """
+    async def event_stream():
+        chunks = []
+        try:
+            async for token in astream_ai_response(request.question):
+                chunks.append(token)
+                yield format_sse({"token": token})
+        except Exception as e:
+            yield format_sse({"error": str(e)}, event="error")
+            return
+        yield format_sse({"user_input": request.question, "ai_answer": "".join(chunks)}, event="done")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
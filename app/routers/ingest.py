@@ -7,7 +7,8 @@ router = APIRouter()
 @router.post("/ingest")
 async def ingest_docs(reset: bool = Query(False, description="기존 Chroma DB 초기화 여부")):
     """
-    docs 폴더의 모든 .txt 문서를 Chroma에 임베딩합니다.
+    docs 폴더의 .txt/.md 문서를 청크로 나눠 Chroma에 임베딩합니다.
+    매니페스트 기준으로 새로 생기거나 바뀐 파일만 임베딩하고, 삭제된 파일의 벡터는 제거합니다.
     reset=true 시 기존 DB를 삭제 후 새로 임베딩합니다.
     """
     result = ingest_documents(reset=reset)
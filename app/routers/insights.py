@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from sqlalchemy import func, case
 from app.database import SessionLocal
 from app.models.conversation_log import ConversationLog
+from app.models.topic_cluster import TopicCluster
 
 router = APIRouter()
 
@@ -23,17 +24,28 @@ def get_stats():
 
 @router.get("/insights/topics")
 def get_topics():
+    """
+    정규화된 주제(topic_cluster)별 대화 수 상위 10개
+
+    원문 주제 문자열 대신 topic_id 정수로 집계하므로, 표현만 다른 비슷한 주제가 하나로 묶입니다.
+    """
     db = SessionLocal()
-    results = (
-        db.query(ConversationLog.topic, func.count().label("count"))
-        .filter(ConversationLog.topic.isnot(None))  # NULL 제외
-        .group_by(ConversationLog.topic)
+    counts = (
+        db.query(ConversationLog.topic_id, func.count().label("count"))
+        .filter(ConversationLog.topic_id.isnot(None))  # 정규화 전 행 제외
+        .group_by(ConversationLog.topic_id)
         .order_by(func.count().desc())
         .limit(10)
+        .subquery()
+    )
+    results = (
+        db.query(TopicCluster.id, TopicCluster.label, counts.c.count)
+        .join(counts, counts.c.topic_id == TopicCluster.id)
+        .order_by(counts.c.count.desc())
         .all()
     )
     db.close()
-    return [{"topic": r.topic, "count": r.count} for r in results]
+    return [{"topic_id": r.id, "topic": r.label, "count": r.count} for r in results]
 
 
 @router.get("/insights/sentiment-trend")
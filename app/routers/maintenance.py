@@ -1,4 +1,8 @@
+from typing import Optional
 from fastapi import APIRouter, BackgroundTasks
+from app.services.collection_alias import get_collection_alias
+from app.services.ingest_service import rebuild_collection, rollback_collection
+from app.services.vector_compaction import compact_collection
 from app.utils.db_cleanup import backup_and_cleanup_logs
 from scripts.feedback_loop import run_feedback_loop
 
@@ -16,3 +20,37 @@ def run_cleanup(background_tasks: BackgroundTasks):
 def run_feedback(background_tasks: BackgroundTasks):
     background_tasks.add_task(run_feedback_loop)
     return {"status": "Feedback loop started in background."}
+
+
+@router.post("/vectorstore/rebuild")
+def rebuild_vectorstore(background_tasks: BackgroundTasks):
+    """
+    블루/그린 재구축을 백그라운드에서 실행
+
+    새 버전 디렉토리에 전체 문서를 임베딩한 뒤 활성 버전 별칭을 원자적으로 전환합니다.
+    재구축 중에도 기존 버전으로 계속 응답합니다 (진행 상황: GET /vectorstore/versions).
+    """
+    background_tasks.add_task(rebuild_collection)
+    return {"status": "Vectorstore rebuild started in background.", "active": get_collection_alias().active_version()}
+
+
+@router.post("/vectorstore/rollback")
+def rollback_vectorstore():
+    """활성 버전을 직전 버전으로 즉시 되돌림"""
+    return rollback_collection()
+
+
+@router.get("/vectorstore/versions")
+def vectorstore_versions():
+    """활성 / 직전 버전, 마지막 전환 시각, 보관 중인 버전 목록"""
+    return get_collection_alias().stats()
+
+
+@router.post("/vectorstore/compact")
+def compact_vectorstore(collection: str = "ai_career_docs", threshold: Optional[float] = None, dry_run: bool = False):
+    """
+    완전 중복(본문 해시) / 근접 중복(코사인 유사도 ≥ threshold) 벡터 일괄 삭제
+
+    회수한 벡터 수 / 디스크 바이트와 삭제 전후 검색 지연을 반환합니다. dry_run=true면 찾기만 합니다.
+    """
+    return compact_collection(collection, threshold=threshold, dry_run=dry_run)
@@ -0,0 +1,165 @@
+from fastapi import APIRouter
+from app.core.config import settings
+from app.services.analysis_worker import analysis_worker
+from app.services.embedding_cache import get_embedding_store
+from app.services.exact_search import get_exact_index
+from app.services.federated_retriever import get_federated_retriever
+from app.services.llm_client import get_client_stats
+from app.services.openai_scheduler import get_scheduler
+from app.services.rag_service import get_context_stats
+from app.services.result_cache import get_result_cache
+from app.services.retriever import get_bm25_index
+from app.services.semantic_cache import get_semantic_cache
+from app.services.sentiment_classifier import get_sentiment_classifier
+from app.services.single_flight import single_flight
+from app.services.topic_index import get_topic_index
+from app.services.vectorstore import get_query_embedding_cache
+
+router = APIRouter()
+
+
+@router.get("/metrics/llm-clients")
+def llm_client_metrics():
+    """
+    공유 LLM 클라이언트 레지스트리 통계
+
+    - pool: 공유 커넥션 풀의 열린 커넥션 수 및 한도
+    - clients: (model, temperature, purpose)별 요청 수, 신규 커넥션 수, 재사용률, 평균 핸드셰이크 시간
+    """
+    return get_client_stats()
+
+
+@router.get("/metrics/semantic-cache")
+def semantic_cache_metrics():
+    """
+    RAG 시맨틱 캐시 통계
+
+    적중/미스/LRU 제거/TTL 만료/무효화 횟수와 평균 적중 유사도를 반환합니다.
+    (SEMANTIC_CACHE_THRESHOLD 튜닝용)
+    """
+    return get_semantic_cache().stats()
+
+
+@router.get("/metrics/coalescing")
+def coalescing_metrics():
+    """
+    동일 질문 병합(single-flight) 통계
+
+    엔드포인트별 호출 수, 진행 중 작업에 합류한 요청 수, 병합 비율을 반환합니다.
+    """
+    return single_flight.stats()
+
+
+@router.get("/metrics/openai-scheduler")
+def openai_scheduler_metrics():
+    """
+    OpenAI 호출 스케줄러 통계
+
+    모델별 RPM/TPM 한도와 잔량, 우선순위(interactive/background/batch)별
+    대기열 길이, 평균/최대 대기 시간, 429 응답 수를 반환합니다.
+    """
+    return get_scheduler().stats()
+
+
+@router.get("/metrics/analysis-worker")
+def analysis_worker_metrics():
+    """
+    대화 분석 백그라운드 워커 통계
+
+    backlog(대기 + 재시도 대기 + 처리 중), 처리/실패/재시도/누락 건수,
+    저장부터 분석 완료까지의 평균/최대 지연을 반환합니다.
+    """
+    return analysis_worker.stats()
+
+
+@router.get("/metrics/sentiment-classifier")
+def sentiment_classifier_metrics():
+    """
+    로컬 감정 분류기 통계
+
+    로컬에서 처리한 호출 수, LLM으로 위임한 호출 수, 절약된 LLM 호출 비율을 반환합니다.
+    """
+    return get_sentiment_classifier().stats()
+
+
+@router.get("/metrics/topic-index")
+def topic_index_metrics():
+    """
+    주제 정규화 인덱스 통계
+
+    클러스터 수, 배정/신규 생성 건수, 원문 주제 메모리 캐시 크기와 적중 수를 반환합니다.
+    """
+    return get_topic_index().stats()
+
+
+@router.get("/metrics/result-cache")
+def result_cache_metrics():
+    """
+    LLM 분석 결과 캐시 통계
+
+    전체 항목 수와 함수별(batch_analyzer, evaluate_response, feedback_analyzer)
+    적중/미스/저장/LRU 제거 횟수와 적중률을 반환합니다.
+    """
+    return get_result_cache().stats()
+
+
+@router.get("/metrics/rag-context")
+def rag_context_metrics():
+    """
+    RAG 검색 컨텍스트 통계
+
+    RAG 호출 수, 호출당 평균 검색 청크 수, 평균/최대 컨텍스트 토큰 수를 반환합니다.
+    """
+    return get_context_stats()
+
+
+@router.get("/metrics/embedding-cache")
+def embedding_cache_metrics():
+    """
+    디스크 임베딩 캐시 통계
+
+    저장된 벡터 수(모델별), 디스크 사용량, 적중/미스/저장 횟수와 적중률을 반환합니다.
+    """
+    return get_embedding_store().stats()
+
+
+@router.get("/metrics/query-embedding-cache")
+def query_embedding_cache_metrics():
+    """
+    질의 임베딩 메모리 LRU 캐시 통계
+
+    항목 수 / 메모리 사용량, 적중/미스/제거/만료 횟수, 미스 시 평균 임베딩 시간과
+    적중으로 절약된 누적 임베딩 지연(latency_saved_ms)을 반환합니다.
+    """
+    return get_query_embedding_cache().stats()
+
+
+@router.get("/metrics/bm25-index")
+def bm25_index_metrics():
+    """
+    하이브리드 검색용 BM25 색인 통계
+
+    색인된 청크 수, 토큰(n-gram) 종류 수, 검색 횟수와 평균 검색 시간을 반환합니다.
+    """
+    return get_bm25_index().stats()
+
+
+@router.get("/metrics/exact-search")
+def exact_search_metrics():
+    """
+    NumPy 정확 검색 엔진 통계 (EXACT_SEARCH_ENABLED)
+
+    유효 행 / 삭제 표시 행 수, 차원, 행렬 크기(바이트), 검색 횟수와 평균 검색 시간을 반환합니다.
+    """
+    return {"enabled": settings.EXACT_SEARCH_ENABLED, **get_exact_index().stats()}
+
+
+@router.get("/metrics/federated-retrieval")
+def federated_retrieval_metrics():
+    """
+    연합 검색 통계 (FEDERATED_RETRIEVAL_ENABLED)
+
+    평균 컨텍스트 토큰 수와, 컬렉션별 검색 지연(평균/최대), 마감 초과 / 오류 횟수,
+    반환 / 선택된 문서 수를 반환합니다.
+    """
+    return {"enabled": settings.FEDERATED_RETRIEVAL_ENABLED, **get_federated_retriever().stats()}
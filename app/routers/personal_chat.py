@@ -1,8 +1,11 @@
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from app.core.utils import format_sse, SSE_HEADERS
 from app.database import SessionLocal
 from app.models.conversation_log import ConversationLog
-from app.services.personalizer import generate_personal_answer
+from app.services.personalizer import agenerate_personal_answer, astream_personal_answer
 
 router = APIRouter()
 
@@ -12,20 +15,47 @@ class PersonalChatRequest(BaseModel):
     user_id: str = "guest"
 
 
+def _load_recent_logs(user_id: str, limit: int = 10):
+    """사용자의 최근 대화 로그 조회 (동기 DB 호출)"""
+    db = SessionLocal()
+    try:
+        return (
+            db.query(ConversationLog)
+            .filter(ConversationLog.user_id == user_id)
+            .order_by(ConversationLog.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+    finally:
+        db.close()
+
+
 @router.post("/personal-chat")
 async def personal_chat(request: PersonalChatRequest):
     question = request.question
     user_id = request.user_id
 
-    db = SessionLocal()
-    recent_logs = (
-        db.query(ConversationLog)
-        .filter(ConversationLog.user_id == user_id)
-        .order_by(ConversationLog.created_at.desc())
-        .limit(10)
-        .all()
-    )
-    db.close()
-
-    response = generate_personal_answer(question, recent_logs)
+    # 동기 DB 조회는 스레드풀에서 실행해 이벤트 루프를 막지 않음
+    recent_logs = await run_in_threadpool(_load_recent_logs, user_id)
+
+    response = await agenerate_personal_answer(question, recent_logs)
     return {"question": question, "answer": response}
+
+
+@router.post("/personal-chat/stream")
+async def personal_chat_stream(request: PersonalChatRequest):
+    """/api/personal-chat의 SSE 스트리밍 버전"""
+    recent_logs = await run_in_threadpool(_load_recent_logs, request.user_id)
+
+    async def event_stream():
+        chunks = []
+        try:
+            async for token in astream_personal_answer(request.question, recent_logs):
+                chunks.append(token)
+                yield format_sse({"token": token})
+        except Exception as e:
+            yield format_sse({"error": str(e)}, event="error")
+            return
+        yield format_sse({"question": request.question, "answer": "".join(chunks)}, event="done")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
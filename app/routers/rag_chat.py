@@ -1,8 +1,15 @@
-from fastapi import APIRouter
+import asyncio
+from fastapi import APIRouter, Header, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.services.rag_service import get_rag_response
+from starlette.background import BackgroundTask
+from app.core.config import settings
+from app.core.utils import format_sse, SSE_HEADERS
+from app.services.deadline import Deadline
+from app.services.rag_service import aget_rag_response, astream_rag_response
 from app.services.conversation_logger import save_conversation
-from app.services.analyzer import analyze_sentiment, extract_topic
+from app.services.analysis_worker import analysis_worker
 
 router = APIRouter()
 
@@ -11,16 +18,83 @@ class RAGRequest(BaseModel):
     question: str
 
 
+def _enqueue_analysis(save: asyncio.Future, answer: str):
+    """저장이 끝나면 감정/주제 분석을 백그라운드 워커에 등록 (저장 실패 시 생략)"""
+    if save.cancelled() or save.exception() is not None:
+        return
+    analysis_worker.enqueue(save.result(), answer)
+
+
 @router.post("/rag-chat")
-async def rag_chat(request: RAGRequest):
-    response = get_rag_response(request.question)
-
-    # ✅ 감정 / 주제 분석 추가
-    sentiment = analyze_sentiment(response)
-    topic = extract_topic(response)
-
-    save_conversation(question=request.question, 
-                      answer=response,
-                      sentiment=sentiment,
-                      topic=topic)
-    return {"question": request.question, "answer": response}
+async def rag_chat(
+    request: RAGRequest,
+    response: Response,
+    x_latency_budget_ms: int | None = Header(None, description="요청 지연 예산 (기본값: RAG_LATENCY_BUDGET_MS)"),
+):
+    """
+    RAG 채팅 (지연 예산 기반 graceful degradation)
+
+    대화는 감정/주제 없이 바로 저장되고, 분석은 백그라운드 워커가 나중에 채웁니다.
+
+    예산이 부족한 단계는 강등되며, 응답 헤더 X-Degraded-Stages 에 기록됩니다.
+    - retrieval: 검색 지연 → 컨텍스트 없이 답변
+    - generation: LLM 지연 → 캐시/안내 문구로 대체
+    - persistence: DB 저장 지연 → 응답을 먼저 반환 (저장은 스레드에서 계속 진행)
+    """
+    deadline = Deadline(x_latency_budget_ms or settings.RAG_LATENCY_BUDGET_MS)
+    answer = await aget_rag_response(request.question, deadline=deadline)
+
+    # ✅ 답변은 즉시 저장하고, 감정 / 주제 분석은 백그라운드 워커가 채움
+    save = asyncio.ensure_future(
+        run_in_threadpool(
+            save_conversation,
+            question=request.question,
+            answer=answer,
+            sentiment=None,
+            topic=None,
+        )
+    )
+    save.add_done_callback(lambda t: _enqueue_analysis(t, answer))
+    try:
+        # shield: 예산 초과로 기다림을 멈춰도 저장 작업 자체는 계속 진행
+        await deadline.run(asyncio.shield(save))
+    except asyncio.TimeoutError:
+        deadline.degrade("persistence")
+
+    response.headers.update(deadline.headers())
+    return {"question": request.question, "answer": answer}
+
+
+@router.post("/rag-chat/stream")
+async def rag_chat_stream(request: RAGRequest):
+    """
+    /api/rag-chat의 SSE 스트리밍 버전
+
+    토큰을 생성 즉시 전송하고, 스트림이 닫힌 뒤 대화 로그를 저장하고
+    감정/주제 분석을 백그라운드 워커에 등록합니다.
+    """
+    chunks: list[str] = []
+
+    async def event_stream():
+        try:
+            async for token in astream_rag_response(request.question):
+                chunks.append(token)
+                yield format_sse({"token": token})
+        except Exception as e:
+            chunks.clear()  # 불완전한 답변은 저장하지 않음
+            yield format_sse({"error": str(e)}, event="error")
+            return
+        yield format_sse({"question": request.question, "answer": "".join(chunks)}, event="done")
+
+    async def after_stream():
+        if chunks:
+            answer = "".join(chunks)
+            log_id = await run_in_threadpool(save_conversation, request.question, answer, None, None)
+            analysis_worker.enqueue(log_id, answer)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+        background=BackgroundTask(after_stream),
+    )
@@ -0,0 +1,243 @@
+"""
+대화 분석 백그라운드 워커
+
+/api/rag-chat 등은 대화를 감정/주제 없이 먼저 저장하고 이 워커에 분석을 맡깁니다.
+워커는 응답 경로 밖에서 batch_analyzer를 호출하고 conversation_log.sentiment / topic을 채웁니다.
+- asyncio 큐 + 동시 워커 N개 (서버 startup 시 시작, shutdown 시 중지)
+- 마이크로 배치: 최대 ANALYSIS_BATCH_SIZE건 또는 ANALYSIS_BATCH_WAIT_MS까지 모아 LLM 1회 호출
+- 실패 시 지수 백오프로 재시도 (최대 ANALYSIS_MAX_RETRIES회), 최종 실패는 NULL로 남김
+- 대기열 길이, 재시도 대기 수, 처리 지연(저장 → 분석 완료) 통계 제공
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.batch_analyzer import aanalyze_batch
+from app.services.conversation_logger import update_conversation_analyses
+
+logger = logging.getLogger(__name__)
+
+
+class _Job:
+    __slots__ = ("log_id", "text", "attempts", "enqueued_at")
+
+    def __init__(self, log_id: int, text: str):
+        self.log_id = log_id
+        self.text = text
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+
+
+class AnalysisWorker:
+    """
+    대화 로그 감정/주제 분석 워커 (이벤트 루프 1개 기준)
+
+    Args:
+        concurrency: 동시에 처리할 배치 수
+        max_retries: 작업당 최대 재시도 횟수
+        retry_base_seconds: 첫 재시도 대기 시간 (이후 2배씩 증가)
+        max_queue_size: 대기열 최대 길이 (초과 시 작업을 버리고 행은 NULL로 남음)
+        batch_size: LLM 1회 호출로 분석할 최대 대화 수
+        batch_wait_ms: 배치를 채우기 위해 기다리는 최대 시간
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        max_retries: int,
+        retry_base_seconds: float,
+        max_queue_size: int,
+        batch_size: int = 1,
+        batch_wait_ms: int = 0,
+    ):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.max_queue_size = max_queue_size
+        self.batch_size = max(batch_size, 1)
+        self.batch_wait_ms = batch_wait_ms
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._retry_tasks: set[asyncio.Task] = set()
+        self._in_progress = 0
+
+        self.enqueued = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.dropped = 0
+        self.batches = 0
+        self.tokens = 0
+        self.local_sentiments = 0
+        self.cache_hits = 0
+        self._lag_seconds_sum = 0.0
+        self._max_lag_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self):
+        """실행 중인 이벤트 루프에서 워커 태스크 시작"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+        logger.info(f"분석 워커 시작: 동시 {self.concurrency}개")
+
+    async def stop(self):
+        """
+        워커 중지
+
+        남은 작업은 버리며, 해당 대화는 sentiment/topic이 NULL로 남습니다.
+        """
+        tasks = [*self._workers, *self._retry_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        remaining = self._queue.qsize() if self._queue else 0
+        self._workers = []
+        self._retry_tasks.clear()
+        self._queue = None
+        if remaining:
+            logger.warning(f"분석 워커 종료: 미처리 작업 {remaining}건은 NULL로 남음")
+
+    def enqueue(self, log_id: int, text: str) -> bool:
+        """
+        분석 작업 등록 (즉시 반환)
+
+        Returns:
+            bool: 등록 성공 여부 (워커 미실행 또는 대기열 초과면 False)
+        """
+        if self._queue is None:
+            self.dropped += 1
+            return False
+        if self._queue.qsize() >= self.max_queue_size:
+            self.dropped += 1
+            logger.warning(f"분석 대기열 초과: conversation_log {log_id} 분석 생략")
+            return False
+        self._queue.put_nowait(_Job(log_id, text))
+        self.enqueued += 1
+        return True
+
+    # -----------------------------------
+    # 내부 처리
+    # -----------------------------------
+    async def _run(self):
+        while True:
+            jobs = await self._next_batch()
+            self._in_progress += len(jobs)
+            try:
+                await self._process(jobs)
+            finally:
+                self._in_progress -= len(jobs)
+                for _ in jobs:
+                    self._queue.task_done()
+
+    async def _next_batch(self) -> list[_Job]:
+        """첫 작업을 기다린 뒤, batch_wait_ms 안에 도착한 작업을 batch_size까지 모음"""
+        jobs = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        until = loop.time() + self.batch_wait_ms / 1000
+        while len(jobs) < self.batch_size:
+            if not self._queue.empty():
+                jobs.append(self._queue.get_nowait())
+                continue
+            remaining = until - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return jobs
+
+    async def _process(self, jobs: list[_Job]):
+        try:
+            result = await aanalyze_batch([(job.log_id, job.text) for job in jobs])
+            await run_in_threadpool(update_conversation_analyses, result.results)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            for job in jobs:
+                self._retry(job, e)
+            return
+
+        self.batches += 1
+        self.tokens += result.tokens
+        self.local_sentiments += result.local_sentiments
+        self.cache_hits += result.cache_hits
+        now = time.monotonic()
+        for job in jobs:
+            if job.log_id not in result.results:
+                self._retry(job, "응답 검증 실패")
+                continue
+            lag = now - job.enqueued_at
+            self.completed += 1
+            self._lag_seconds_sum += lag
+            self._max_lag_seconds = max(self._max_lag_seconds, lag)
+
+    def _retry(self, job: _Job, error):
+        job.attempts += 1
+        if job.attempts > self.max_retries:
+            self.failed += 1
+            logger.error(f"conversation_log {job.log_id} 분석 최종 실패 ({job.attempts}회): {error}")
+            return
+        self.retries += 1
+        delay = self.retry_base_seconds * (2 ** (job.attempts - 1))
+        logger.warning(f"conversation_log {job.log_id} 분석 실패, {delay:.1f}초 후 재시도: {error}")
+        task = asyncio.create_task(self._requeue_later(job, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _requeue_later(self, job: _Job, delay: float):
+        # 워커를 붙잡지 않도록 별도 태스크에서 대기 후 다시 넣음 (재시도는 대기열 한도와 무관)
+        await asyncio.sleep(delay)
+        if self._queue is not None:
+            self._queue.put_nowait(job)
+
+    # -----------------------------------
+    # 통계
+    # -----------------------------------
+    def stats(self) -> dict:
+        """
+        대기열 길이(backlog), 처리/실패/재시도/누락 건수, 배치 크기 / 행당 토큰,
+        로컬 분류기로 감정을 채운 건수 / 비율, 결과 캐시 적중 수, 평균·최대 처리 지연
+        """
+        queued = self._queue.qsize() if self._queue else 0
+        return {
+            "running": self.running,
+            "concurrency": self.concurrency,
+            "backlog": queued + len(self._retry_tasks) + self._in_progress,
+            "queued": queued,
+            "retry_pending": len(self._retry_tasks),
+            "in_progress": self._in_progress,
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "avg_batch_size": round(self.completed / self.batches, 2) if self.batches else 0.0,
+            "tokens_per_row": round(self.tokens / self.completed, 1) if self.completed else 0.0,
+            "local_sentiments": self.local_sentiments,
+            "local_sentiment_ratio": round(self.local_sentiments / self.completed, 3) if self.completed else 0.0,
+            "cache_hits": self.cache_hits,
+            "avg_lag_ms": round(self._lag_seconds_sum / self.completed * 1000, 1) if self.completed else 0.0,
+            "max_lag_ms": round(self._max_lag_seconds * 1000, 1),
+        }
+
+
+analysis_worker = AnalysisWorker(
+    concurrency=settings.ANALYSIS_WORKER_CONCURRENCY,
+    max_retries=settings.ANALYSIS_MAX_RETRIES,
+    retry_base_seconds=settings.ANALYSIS_RETRY_BASE_SECONDS,
+    max_queue_size=settings.ANALYSIS_QUEUE_MAX_SIZE,
+    batch_size=settings.ANALYSIS_BATCH_SIZE,
+    batch_wait_ms=settings.ANALYSIS_BATCH_WAIT_MS,
+)
@@ -1,22 +1,34 @@
-from langchain_openai import ChatOpenAI
+import asyncio
+from typing import Optional
 from langchain_core.messages import HumanMessage
-from app.core.config import settings
+from app.services.deadline import Deadline
+from app.services.llm_client import get_chat_model
+from app.services.result_cache import cached_result
+from app.services.sentiment_classifier import classify_sentiment
 
 
-llm = ChatOpenAI(
-        model="gpt-4o-mini",
+ANALYZER_MODEL = "gpt-4o-mini"
+# 프롬프트를 바꾸면 버전을 올려 결과 캐시를 무효화
+SENTIMENT_PROMPT_VERSION = "sentiment-v1"
+TOPIC_PROMPT_VERSION = "topic-v1"
+
+llm = get_chat_model(
+        ANALYZER_MODEL,
         temperature=0.3,  # 감정 분류는 일관성이 중요
-        openai_api_key=settings.OPENAI_API_KEY
+        purpose="analysis"
     )
 
 
-def analyze_sentiment(text):
-    """문장의 감정을 분석 ('긍정', '중립', '부정')"""
-    prompt = f"다음 문장의 감정을 '긍정', '중립', '부정' 중 정확히 하나의 단어로만 답변해:\n{text}"
-    response = llm.invoke(prompt)
-    result = response.content.strip()
+def _sentiment_prompt(text) -> str:
+    return f"다음 문장의 감정을 '긍정', '중립', '부정' 중 정확히 하나의 단어로만 답변해:\n{text}"
+
+
+def _topic_prompt(text) -> str:
+    return f"다음 문장에서 가장 중심이 되는 주제를 한 단어 또는 짧은 구로 요약해줘:\n{text}"
 
-    # 정규화: LLM 응답을 표준 형식으로 변환
+
+def _normalize_sentiment(result: str) -> str:
+    """LLM 응답을 표준 형식('긍정', '중립', '부정')으로 변환"""
     if "긍정" in result or "positive" in result.lower():
         return "긍정"
     elif "부정" in result or "negative" in result.lower():
@@ -27,8 +39,64 @@ def analyze_sentiment(text):
         return "중립"  # 기본값
 
 
+def local_sentiment(text) -> Optional[str]:
+    """로컬 분류기가 확신하면 감정 라벨, 아니면 None (LLM으로 넘김)"""
+    prediction = classify_sentiment(text)
+    return prediction.label if prediction else None
+
+
+@cached_result("analyzer.sentiment", SENTIMENT_PROMPT_VERSION, ANALYZER_MODEL, key_args=("text",))
+def analyze_sentiment(text):
+    """문장의 감정을 분석 ('긍정', '중립', '부정') - 로컬 분류기가 확신하지 못할 때만 LLM 호출"""
+    label = local_sentiment(text)
+    if label:
+        return label
+    response = llm.invoke(_sentiment_prompt(text))
+    return _normalize_sentiment(response.content.strip())
+
+
+@cached_result("analyzer.topic", TOPIC_PROMPT_VERSION, ANALYZER_MODEL, key_args=("text",))
 def extract_topic(text: str) -> str:
     """문장의 주요 주제 키워드 추출"""
-    prompt = f"다음 문장에서 가장 중심이 되는 주제를 한 단어 또는 짧은 구로 요약해줘:\n{text}"
-    result = llm.invoke([HumanMessage(content=prompt)])
-    return result.content.strip()
\ No newline at end of file
+    result = llm.invoke([HumanMessage(content=_topic_prompt(text))])
+    return result.content.strip()
+
+
+@cached_result("analyzer.sentiment", SENTIMENT_PROMPT_VERSION, ANALYZER_MODEL, key_args=("text",))
+async def aanalyze_sentiment(text, deadline: Optional[Deadline] = None):
+    """
+    analyze_sentiment의 비동기 버전
+
+    deadline이 주어지면 남은 예산 안에서만 실행하고, 초과 시 "sentiment" 단계를
+    강등으로 기록한 뒤 None을 반환합니다.
+    """
+    label = local_sentiment(text)
+    if label:
+        return label
+    try:
+        coro = llm.ainvoke(_sentiment_prompt(text))
+        response = await (deadline.run(coro) if deadline else coro)
+    except asyncio.TimeoutError:
+        if deadline is None:
+            raise
+        deadline.degrade("sentiment")
+        return None
+    return _normalize_sentiment(response.content.strip())
+
+
+@cached_result("analyzer.topic", TOPIC_PROMPT_VERSION, ANALYZER_MODEL, key_args=("text",))
+async def aextract_topic(text: str, deadline: Optional[Deadline] = None) -> Optional[str]:
+    """
+    extract_topic의 비동기 버전
+
+    deadline 초과 시 "topic" 단계를 강등으로 기록하고 None을 반환합니다.
+    """
+    try:
+        coro = llm.ainvoke([HumanMessage(content=_topic_prompt(text))])
+        result = await (deadline.run(coro) if deadline else coro)
+    except asyncio.TimeoutError:
+        if deadline is None:
+            raise
+        deadline.degrade("topic")
+        return None
+    return result.content.strip()
@@ -0,0 +1,238 @@
+"""
+대화 감정/주제 일괄 분석 엔진
+
+analyzer.py는 대화 1건 × 속성 1개마다 LLM을 한 번씩 호출합니다.
+이 모듈은 N건의 대화를 하나의 구조화된 프롬프트로 보내 감정과 주제를 함께 분류합니다.
+- 응답은 JSON 배열 ([{"id", "sentiment", "topic"}, ...]) 로 받고 항목별로 검증
+- 누락/형식 오류 항목만 모아 더 작은 배치로 재시도 (전체 배치를 다시 보내지 않음)
+- 항목별 결과를 결과 캐시에 저장 (키: 입력 텍스트 + 프롬프트 버전 + 모델) → 재시도 / 백필에서 같은 텍스트는 LLM 생략
+- 로컬 감정 분류기가 확신하는 항목은 감정을 로컬 결과로 채우고 LLM에는 주제만 요청
+- 배치별 사용 토큰 수를 집계하여 처리량(행/분, 토큰/행) 보고에 사용
+"""
+import asyncio
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.core.config import settings
+from app.services.analyzer import _normalize_sentiment, local_sentiment
+from app.services.llm_client import get_chat_model
+from app.services.result_cache import get_result_cache, make_key
+
+BATCH_MODEL = "gpt-4o-mini"
+# 프롬프트 / 검증 규칙을 바꾸면 버전을 올려 결과 캐시를 무효화
+BATCH_PROMPT_VERSION = "batch-v1"
+CACHE_FUNCTION = "batch_analyzer"
+# 프롬프트에 넣을 대화 1건의 최대 글자 수 (긴 답변은 앞부분만으로도 충분히 분류 가능)
+MAX_TEXT_CHARS = 1200
+# topic 컬럼 길이 제한 안에서 짧은 구만 허용
+MAX_TOPIC_CHARS = 50
+
+_VALID_SENTIMENTS = ("긍정", "중립", "부정")
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+llm = get_chat_model(BATCH_MODEL, temperature=0.0, purpose="analysis")
+
+
+@dataclass
+class BatchResult:
+    """일괄 분석 결과"""
+    results: dict[int, dict] = field(default_factory=dict)  # id -> {"sentiment", "topic"}
+    failed: list[int] = field(default_factory=list)  # 재시도 후에도 실패한 id
+    llm_calls: int = 0
+    tokens: int = 0
+    local_sentiments: int = 0  # 로컬 분류기로 감정을 채운 항목 수 (LLM에는 주제만 요청)
+    cache_hits: int = 0  # 결과 캐시에서 가져온 항목 수 (LLM에 보내지 않음)
+
+    def merge(self, other: "BatchResult"):
+        self.results.update(other.results)
+        self.llm_calls += other.llm_calls
+        self.tokens += other.tokens
+        self.local_sentiments += other.local_sentiments
+        self.cache_hits += other.cache_hits
+
+
+def _snippet(text: str) -> str:
+    return " ".join(text.split())[:MAX_TEXT_CHARS]
+
+
+def _cache_keys(items: list[tuple[int, str]]) -> dict[int, str]:
+    """항목별 결과 캐시 키 (프롬프트에 들어가는 텍스트 기준, 캐시가 꺼져 있으면 빈 dict)"""
+    if not settings.RESULT_CACHE_ENABLED:
+        return {}
+    return {
+        item_id: make_key(CACHE_FUNCTION, BATCH_PROMPT_VERSION, BATCH_MODEL, [_snippet(text)])
+        for item_id, text in items
+    }
+
+
+def _load_cached(keys: dict[int, str]) -> dict[int, dict]:
+    found = get_result_cache().get_many(CACHE_FUNCTION, list(keys.values())) if keys else {}
+    return {item_id: found[key] for item_id, key in keys.items() if key in found}
+
+
+def _store_cached(keys: dict[int, str], results: dict[int, dict]):
+    if keys:
+        get_result_cache().put_many(
+            CACHE_FUNCTION, {keys[item_id]: value for item_id, value in results.items() if item_id in keys}
+        )
+
+
+def _local_sentiments(items: list[tuple[int, str]]) -> dict[int, str]:
+    """로컬 분류기가 확신하는 항목의 감정 (나머지는 LLM이 분류)"""
+    local = {}
+    for item_id, text in items:
+        label = local_sentiment(text)
+        if label:
+            local[item_id] = label
+    return local
+
+
+def _build_prompt(items: list[tuple[int, str]], local: dict[int, str]) -> str:
+    lines = [
+        "다음 대화 각각에 대해 감정과 주제를 분류해.",
+        "- sentiment: '긍정', '중립', '부정' 중 정확히 하나",
+        "- topic: 가장 중심이 되는 주제를 한 단어 또는 짧은 구로",
+        "'(주제만)'으로 표시된 항목은 sentiment를 생략하고 topic만 답변해.",
+        '반드시 JSON 배열로만 답변해: [{"id": 번호, "sentiment": "...", "topic": "..."}, ...]',
+        "입력의 모든 id를 한 번씩 포함해야 해.",
+        "",
+    ]
+    for item_id, text in items:
+        snippet = _snippet(text)
+        marker = " (주제만)" if item_id in local else ""
+        lines.append(f"[{item_id}]{marker} {snippet}")
+    return "\n".join(lines)
+
+
+def _parse_items(content: str) -> list:
+    """응답에서 JSON 배열 추출 (코드 블록/앞뒤 설명 허용)"""
+    match = _JSON_ARRAY_RE.search(content)
+    if not match:
+        return []
+    try:
+        parsed = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def _validate_item(raw, local: dict[int, str]) -> Optional[tuple[int, dict]]:
+    """항목 1개 검증 - 유효하면 (id, {"sentiment", "topic"}), 아니면 None (로컬 감정이 있으면 그 값 사용)"""
+    if not isinstance(raw, dict):
+        return None
+    try:
+        item_id = int(raw.get("id"))
+    except (TypeError, ValueError):
+        return None
+
+    sentiment = local.get(item_id, raw.get("sentiment"))
+    topic = raw.get("topic")
+    if not isinstance(sentiment, str) or not isinstance(topic, str):
+        return None
+    sentiment = sentiment.strip()
+    if sentiment not in _VALID_SENTIMENTS:
+        # "긍정적", "positive" 같은 변형은 표준값으로 변환, 그 외는 실패 처리
+        if not any(k in sentiment.lower() for k in ("긍정", "중립", "부정", "positive", "neutral", "negative")):
+            return None
+        sentiment = _normalize_sentiment(sentiment)
+    topic = topic.strip().strip("\"'")
+    if not topic:
+        return None
+    return item_id, {"sentiment": sentiment, "topic": topic[:MAX_TOPIC_CHARS]}
+
+
+def _usage_tokens(message) -> int:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return int(usage.get("total_tokens", 0))
+
+
+def _collect(items: list[tuple[int, str]], local: dict[int, str], message) -> BatchResult:
+    expected = {item_id for item_id, _ in items}
+    result = BatchResult(llm_calls=1, tokens=_usage_tokens(message))
+    for raw in _parse_items(message.content):
+        validated = _validate_item(raw, local)
+        if validated and validated[0] in expected:
+            result.results[validated[0]] = validated[1]
+    result.failed = [item_id for item_id, _ in items if item_id not in result.results]
+    return result
+
+
+def _retry_batches(items: list[tuple[int, str]], failed: list[int]) -> list[list[tuple[int, str]]]:
+    """실패 항목을 절반 크기 배치로 나눔 (1건 배치까지 줄어들면 개별 재시도)"""
+    retry_items = [item for item in items if item[0] in set(failed)]
+    size = max(len(retry_items) // 2, 1)
+    return [retry_items[i:i + size] for i in range(0, len(retry_items), size)]
+
+
+def analyze_batch(items: list[tuple[int, str]], max_retries: int = 2) -> BatchResult:
+    """
+    대화 N건의 감정/주제를 한 번의 LLM 호출로 분류
+
+    Args:
+        items: [(id, 분석할 텍스트), ...]
+        max_retries: 실패 항목 재시도 횟수
+
+    Returns:
+        BatchResult: 항목별 결과, 최종 실패 id, LLM 호출 수, 사용 토큰 수, 로컬 감정 분류 수, 캐시 적중 수
+
+    Example:
+        >>> result = analyze_batch([(1, "취업에 성공했어요!"), (2, "면접이 걱정돼요")])
+        >>> result.results[1]
+        {'sentiment': '긍정', 'topic': '취업'}
+    """
+    if not items:
+        return BatchResult()
+    keys = _cache_keys(items)
+    cached = _load_cached(keys)
+    pending = [item for item in items if item[0] not in cached]
+    local = _local_sentiments(pending)
+    total = _analyze(pending, local, max_retries) if pending else BatchResult()
+    _store_cached(keys, total.results)
+    return _finish(total, cached, local)
+
+
+async def aanalyze_batch(items: list[tuple[int, str]], max_retries: int = 2) -> BatchResult:
+    """analyze_batch의 비동기 버전"""
+    if not items:
+        return BatchResult()
+    keys = _cache_keys(items)
+    # 결과 캐시는 sqlite I/O이므로 스레드에서 실행
+    cached = await asyncio.to_thread(_load_cached, keys)
+    pending = [item for item in items if item[0] not in cached]
+    local = _local_sentiments(pending)
+    total = await _aanalyze(pending, local, max_retries) if pending else BatchResult()
+    await asyncio.to_thread(_store_cached, keys, total.results)
+    return _finish(total, cached, local)
+
+
+def _finish(total: BatchResult, cached: dict[int, dict], local: dict[int, str]) -> BatchResult:
+    total.local_sentiments = sum(1 for item_id in local if item_id in total.results)
+    total.results.update(cached)
+    total.cache_hits = len(cached)
+    return total
+
+
+def _analyze(items: list[tuple[int, str]], local: dict[int, str], max_retries: int) -> BatchResult:
+    total = _collect(items, local, llm.invoke(_build_prompt(items, local)))
+    if total.failed and max_retries > 0:
+        failed = total.failed
+        total.failed = []
+        for chunk in _retry_batches(items, failed):
+            retry = _analyze(chunk, local, max_retries - 1)
+            total.merge(retry)
+            total.failed.extend(retry.failed)
+    return total
+
+
+async def _aanalyze(items: list[tuple[int, str]], local: dict[int, str], max_retries: int) -> BatchResult:
+    total = _collect(items, local, await llm.ainvoke(_build_prompt(items, local)))
+    if total.failed and max_retries > 0:
+        failed = total.failed
+        total.failed = []
+        for chunk in _retry_batches(items, failed):
+            retry = await _aanalyze(chunk, local, max_retries - 1)
+            total.merge(retry)
+            total.failed.extend(retry.failed)
+    return total
@@ -0,0 +1,144 @@
+"""
+일괄 임베딩 (인제스트 / 재학습용)
+
+청크를 파일 단위로 하나씩 add_texts 하지 않고, 토큰 수 기준 배치로 묶어
+여러 임베딩 요청을 동시에(상한 있음) 보낸 뒤 Chroma에 배치 단위로 한 번에 upsert 합니다.
+- 배치: EMBED_BATCH_TOKENS 토큰 / EMBED_BATCH_MAX_ITEMS 개 이하
+- 동시 요청: EMBED_CONCURRENCY개 스레드 (속도 제한은 OpenAI 스케줄러가 담당)
+- 호출 측의 priority_scope가 작업 스레드에도 적용되도록 contextvars를 복사해서 실행
+- 진행 상황: tqdm 진행바에 청크/초, 토큰/초 표시
+"""
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Optional
+
+from tqdm import tqdm
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EmbedItem:
+    """임베딩할 청크 1개"""
+    id: str
+    text: str
+    metadata: dict
+    tokens: int
+
+
+@dataclass
+class EmbedReport:
+    """일괄 임베딩 결과"""
+    embedded: int = 0
+    tokens: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    failed_ids: set[str] = field(default_factory=set)
+
+    def summary(self) -> dict:
+        return {
+            "embedded": self.embedded,
+            "tokens": self.tokens,
+            "batches": self.batches,
+            "failed": len(self.failed_ids),
+            "seconds": round(self.seconds, 2),
+            "docs_per_sec": round(self.embedded / self.seconds, 1) if self.seconds else 0.0,
+            "tokens_per_sec": round(self.tokens / self.seconds, 1) if self.seconds else 0.0,
+        }
+
+
+def make_batches(items: list[EmbedItem], max_tokens: int, max_items: int) -> list[list[EmbedItem]]:
+    """순서를 유지하며 토큰 수 / 개수 한도 안에서 배치 구성 (한도보다 큰 청크는 단독 배치)"""
+    batches, current, current_tokens = [], [], 0
+    for item in items:
+        if current and (current_tokens + item.tokens > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += item.tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+class BatchEmbedder:
+    """
+    토큰 기준 배치 + 동시 요청 임베딩 후 Chroma에 일괄 upsert
+
+    Args:
+        store: Chroma 벡터스토어 (embeddings / _collection 사용)
+        batch_tokens: 배치당 최대 토큰 수
+        batch_max_items: 배치당 최대 청크 수
+        concurrency: 동시에 보낼 임베딩 요청 수
+    """
+
+    def __init__(
+        self,
+        store,
+        batch_tokens: Optional[int] = None,
+        batch_max_items: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.store = store
+        self.batch_tokens = batch_tokens or settings.EMBED_BATCH_TOKENS
+        self.batch_max_items = batch_max_items or settings.EMBED_BATCH_MAX_ITEMS
+        self.concurrency = concurrency or settings.EMBED_CONCURRENCY
+
+    def upsert(self, items: list[EmbedItem], progress: bool = False, desc: str = "임베딩") -> EmbedReport:
+        """
+        청크를 임베딩하여 ID 기준으로 upsert
+
+        실패한 배치는 건너뛰고 해당 ID를 report.failed_ids에 담아 반환합니다
+        (ID가 결정적이므로 다음 실행에서 같은 ID로 다시 upsert 하면 됨).
+        """
+        report = EmbedReport()
+        if not items:
+            return report
+
+        batches = make_batches(items, self.batch_tokens, self.batch_max_items)
+        started = time.perf_counter()
+        bar = tqdm(total=len(items), desc=desc, unit="chunk", disable=not progress)
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="embed") as pool:
+                # 스레드마다 호출 측 컨텍스트(priority_scope 등)를 복사해서 실행
+                futures = {
+                    pool.submit(contextvars.copy_context().run, self._embed, batch): batch
+                    for batch in batches
+                }
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    try:
+                        vectors = future.result()
+                        # Chroma 쓰기는 호출 스레드에서 배치 단위로 한 번에 수행
+                        self.store._collection.upsert(
+                            ids=[item.id for item in batch],
+                            embeddings=vectors,
+                            documents=[item.text for item in batch],
+                            metadatas=[item.metadata for item in batch],
+                        )
+                        report.embedded += len(batch)
+                        report.tokens += sum(item.tokens for item in batch)
+                        report.batches += 1
+                    except Exception as e:
+                        logger.warning(f"임베딩 배치 실패 ({len(batch)}개 청크): {e}")
+                        report.failed_ids.update(item.id for item in batch)
+
+                    bar.update(len(batch))
+                    elapsed = time.perf_counter() - started
+                    if elapsed > 0:
+                        bar.set_postfix(
+                            docs_s=f"{report.embedded / elapsed:.1f}",
+                            tokens_s=f"{report.tokens / elapsed:.0f}",
+                        )
+        finally:
+            bar.close()
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _embed(self, batch: list[EmbedItem]) -> list[list[float]]:
+        return self.store.embeddings.embed_documents([item.text for item in batch])
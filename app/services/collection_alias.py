@@ -0,0 +1,184 @@
+"""
+벡터스토어 블루/그린 전환 (버전 디렉토리 + 별칭 파일)
+
+재구축은 CHROMA_PATH/versions/<버전>/ 에 새 컬렉션을 만들고, 끝나면 별칭 파일
+(CHROMA_PATH/active_collection.json)을 임시 파일 + os.replace로 원자적으로 교체합니다.
+- 실행 중인 API 워커는 store를 가져올 때마다 별칭 파일 mtime을 확인하여, 바뀌었으면
+  새 버전 디렉토리의 store 핸들로 전환 (재시작 불필요)
+- 이전 버전 디렉토리는 남겨 두므로 롤백은 별칭만 되돌리면 즉시 적용
+- 별칭 파일이 없으면 기존처럼 CHROMA_PATH 자체를 사용 (레거시 레이아웃, 버전명 "legacy")
+인제스트 매니페스트 / BM25 색인 / 정확 검색 행렬은 store 디렉토리 안에 있으므로 버전과 함께 전환됩니다.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALIAS_FILE = "active_collection.json"
+VERSIONS_DIR = "versions"
+LEGACY_VERSION = "legacy"
+
+
+class CollectionAlias:
+    """
+    활성 벡터스토어 버전 별칭 (스레드 안전, 여러 프로세스가 같은 파일 공유)
+
+    Args:
+        root: CHROMA_PATH (별칭 파일과 versions/ 디렉토리 위치)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.path = os.path.join(root, ALIAS_FILE)
+        self._lock = threading.Lock()
+        self._state = {"active": LEGACY_VERSION, "previous": None, "switched_at": None}
+        self._loaded_mtime: Optional[float] = None
+        self.reloads = 0
+        self._refresh()
+        self.reloads = 0  # 시작 시 로드는 전환 횟수에서 제외
+
+    # -----------------------------------
+    # 조회
+    # -----------------------------------
+    def active_version(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state["active"]
+
+    def active_path(self) -> str:
+        return self.version_path(self.active_version())
+
+    def version_path(self, version: str) -> str:
+        if version == LEGACY_VERSION:
+            return self.root
+        return os.path.join(self.root, VERSIONS_DIR, version)
+
+    def versions(self) -> list[str]:
+        """존재하는 버전 목록 (오래된 순, 레거시 DB가 있으면 맨 앞)"""
+        versions_dir = os.path.join(self.root, VERSIONS_DIR)
+        names = sorted(os.listdir(versions_dir)) if os.path.isdir(versions_dir) else []
+        if os.path.exists(os.path.join(self.root, "chroma.sqlite3")):
+            names.insert(0, LEGACY_VERSION)
+        return names
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refresh()
+            return {
+                **self._state,
+                "path": self.version_path(self._state["active"]),
+                "versions": self.versions(),
+                "reloads": self.reloads,
+            }
+
+    # -----------------------------------
+    # 생성 / 전환 / 롤백
+    # -----------------------------------
+    def create_version(self) -> str:
+        """새 버전 디렉토리 생성 (이름: v날짜-시각)"""
+        base = f"v{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        version, suffix = base, 1
+        while os.path.exists(self.version_path(version)):
+            suffix += 1
+            version = f"{base}-{suffix}"
+        os.makedirs(self.version_path(version))
+        return version
+
+    def switch(self, version: str) -> dict:
+        """별칭을 version으로 원자적으로 교체 (현재 버전은 previous로 보관)"""
+        if version != LEGACY_VERSION and not os.path.isdir(self.version_path(version)):
+            raise ValueError(f"존재하지 않는 버전입니다: {version}")
+        with self._lock:
+            self._refresh()
+            if version == self._state["active"]:
+                return dict(self._state)
+            state = {
+                "active": version,
+                "previous": self._state["active"],
+                "switched_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            self._state = state
+            self._loaded_mtime = os.path.getmtime(self.path)
+        logger.info(f"벡터스토어 전환: {state['previous']} → {version}")
+        return dict(state)
+
+    def rollback(self) -> dict:
+        """직전 버전으로 되돌림 (다시 호출하면 원래 버전으로 돌아감)"""
+        with self._lock:
+            self._refresh()
+            previous = self._state["previous"]
+        if not previous:
+            raise ValueError("되돌릴 이전 버전이 없습니다.")
+        return self.switch(previous)
+
+    def remove_version(self, version: str):
+        """버전 디렉토리 삭제 (활성 / 직전 / 레거시 버전은 삭제하지 않음)"""
+        with self._lock:
+            self._refresh()
+            protected = {self._state["active"], self._state["previous"], LEGACY_VERSION}
+        if version in protected:
+            raise ValueError(f"삭제할 수 없는 버전입니다: {version}")
+        shutil.rmtree(self.version_path(version), ignore_errors=True)
+
+    def prune(self, keep: int) -> list[str]:
+        """활성 / 직전 버전 외에 최근 keep개를 넘는 오래된 버전 디렉토리 삭제"""
+        with self._lock:
+            self._refresh()
+            protected = {self._state["active"], self._state["previous"], LEGACY_VERSION}
+        candidates = [v for v in self.versions() if v not in protected]
+        removed = candidates[:max(len(candidates) - max(keep - 2, 0), 0)]
+        for version in removed:
+            shutil.rmtree(self.version_path(version), ignore_errors=True)
+        return removed
+
+    # -----------------------------------
+    # 내부 헬퍼 (호출 측에서 lock 보유)
+    # -----------------------------------
+    def _refresh(self):
+        """다른 프로세스가 별칭을 바꿨으면 다시 로드"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if (state.get("active") or LEGACY_VERSION) != self._state["active"]:
+            self.reloads += 1
+            logger.info(f"벡터스토어 별칭 변경 감지: {self._state['active']} → {state.get('active')}")
+        self._state = {
+            "active": state.get("active") or LEGACY_VERSION,
+            "previous": state.get("previous"),
+            "switched_at": state.get("switched_at"),
+        }
+        self._loaded_mtime = mtime
+
+
+@lru_cache(maxsize=1)
+def get_collection_alias() -> CollectionAlias:
+    """CollectionAlias 싱글톤 반환"""
+    return CollectionAlias(settings.CHROMA_PATH)
+
+
+def active_store_path() -> str:
+    """현재 활성 버전의 Chroma 디렉토리"""
+    return get_collection_alias().active_path()
+
+
+def is_reserved_entry(name: str) -> bool:
+    """레거시 디렉토리(CHROMA_PATH)를 초기화할 때 남겨 둘 항목 (다른 버전 / 별칭 파일)"""
+    return name in (VERSIONS_DIR, ALIAS_FILE)
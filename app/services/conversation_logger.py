@@ -1,18 +1,41 @@
 """
 대화 로그 저장 서비스
 """
+import logging
+
+from app.core.config import settings
 from app.database import SessionLocal
 from app.models.conversation_log import ConversationLog
 
+logger = logging.getLogger(__name__)
+
+
+def _canonical_topic_ids(topics: list[str | None]) -> list[int | None]:
+    """원문 주제를 정규화된 주제 ID로 매핑 (실패 시 None - scripts/backfill_topic_ids.py로 보충)"""
+    if not settings.TOPIC_CANONICALIZATION_ENABLED or not any(topics):
+        return [None] * len(topics)
+    from app.services.topic_index import get_topic_index
+
+    try:
+        return get_topic_index().assign_many(topics)
+    except Exception as e:
+        logger.warning(f"주제 정규화 실패 (topic_id 없이 저장): {e}")
+        return [None] * len(topics)
+
 
-def save_conversation(question: str, answer: str, sentiment: str, topic: str, user_id: str = "guest"):
+def save_conversation(question: str, answer: str, sentiment: str | None, topic: str | None, user_id: str = "guest") -> int:
     """
     대화 내용을 데이터베이스에 저장합니다.
 
     Args:
         question: 사용자 질문
         answer: AI 응답
+        sentiment: 감정 분석 결과 (분석 전이면 None)
+        topic: 주제 분석 결과 (분석 전이면 None)
         user_id: 사용자 ID (기본값: "guest")
+
+    Returns:
+        int: 저장된 대화 로그 ID
     """
     db = SessionLocal()
     try:
@@ -25,6 +48,44 @@ def save_conversation(question: str, answer: str, sentiment: str, topic: str, us
         )
         db.add(log)
         db.commit()
+        return log.id
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+def update_conversation_analyses(results: dict[int, dict]) -> int:
+    """
+    저장된 대화들의 감정 / 주제 분석 결과를 한 번의 트랜잭션으로 채웁니다 (분석 워커 / 백필용).
+
+    Args:
+        results: {대화 로그 ID: {"sentiment": str, "topic": str}}
+
+    Returns:
+        int: 갱신된 행 수
+
+    Note:
+        주제는 topic_index로 정규화하여 topic_id도 함께 저장합니다.
+    """
+    if not results:
+        return 0
+    topic_ids = _canonical_topic_ids([values.get("topic") for values in results.values()])
+    db = SessionLocal()
+    try:
+        updated = 0
+        for (log_id, values), topic_id in zip(results.items(), topic_ids):
+            updated += (
+                db.query(ConversationLog)
+                .filter(ConversationLog.id == log_id)
+                .update(
+                    {"sentiment": values.get("sentiment"), "topic": values.get("topic"), "topic_id": topic_id},
+                    synchronize_session=False,
+                )
+            )
+        db.commit()
+        return updated
     except Exception as e:
         db.rollback()
         raise e
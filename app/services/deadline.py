@@ -0,0 +1,70 @@
+"""
+요청 지연 예산(deadline) 관리
+
+요청마다 Deadline 객체를 만들어 파이프라인 단계(검색 → 생성 → 분석 → 저장)에 전달하고,
+남은 예산이 부족한 단계는 건너뛰거나 대체 경로로 처리(graceful degradation)합니다.
+강등된 단계는 응답 헤더(X-Degraded-Stages)로 노출됩니다.
+"""
+import asyncio
+import time
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """
+    요청 단위 지연 예산
+
+    Args:
+        budget_ms: 전체 지연 예산 (밀리초)
+
+    Example:
+        >>> deadline = Deadline(8000)
+        >>> docs = await deadline.run(search(query), max_ms=2000)  # 시간 초과 시 TimeoutError
+        >>> deadline.degrade("retrieval")
+    """
+
+    def __init__(self, budget_ms: int):
+        self.budget_ms = budget_ms
+        self._started = time.monotonic()
+        self.degraded: list[str] = []
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self._started) * 1000
+
+    def remaining_ms(self) -> float:
+        return max(self.budget_ms - self.elapsed_ms(), 0.0)
+
+    def remaining(self) -> float:
+        """남은 예산 (초)"""
+        return self.remaining_ms() / 1000
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining_ms() <= 0
+
+    async def run(self, aw: Awaitable[T], max_ms: Optional[float] = None) -> T:
+        """
+        남은 예산(및 max_ms 중 작은 값) 안에 aw를 실행
+
+        Raises:
+            asyncio.TimeoutError: 시간 안에 끝나지 않은 경우 (aw는 취소됨)
+        """
+        timeout_ms = self.remaining_ms()
+        if max_ms is not None:
+            timeout_ms = min(timeout_ms, max_ms)
+        return await asyncio.wait_for(aw, timeout=timeout_ms / 1000)
+
+    def degrade(self, stage: str):
+        """강등된 단계 기록 (중복 무시)"""
+        if stage not in self.degraded:
+            self.degraded.append(stage)
+
+    def headers(self) -> dict[str, str]:
+        """응답 헤더로 노출할 예산/강등 정보"""
+        return {
+            "X-Latency-Budget-Ms": str(self.budget_ms),
+            "X-Elapsed-Ms": str(int(self.elapsed_ms())),
+            "X-Degraded-Stages": ",".join(self.degraded) or "none",
+        }
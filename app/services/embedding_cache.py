@@ -0,0 +1,247 @@
+"""
+디스크 임베딩 캐시 (인제스트 / 재학습 / 질의 공용)
+
+OpenAIEmbeddings 앞에 두어 같은 (모델, 텍스트)는 한 번만 임베딩합니다.
+Chroma를 초기화하거나(reset_chroma) 재학습으로 디렉토리를 옮겨도 캐시는 CHROMA_PATH 밖에
+있으므로, 재구축 시 바뀌지 않은 텍스트는 OpenAI를 다시 호출하지 않습니다.
+- 키: sha256(모델 + 텍스트) → 모델을 바꿨다가 되돌려도 이전 벡터 재사용
+- 저장: sqlite 인덱스(키 → 행 번호) + 차원별 float32 파일(numpy memmap으로 읽기)
+- 여러 프로세스(API 서버 / 스크립트)가 같은 캐시를 공유 (쓰기는 sqlite 잠금으로 직렬화)
+- 항목은 추가만 하며 제거하지 않음 (1536차원 기준 항목당 약 6KB)
+- 비동기 메서드는 sqlite / memmap I/O를 스레드에서 실행하여 이벤트 루프를 막지 않음
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    (모델, 텍스트) → float32 벡터 디스크 저장소 (스레드 / 프로세스 안전)
+
+    Args:
+        directory: 저장 디렉토리 (index.sqlite3, vectors_{차원}.f32)
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._maps: dict[int, np.memmap] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"), check_same_thread=False, timeout=30.0, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                row INTEGER NOT NULL
+            )
+            """
+        )
+
+    def get_many(self, keys: list[str]) -> list[Optional[np.ndarray]]:
+        """키 목록의 벡터 반환 (없는 키는 None)"""
+        if not keys:
+            return []
+        with self._lock:
+            found: dict[str, tuple[int, int]] = {}
+            unique = list(dict.fromkeys(keys))
+            # sqlite 변수 개수 제한을 피하기 위해 나눠서 조회
+            for i in range(0, len(unique), 500):
+                part = unique[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, dim, row FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part
+                ).fetchall()
+                found.update({key: (dim, row) for key, dim, row in rows})
+
+            vectors = []
+            for key in keys:
+                location = found.get(key)
+                vector = self._read(*location) if location else None
+                vectors.append(vector)
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+            return vectors
+
+    def put_many(self, model: str, items: list[tuple[str, list[float]]]):
+        """(키, 벡터) 목록 저장 (이미 있는 키는 건너뜀)"""
+        if not items:
+            return
+        with self._lock:
+            try:
+                # BEGIN IMMEDIATE: 다른 프로세스와 파일 끝 위치(행 번호)가 겹치지 않도록 쓰기 잠금
+                self._conn.execute("BEGIN IMMEDIATE")
+                by_dim: dict[int, list[tuple[str, np.ndarray]]] = {}
+                for key, vector in dict(items).items():
+                    if self._conn.execute("SELECT 1 FROM embeddings WHERE key = ?", (key,)).fetchone():
+                        continue
+                    array = np.asarray(vector, dtype=np.float32)
+                    by_dim.setdefault(int(array.shape[0]), []).append((key, array))
+
+                rows = []
+                for dim, arrays in by_dim.items():
+                    row_bytes = dim * 4
+                    with open(self._vector_path(dim), "ab") as f:
+                        # 이전 쓰기가 중간에 끊겨 남은 조각이 있으면 행 경계까지 채움
+                        if f.tell() % row_bytes:
+                            f.write(b"\0" * (row_bytes - f.tell() % row_bytes))
+                        first_row = f.tell() // row_bytes
+                        f.write(b"".join(array.tobytes() for _, array in arrays))
+                    rows.extend((key, model, dim, first_row + i) for i, (key, _) in enumerate(arrays))
+                self._conn.executemany("INSERT INTO embeddings (key, model, dim, row) VALUES (?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+                self.stores += len(rows)
+            except Exception as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                logger.warning(f"임베딩 캐시 저장 실패: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            models = dict(self._conn.execute("SELECT model, COUNT(*) FROM embeddings GROUP BY model").fetchall())
+            lookups = self.hits + self.misses
+            return {
+                "size": size,
+                "models": models,
+                "disk_bytes": sum(
+                    os.path.getsize(os.path.join(self.directory, name)) for name in os.listdir(self.directory)
+                ),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    # -----------------------------------
+    # 내부 헬퍼 (호출 측에서 lock 보유)
+    # -----------------------------------
+    def _vector_path(self, dim: int) -> str:
+        return os.path.join(self.directory, f"vectors_{dim}.f32")
+
+    def _read(self, dim: int, row: int) -> Optional[np.ndarray]:
+        mapped = self._maps.get(dim)
+        if mapped is None or row >= mapped.shape[0]:
+            # 다른 스레드 / 프로세스가 파일 끝에 추가한 행을 보려면 다시 매핑
+            path = self._vector_path(dim)
+            rows = os.path.getsize(path) // (dim * 4) if os.path.exists(path) else 0
+            if row >= rows:
+                return None
+            mapped = np.memmap(path, dtype=np.float32, mode="r", shape=(rows, dim))
+            self._maps[dim] = mapped
+        return np.array(mapped[row])
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    디스크 캐시를 거치는 Embeddings 래퍼
+
+    캐시에 없는 텍스트만 모아 내부 임베딩 모델에 한 번에 요청합니다.
+
+    Args:
+        embeddings: 실제 임베딩 모델 (OpenAIEmbeddings)
+        model: 캐시 키에 쓰는 모델명
+        store: 디스크 저장소 (기본값: get_embedding_store())
+        cache_queries: False면 embed_query는 디스크 캐시를 거치지 않음
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        store: Optional[EmbeddingStore] = None,
+        cache_queries: bool = True,
+    ):
+        self.embeddings = embeddings
+        self.model = model
+        self.store = store or get_embedding_store()
+        self.cache_queries = cache_queries
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, vectors, missing = self._lookup(texts)
+        if missing:
+            self._fill(keys, vectors, missing, self.embeddings.embed_documents([texts[i] for i in missing]))
+        return vectors
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        # 저장소는 lock + sqlite 쓰기 잠금(최대 30초)을 기다릴 수 있으므로 스레드에서 실행
+        keys, vectors, missing = await asyncio.to_thread(self._lookup, texts)
+        if missing:
+            embedded = await self.embeddings.aembed_documents([texts[i] for i in missing])
+            await asyncio.to_thread(self._fill, keys, vectors, missing, embedded)
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        if not self.cache_queries:
+            return self.embeddings.embed_query(text)
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        if not self.cache_queries:
+            return await self.embeddings.aembed_query(text)
+        return (await self.aembed_documents([text]))[0]
+
+    def _lookup(self, texts: list[str]):
+        keys = [embedding_key(self.model, text) for text in texts]
+        cached = self.store.get_many(keys)
+        vectors = [v.tolist() if v is not None else None for v in cached]
+        # 캐시에 없는 텍스트는 같은 텍스트가 여러 번 있어도 한 번만 요청
+        first_index: dict[str, int] = {}
+        for i, v in enumerate(vectors):
+            if v is None:
+                first_index.setdefault(keys[i], i)
+        return keys, vectors, list(first_index.values())
+
+    def _fill(self, keys: list[str], vectors: list, missing: list[int], embedded: list[list[float]]):
+        by_key = {keys[i]: vector for i, vector in zip(missing, embedded)}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                vectors[i] = by_key[keys[i]]
+        self.store.put_many(self.model, list(by_key.items()))
+
+
+def _default_cache_dir() -> str:
+    """설정이 없으면 CHROMA_PATH 옆 embedding_cache/ (Chroma 초기화 시에도 유지)"""
+    if settings.EMBEDDING_CACHE_PATH:
+        return settings.EMBEDDING_CACHE_PATH
+    chroma_parent = os.path.dirname(os.path.abspath(settings.CHROMA_PATH))
+    return os.path.join(chroma_parent, "embedding_cache")
+
+
+@lru_cache(maxsize=1)
+def get_embedding_store() -> EmbeddingStore:
+    """EmbeddingStore 싱글톤 반환"""
+    return EmbeddingStore(_default_cache_dir())
+
+
+def cached_embeddings(embeddings: Embeddings, model: str, cache_queries: bool = True) -> Embeddings:
+    """설정이 켜져 있으면 디스크 캐시 래퍼를, 아니면 원래 임베딩 모델을 반환"""
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return embeddings
+    return CachedEmbeddings(embeddings, model, cache_queries=cache_queries)
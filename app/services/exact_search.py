@@ -0,0 +1,250 @@
+"""
+NumPy 정확 검색 엔진 (작은 컬렉션용 빠른 경로)
+
+ai_career_docs처럼 작은 컬렉션은 Chroma 클라이언트 → HNSW → SQLite 메타데이터 단계를 거치는 것보다
+연속된 float32 행렬에 대한 행렬-벡터 곱 한 번이 더 빠르고, 근사가 아닌 정확한 top-k를 줍니다.
+- 컬렉션의 임베딩을 정규화하여 vectors.f32 파일로 내보내고 numpy memmap으로 읽음
+- 검색: scores = 행렬 @ 질의(정규화) → argpartition으로 top-k 선택 후 그 k개만 정렬
+- 갱신: refresh(store)가 컬렉션 ID와 비교하여 새 청크는 행 추가, 삭제된 청크는 삭제 표시
+  (삭제 표시가 많아지면 파일을 다시 씀), 인제스트 후 자동 호출
+- 다른 프로세스(인제스트 스크립트)가 갱신하면 다음 검색 때 다시 로드
+코사인 유사도 순위는 정규화된 벡터의 L2 거리 순위와 같으므로 Chroma 결과와 순위가 일치합니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.services.collection_alias import active_store_path
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 Chroma에서 가져올 청크 수 (내보내기 / 갱신)
+_FETCH_BATCH = 1000
+# 삭제 표시된 행 비율이 이 값을 넘으면 파일을 다시 씀
+_COMPACT_RATIO = 0.2
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class ExactSearchIndex:
+    """
+    memmap float32 행렬 기반 정확 top-k 검색 (스레드 안전)
+
+    Args:
+        directory: 저장 디렉토리 (vectors.f32, rows.json)
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.rows_path = os.path.join(directory, "rows.json")
+        self._lock = threading.Lock()
+        self.dim: Optional[int] = None
+        # 행 번호 → 청크 ID / 본문 / 메타데이터 (삭제된 행은 ID가 None)
+        self._ids: list[Optional[str]] = []
+        self._texts: list[str] = []
+        self._metadatas: list[dict] = []
+        self._row_of: dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._alive: Optional[np.ndarray] = None
+        self._loaded_mtime: Optional[float] = None
+        self.searches = 0
+        self._search_seconds = 0.0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    # -----------------------------------
+    # 내보내기 / 증분 갱신
+    # -----------------------------------
+    def refresh(self, store) -> dict:
+        """
+        Chroma 컬렉션과 동기화 (새 청크 행 추가, 삭제된 청크 삭제 표시)
+
+        Returns:
+            {"added": 추가된 행 수, "removed": 삭제 표시된 행 수, "rows": 유효 행 수}
+        """
+        collection_ids = set(store.get(include=[])["ids"])
+        with self._lock:
+            self._reload_if_changed()
+            if self._ids and not os.path.exists(self.vectors_path):
+                # Chroma 디렉토리가 초기화된 경우 (reset_chroma) 처음부터 다시 내보냄
+                self._clear()
+            new_ids = [i for i in collection_ids if i not in self._row_of]
+            removed = [i for i in self._row_of if i not in collection_ids]
+
+            for doc_id in removed:
+                row = self._row_of.pop(doc_id)
+                self._ids[row] = None
+                self._texts[row], self._metadatas[row] = "", {}
+
+            for start in range(0, len(new_ids), _FETCH_BATCH):
+                batch = store._collection.get(
+                    ids=new_ids[start:start + _FETCH_BATCH], include=["embeddings", "documents", "metadatas"]
+                )
+                self._append(batch["ids"], np.asarray(batch["embeddings"], dtype=np.float32),
+                             batch["documents"], batch["metadatas"])
+
+            if new_ids or removed:
+                self._map()
+                dead = len(self._ids) - len(self._row_of)
+                if dead / len(self._ids) > _COMPACT_RATIO:
+                    self._compact()
+                    self._map()
+                self._save_rows()
+            return {"added": len(new_ids), "removed": len(removed), "rows": len(self._row_of)}
+
+    # -----------------------------------
+    # 검색
+    # -----------------------------------
+    def search(self, query_vector, k: int) -> list[tuple[Document, float]]:
+        """코사인 유사도 상위 k개 (Document에 청크 ID 포함)"""
+        started = time.perf_counter()
+        with self._lock:
+            self._reload_if_changed()
+            if self._matrix is None or not self._row_of:
+                return []
+            query = np.asarray(query_vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+
+            scores = self._matrix @ query
+            if self._alive is not None:
+                scores = np.where(self._alive, scores, -np.inf)
+            k = min(k, len(self._row_of))
+            # 전체 정렬 대신 top-k 후보만 골라 정렬 (O(n) + O(k log k))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            results = [
+                (Document(page_content=self._texts[row], metadata=self._metadatas[row], id=self._ids[row]),
+                 float(scores[row]))
+                for row in top
+            ]
+            self.searches += 1
+            self._search_seconds += time.perf_counter() - started
+            return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rows": len(self._row_of),
+                "dead_rows": len(self._ids) - len(self._row_of),
+                "dim": self.dim,
+                "matrix_bytes": int(self._matrix.nbytes) if self._matrix is not None else 0,
+                "searches": self.searches,
+                "avg_search_ms": round(self._search_seconds * 1000 / self.searches, 3) if self.searches else 0.0,
+            }
+
+    # -----------------------------------
+    # 내부 헬퍼 (호출 측에서 lock 보유)
+    # -----------------------------------
+    def _append(self, ids: list[str], embeddings: np.ndarray, documents: list, metadatas: list):
+        if not len(ids):
+            return
+        if self.dim is None:
+            self.dim = int(embeddings.shape[1])
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.vectors_path, "ab") as f:
+            f.write(_normalize_rows(embeddings).tobytes())
+        for doc_id, text, metadata in zip(ids, documents, metadatas):
+            self._row_of[doc_id] = len(self._ids)
+            self._ids.append(doc_id)
+            self._texts.append(text or "")
+            self._metadatas.append(metadata or {})
+
+    def _compact(self):
+        """삭제 표시된 행을 제거하고 파일을 다시 씀"""
+        alive_rows = [row for row, doc_id in enumerate(self._ids) if doc_id is not None]
+        matrix = np.array(self._matrix[alive_rows]) if self._matrix is not None and alive_rows else None
+        self._matrix = None  # 파일 교체 전에 memmap 해제
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.vectors_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            if matrix is not None:
+                f.write(matrix.tobytes())
+        os.replace(tmp_path, self.vectors_path)
+        self._ids = [self._ids[row] for row in alive_rows]
+        self._texts = [self._texts[row] for row in alive_rows]
+        self._metadatas = [self._metadatas[row] for row in alive_rows]
+        self._row_of = {doc_id: row for row, doc_id in enumerate(self._ids)}
+
+    def _clear(self):
+        self.dim = None
+        self._ids, self._texts, self._metadatas, self._row_of = [], [], [], {}
+        self._matrix, self._alive = None, None
+
+    def _save_rows(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.rows_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "ids": self._ids, "texts": self._texts, "metadatas": self._metadatas},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.rows_path)
+        self._loaded_mtime = os.path.getmtime(self.rows_path)
+
+    def _map(self):
+        rows = len(self._ids)
+        if not rows or self.dim is None:
+            self._matrix, self._alive = None, None
+            return
+        self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        alive = np.array([doc_id is not None for doc_id in self._ids])
+        self._alive = None if alive.all() else alive
+
+    def _load(self):
+        if not os.path.exists(self.rows_path):
+            return
+        with open(self.rows_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.dim = data["dim"]
+        self._ids, self._texts, self._metadatas = data["ids"], data["texts"], data["metadatas"]
+        self._row_of = {doc_id: row for row, doc_id in enumerate(self._ids) if doc_id is not None}
+        self._loaded_mtime = os.path.getmtime(self.rows_path)
+        self._map()
+
+    def _reload_if_changed(self):
+        """다른 프로세스가 행 목록을 갱신했으면 다시 로드"""
+        try:
+            mtime = os.path.getmtime(self.rows_path)
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            self._load()
+
+
+def default_index_dir(store_path: Optional[str] = None, collection_name: str = "ai_career_docs") -> str:
+    """Chroma 컬렉션과 같은 디렉토리에 저장 (reset 시 함께 삭제, 블루/그린 전환 시 함께 전환됨)"""
+    return os.path.join(store_path or active_store_path(), "exact_index", collection_name)
+
+
+def get_exact_index(store_path: Optional[str] = None) -> ExactSearchIndex:
+    """ExactSearchIndex 반환 (store_path를 주지 않으면 활성 버전의 행렬)"""
+    return _exact_index_at(default_index_dir(store_path))
+
+
+@lru_cache(maxsize=4)
+def _exact_index_at(directory: str) -> ExactSearchIndex:
+    return ExactSearchIndex(directory)
+
+
+def exact_search(query_vector, k: int) -> list[Document]:
+    return [doc for doc, _ in get_exact_index().search(query_vector, k)]
+
+
+async def aexact_search(query_vector, k: int) -> list[Document]:
+    """큰 행렬에서는 행렬 곱이 수 ms 걸릴 수 있으므로 스레드에서 실행"""
+    return await asyncio.to_thread(exact_search, query_vector, k)
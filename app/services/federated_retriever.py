@@ -0,0 +1,255 @@
+"""
+연합 검색 (여러 컬렉션 병렬 검색 + 점수 정규화 + 할당량 / 토큰 예산 병합)
+
+RAG 검색은 ai_career_docs만 조회하고, app/vector_retrain.py가 만든 conversation_retrained
+(좋아요 / 높은 평가를 받은 과거 Q&A)는 쓰이지 않았습니다. 두 컬렉션을 함께 검색합니다.
+- 컬렉션마다 별도 스레드에서 동시에 검색하고 지연을 컬렉션별로 기록
+- 점수는 모든 컬렉션에서 같은 절대 척도(질의와의 코사인 유사도)로 맞춘 뒤 가중치 적용
+  (컬렉션 안 min-max 정규화는 결과가 2~3개뿐일 때 관련 없는 결과도 1.0으로 올려 버림)
+- 대화 컬렉션은 최소 유사도(FEDERATED_CONVERSATION_MIN_SCORE) 미만 결과를 버림
+- 컬렉션별 할당량(최대 개수) 안에서 점수 순으로 고르되, 합친 컨텍스트가 토큰 예산을 넘지 않게 채움
+- 보조 컬렉션이 마감(FEDERATED_TIMEOUT_MS) 안에 끝나지 않으면 결과에서 제외 (필수 컬렉션은 기다림)
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+
+from app.core.config import settings
+from app.services.retriever import cosine_scores, dense_search_with_scores, hybrid_search_with_scores
+from app.services.text_splitter import count_tokens
+from app.services.vectorstore import get_vectorstore
+
+logger = logging.getLogger(__name__)
+
+DOCS_COLLECTION = "ai_career_docs"
+CONVERSATION_COLLECTION = "conversation_retrained"
+
+ScoredDocs = list[tuple[Document, float]]
+
+
+@dataclass
+class CollectionSource:
+    """
+    연합 검색 대상 컬렉션
+
+    Args:
+        name: 컬렉션 이름 (통계 키)
+        search: (질의, 질의 벡터, k) → [(Document, 코사인 유사도)]
+        quota: 이 컬렉션에서 고를 최대 개수
+        weight: 유사도에 곱할 가중치
+        required: True면 마감과 관계없이 결과를 기다림
+        min_score: 이 유사도 미만인 결과는 버림
+    """
+
+    name: str
+    search: Callable[[str, list[float], int], ScoredDocs]
+    quota: int
+    weight: float = 1.0
+    required: bool = False
+    min_score: float = -1.0
+
+
+def _doc_tokens(doc: Document) -> int:
+    tokens = (doc.metadata or {}).get("tokens")
+    return int(tokens) if tokens else count_tokens(doc.page_content)
+
+
+class FederatedRetriever:
+    """
+    여러 컬렉션 병렬 검색 후 할당량 / 토큰 예산 안에서 병합 (스레드 안전)
+
+    Args:
+        sources: 검색할 컬렉션 목록
+        token_budget: 합친 컨텍스트 토큰 예산
+        timeout_ms: 보조 컬렉션 검색 마감 (밀리초)
+    """
+
+    def __init__(self, sources: list[CollectionSource], token_budget: int, timeout_ms: int):
+        self.sources = sources
+        self.token_budget = token_budget
+        self.timeout_ms = timeout_ms
+        self._pool = ThreadPoolExecutor(max_workers=len(sources) * 4, thread_name_prefix="federated")
+        self._lock = threading.Lock()
+        self._stats = {
+            source.name: {"calls": 0, "timeouts": 0, "errors": 0, "returned": 0, "below_min": 0, "selected": 0,
+                          "total_ms": 0.0, "max_ms": 0.0}
+            for source in sources
+        }
+        self.searches = 0
+        self._tokens = 0
+
+    def search(self, query: str, query_vector: list[float]) -> list[Document]:
+        """모든 컬렉션을 동시에 검색하여 병합된 문서 목록 반환"""
+        deadline = time.perf_counter() + self.timeout_ms / 1000
+        futures = {
+            source.name: self._pool.submit(contextvars.copy_context().run, self._run, source, query, query_vector)
+            for source in self.sources
+        }
+        results: dict[str, ScoredDocs] = {}
+        for source in self.sources:
+            timeout = None if source.required else max(deadline - time.perf_counter(), 0.0)
+            try:
+                results[source.name] = futures[source.name].result(timeout=timeout)
+            except FuturesTimeout:
+                self._record_timeout(source.name)
+            except Exception as e:
+                logger.warning(f"연합 검색 실패 ({source.name}): {e}")
+        return self._merge(results)
+
+    async def asearch(self, query: str, query_vector: list[float]) -> list[Document]:
+        """search의 비동기 버전 (컬렉션 검색은 스레드에서 실행)"""
+        tasks = {
+            source.name: asyncio.ensure_future(asyncio.to_thread(self._run, source, query, query_vector))
+            for source in self.sources
+        }
+        optional = {tasks[s.name]: s.name for s in self.sources if not s.required}
+        results: dict[str, ScoredDocs] = {}
+        dropped = set()
+        if optional:
+            _, pending = await asyncio.wait(optional, timeout=self.timeout_ms / 1000)
+            for task in pending:
+                task.cancel()
+                dropped.add(optional[task])
+                self._record_timeout(optional[task])
+        for source in self.sources:
+            if source.name in dropped:
+                continue
+            try:
+                results[source.name] = await tasks[source.name]
+            except Exception as e:
+                logger.warning(f"연합 검색 실패 ({source.name}): {e}")
+        return self._merge(results)
+
+    def stats(self) -> dict:
+        with self._lock:
+            collections = {
+                name: {
+                    **{key: value for key, value in s.items() if key not in ("total_ms", "max_ms")},
+                    "avg_ms": round(s["total_ms"] / s["calls"], 2) if s["calls"] else 0.0,
+                    "max_ms": round(s["max_ms"], 2),
+                    "timeout_rate": round(s["timeouts"] / s["calls"], 3) if s["calls"] else 0.0,
+                }
+                for name, s in self._stats.items()
+            }
+            return {
+                "searches": self.searches,
+                "token_budget": self.token_budget,
+                "timeout_ms": self.timeout_ms,
+                "avg_tokens": round(self._tokens / self.searches, 1) if self.searches else 0.0,
+                "collections": collections,
+            }
+
+    # -----------------------------------
+    # 내부 헬퍼
+    # -----------------------------------
+    def _run(self, source: CollectionSource, query: str, query_vector: list[float]) -> ScoredDocs:
+        """컬렉션 1개 검색 (마감 이후에 끝나도 지연은 기록)"""
+        started = time.perf_counter()
+        try:
+            return source.search(query, query_vector, source.quota)
+        except Exception:
+            with self._lock:
+                self._stats[source.name]["errors"] += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                stats = self._stats[source.name]
+                stats["calls"] += 1
+                stats["total_ms"] += elapsed_ms
+                stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def _record_timeout(self, name: str):
+        logger.info(f"연합 검색 마감 초과 - {name} 결과 제외")
+        with self._lock:
+            self._stats[name]["timeouts"] += 1
+
+    def _merge(self, results: dict[str, ScoredDocs]) -> list[Document]:
+        """컬렉션별 할당량 안에서 (가중치 × 코사인 유사도) 순으로 토큰 예산까지 채움"""
+        candidates = []
+        below_min: dict[str, int] = {}
+        for source in self.sources:
+            found = results.get(source.name)
+            if not found:
+                continue
+            relevant = [(doc, score) for doc, score in found if score >= source.min_score]
+            below_min[source.name] = len(found) - len(relevant)
+            for doc, score in relevant[:source.quota]:
+                candidates.append((source.weight * score, source.name, doc))
+        candidates.sort(key=lambda item: item[0], reverse=True)
+
+        selected, used, seen = [], 0, set()
+        selected_by: dict[str, int] = {}
+        for _, name, doc in candidates:
+            if doc.page_content in seen:
+                continue
+            tokens = _doc_tokens(doc)
+            # 예산을 넘는 문서는 건너뛰고 더 작은 문서로 채움 (첫 문서는 항상 포함)
+            if selected and used + tokens > self.token_budget:
+                continue
+            selected.append(doc)
+            seen.add(doc.page_content)
+            used += tokens
+            selected_by[name] = selected_by.get(name, 0) + 1
+
+        with self._lock:
+            self.searches += 1
+            self._tokens += used
+            for name, found in results.items():
+                self._stats[name]["returned"] += len(found)
+            for name, count in below_min.items():
+                self._stats[name]["below_min"] += count
+            for name, count in selected_by.items():
+                self._stats[name]["selected"] += count
+        return selected
+
+
+def _search_docs(query: str, query_vector: list[float], k: int) -> ScoredDocs:
+    """ai_career_docs (활성 버전, 하이브리드 설정을 따름)"""
+    store = get_vectorstore()
+    if settings.HYBRID_RETRIEVAL_ENABLED:
+        return hybrid_search_with_scores(store, query, query_vector, k)
+    return dense_search_with_scores(store, query_vector, k)
+
+
+@lru_cache(maxsize=1)
+def get_conversation_store() -> Chroma:
+    """app/vector_retrain.py가 CHROMA_PATH에 만드는 conversation_retrained 컬렉션"""
+    return Chroma(
+        collection_name=CONVERSATION_COLLECTION,
+        embedding_function=get_vectorstore().embeddings,
+        persist_directory=settings.CHROMA_PATH,
+    )
+
+
+def _search_conversations(query: str, query_vector: list[float], k: int) -> ScoredDocs:
+    store = get_conversation_store()
+    return cosine_scores(store, store.similarity_search_by_vector_with_relevance_scores(query_vector, k=k))
+
+
+@lru_cache(maxsize=1)
+def get_federated_retriever() -> FederatedRetriever:
+    """FederatedRetriever 싱글톤 반환 (문서 컬렉션은 필수, 대화 컬렉션은 마감 적용)"""
+    return FederatedRetriever(
+        [
+            CollectionSource(DOCS_COLLECTION, _search_docs, settings.FEDERATED_DOCS_QUOTA, required=True),
+            CollectionSource(
+                CONVERSATION_COLLECTION,
+                _search_conversations,
+                settings.FEDERATED_CONVERSATION_QUOTA,
+                weight=settings.FEDERATED_CONVERSATION_WEIGHT,
+                min_score=settings.FEDERATED_CONVERSATION_MIN_SCORE,
+            ),
+        ],
+        token_budget=settings.FEDERATED_CONTEXT_TOKENS,
+        timeout_ms=settings.FEDERATED_TIMEOUT_MS,
+    )
@@ -0,0 +1,123 @@
+"""
+증분 인제스트 매니페스트
+
+Chroma 디렉토리 안에 파일별 (mtime, 내용 해시, 청크 ID, 토큰 수)를 기록해 두고,
+다음 인제스트 때 새로 생기거나 바뀐 파일만 다시 임베딩합니다.
+- 청크 ID는 (파일명, 청크 내용)에서 결정적으로 만들어, 바뀐 파일에서도
+  내용이 그대로인 청크는 재임베딩 없이 재사용 (upsert / 삭제는 ID 기준)
+- mtime이 같으면 해시 계산도 생략, mtime만 바뀌고 내용이 같으면 건너뜀
+- 청킹 설정(CHUNK_SIZE_TOKENS / CHUNK_OVERLAP_TOKENS)이 바뀌면 전체 파일을 다시 처리
+- 임베딩 시간 / 토큰 수를 누적 기록하여 건너뛴 토큰 수로 절약 시간을 추정
+"""
+import hashlib
+import json
+import os
+from typing import Optional
+
+from app.core.config import settings
+from app.services.collection_alias import active_store_path
+from app.services.text_splitter import Chunk
+
+MANIFEST_FILE = "ingest_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _chunking_config() -> list[int]:
+    return [settings.CHUNK_SIZE_TOKENS, settings.CHUNK_OVERLAP_TOKENS]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_ids(source: str, chunks: list[Chunk]) -> list[str]:
+    """
+    결정적 청크 ID: sha256(파일명 + 청크 내용)
+
+    한 파일 안에서 같은 내용의 청크가 반복되면 등장 순번을 붙여 구분합니다.
+    """
+    ids, seen = [], {}
+    for chunk in chunks:
+        digest = hashlib.sha256(f"{source}\0{chunk.text}".encode("utf-8")).hexdigest()[:32]
+        count = seen.get(digest, 0)
+        seen[digest] = count + 1
+        ids.append(digest if count == 0 else f"{digest}-{count}")
+    return ids
+
+
+class IngestManifest:
+    """
+    파일별 인제스트 상태 (JSON 파일)
+
+    Args:
+        path: 매니페스트 파일 경로
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files: dict[str, dict] = {}
+        # 누적 임베딩 시간 / 토큰 수 (큰 실행일수록 속도 추정에 크게 반영)
+        self.embed_seconds = 0.0
+        self.embed_tokens = 0
+        # 청킹 설정이 기록과 다르면 True (모든 파일을 변경된 것으로 취급)
+        self.rechunk = False
+        self._load()
+
+    def get(self, source: str) -> Optional[dict]:
+        return self.files.get(source)
+
+    def set(self, source: str, mtime: float, digest: str, ids: list[str], tokens: int):
+        self.files[source] = {"mtime": mtime, "hash": digest, "chunk_ids": ids, "tokens": tokens}
+
+    def remove(self, source: str) -> Optional[dict]:
+        return self.files.pop(source, None)
+
+    def record_embedding_rate(self, seconds: float, tokens: int):
+        """이번 실행의 임베딩 시간 / 토큰 수를 누적 (절약 시간 추정용)"""
+        if tokens <= 0:
+            return
+        self.embed_seconds += seconds
+        self.embed_tokens += tokens
+
+    def estimate_seconds(self, tokens: int) -> float:
+        """tokens만큼 임베딩했을 때 걸렸을 시간 추정 (기록이 없으면 0)"""
+        if not self.embed_tokens:
+            return 0.0
+        return round(self.embed_seconds / self.embed_tokens * tokens, 2)
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체 (중간에 중단돼도 이전 매니페스트 유지)"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    # 다시 청킹하는 도중에 중단되면 다음 실행에서도 이어서 다시 청킹하도록 기록하지 않음
+                    "chunking": None if self.rechunk else _chunking_config(),
+                    "embed_seconds": self.embed_seconds,
+                    "embed_tokens": self.embed_tokens,
+                    "files": self.files,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp_path, self.path)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        self.files = data.get("files", {})
+        self.embed_seconds = data.get("embed_seconds", 0.0)
+        self.embed_tokens = data.get("embed_tokens", 0)
+        self.rechunk = data.get("chunking") != _chunking_config()
+
+
+def default_manifest_path(store_path: Optional[str] = None) -> str:
+    """Chroma 컬렉션과 같은 디렉토리에 저장 (reset 시 함께 삭제, 블루/그린 전환 시 함께 전환됨)"""
+    return os.path.join(store_path or active_store_path(), MANIFEST_FILE)
@@ -1,50 +1,223 @@
 import os
 import shutil
+import threading
+from typing import Optional
 from app.services.vectorstore import get_vectorstore
+from app.services.collection_alias import active_store_path, get_collection_alias, is_reserved_entry
+from app.services.semantic_cache import get_semantic_cache
+from app.services.openai_scheduler import Priority, priority_scope
+from app.services.text_splitter import split_document, summarize_chunks
+from app.services.batch_embedder import BatchEmbedder, EmbedItem
+from app.services.exact_search import get_exact_index
+from app.services.retriever import get_bm25_index
+from app.services.ingest_manifest import IngestManifest, chunk_ids, content_hash, default_manifest_path
 from app.core.config import settings
 
 CHROMA_PATH = settings.CHROMA_PATH
 DOCS_PATH = "docs"
+DOC_EXTENSIONS = (".txt", ".md")
 
+_rebuild_lock = threading.Lock()
 
-def reset_chroma():
-    """기존 Chroma DB 삭제"""
-    if os.path.exists(CHROMA_PATH):
-        shutil.rmtree(CHROMA_PATH)
-        return f"🧹 기존 Chroma DB 초기화 완료: {CHROMA_PATH}"
-    return "ℹ️ 초기화할 Chroma DB가 없습니다."
 
+def reset_chroma(store_path: Optional[str] = None):
+    """
+    Chroma DB 삭제 (기본값: 활성 버전)
 
-def ingest_documents(reset: bool = False):
-    """문서 임베딩 + 상태 리턴"""
+    레거시 레이아웃(CHROMA_PATH 자체가 DB)이면 다른 버전 디렉토리와 별칭 파일은 남겨 둡니다.
+    """
+    path = store_path or active_store_path()
+    if not os.path.exists(path):
+        return "ℹ️ 초기화할 Chroma DB가 없습니다."
+    for name in os.listdir(path):
+        if path == CHROMA_PATH and is_reserved_entry(name):
+            continue
+        target = os.path.join(path, name)
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        else:
+            os.remove(target)
+    return f"🧹 기존 Chroma DB 초기화 완료: {path}"
+
+
+def _plan_file(store, file_name: str, entry, text: str) -> dict:
+    """
+    파일 1개를 청킹하고 매니페스트와 비교해 임베딩할 청크를 결정
+
+    내용이 같은 청크(같은 ID)는 메타데이터(순번/offset)만 갱신하고, 더 이상 없는 청크 ID는
+    삭제합니다. 새 청크 ID의 임베딩은 모든 파일을 모아 BatchEmbedder로 한 번에 처리합니다.
+    """
+    chunks = split_document(text, file_name)
+    ids = chunk_ids(file_name, chunks)
+    old_ids = set(entry["chunk_ids"]) if entry else set()
+
+    new = [EmbedItem(i, c.text, c.metadata, c.tokens) for i, c in zip(ids, chunks) if i not in old_ids]
+    kept = [(i, c) for i, c in zip(ids, chunks) if i in old_ids]
+    stale = old_ids - set(ids)
+
+    if entry is None:
+        # 매니페스트 도입 전에 ID 없이 추가된 같은 파일의 벡터 제거 (중복 방지)
+        store._collection.delete(where={"source": file_name})
+    if kept:
+        store._collection.update(ids=[i for i, _ in kept], metadatas=[c.metadata for _, c in kept])
+    if stale:
+        store.delete(ids=list(stale))
+
+    return {
+        "chunks": chunks,
+        "ids": ids,
+        "new": new,
+        "reused_tokens": sum(c.tokens for _, c in kept),
+    }
+
+
+def ingest_documents(reset: bool = False, progress: bool = False, store_path: Optional[str] = None):
+    """
+    문서 증분 인제스트 + 상태 리턴
+
+    문서를 제목 인식 / 토큰 기준 청크로 나눠 청크 단위로 임베딩합니다
+    (청크 메타데이터: source, section, offset, chunk, tokens).
+    Chroma 디렉토리의 매니페스트와 비교하여 새로 생기거나 바뀐 파일만 임베딩하고,
+    docs/에서 사라진 파일의 벡터는 삭제합니다.
+    임베딩은 모든 파일의 새 청크를 토큰 기준 배치로 묶어 동시에 요청합니다 (BatchEmbedder).
+
+    Args:
+        reset: 기존 Chroma DB 초기화 후 전체 임베딩
+        progress: 임베딩 진행바 표시 (CLI 스크립트용)
+        store_path: 인제스트할 Chroma 디렉토리 (기본값: 활성 버전, 블루/그린 재구축 시 새 버전)
+    """
     log_messages = []
+    is_active = store_path is None
+    store_path = store_path or active_store_path()
 
     if reset:
-        msg = reset_chroma()
+        msg = reset_chroma(store_path)
         log_messages.append(msg)
+        get_bm25_index(store_path).clear()
 
     if not os.path.exists(DOCS_PATH):
         return {"status": "error", "message": f"{DOCS_PATH}/ 폴더가 없습니다."}
 
-    txt_files = [f for f in os.listdir(DOCS_PATH) if f.endswith(".txt")]
+    txt_files = sorted(f for f in os.listdir(DOCS_PATH) if f.endswith(DOC_EXTENSIONS))
     if not txt_files:
-        return {"status": "warning", "message": f"{DOCS_PATH}/ 폴더에 .txt 파일이 없습니다."}
+        return {"status": "warning", "message": f"{DOCS_PATH}/ 폴더에 .txt/.md 파일이 없습니다."}
 
-    store = get_vectorstore()
-    log_messages.append(f"📂 총 {len(txt_files)}개 문서를 임베딩 중...")
+    store = get_vectorstore(persist_directory=store_path)
+    bm25 = get_bm25_index(store_path)
+    bm25.refresh()
+    manifest = IngestManifest(default_manifest_path(store_path))
+    if manifest.rechunk:
+        log_messages.append("ℹ️ 청킹 설정이 바뀌어 모든 문서를 다시 청킹합니다.")
+    log_messages.append(f"📂 총 {len(txt_files)}개 문서 확인 중...")
+
+    counts = {"added": 0, "updated": 0, "deleted": 0, "skipped": 0, "failed": 0}
+    all_chunks = []
+    skipped_tokens = 0
+
+    # docs/에서 사라진 파일의 벡터 삭제
+    for file_name in sorted(set(manifest.files) - set(txt_files)):
+        try:
+            removed = manifest.remove(file_name)
+            if removed["chunk_ids"]:
+                store.delete(ids=removed["chunk_ids"])
+                bm25.delete(removed["chunk_ids"])
+            manifest.save()
+            counts["deleted"] += 1
+            log_messages.append(f"🗑️ {file_name} 삭제됨 ({len(removed['chunk_ids'])}개 청크 제거)")
+        except Exception as e:
+            counts["failed"] += 1
+            log_messages.append(f"⚠️ {file_name} 삭제 중 오류: {e}")
 
+    # 1. 변경 감지 + 청킹 (임베딩할 청크 수집)
+    plans = []  # (idx, file_name, entry, mtime, digest, plan)
     for idx, file_name in enumerate(txt_files, 1):
         file_path = os.path.join(DOCS_PATH, file_name)
+        entry = manifest.get(file_name)
+        mtime = os.path.getmtime(file_path)
+        if entry and not manifest.rechunk and entry["mtime"] == mtime:
+            counts["skipped"] += 1
+            skipped_tokens += entry["tokens"]
+            continue
+
         with open(file_path, "r", encoding="utf-8") as f:
             text = f.read()
+        digest = content_hash(text)
+        if entry and not manifest.rechunk and entry["hash"] == digest:
+            # 내용은 그대로이고 mtime만 바뀐 경우 (git checkout 등)
+            manifest.set(file_name, mtime, digest, entry["chunk_ids"], entry["tokens"])
+            counts["skipped"] += 1
+            skipped_tokens += entry["tokens"]
+            continue
 
         try:
-            store.add_texts([text], metadatas=[{"source": file_name}])
-            log_messages.append(f"[{idx}] ✅ {file_name} 임베딩 완료")
+            plans.append((idx, file_name, entry, mtime, digest, _plan_file(store, file_name, entry, text)))
         except Exception as e:
+            counts["failed"] += 1
             log_messages.append(f"[{idx}] ⚠️ {file_name} 처리 중 오류: {e}")
 
-    log_messages.append(f"📁 저장 완료: {CHROMA_PATH}")
+    # 2. 모든 새 청크를 배치 + 동시 요청으로 임베딩
+    # 일괄 임베딩은 채팅 질의 임베딩보다 낮은 우선순위로 실행
+    with priority_scope(Priority.BATCH):
+        report = BatchEmbedder(store).upsert(
+            [item for *_, plan in plans for item in plan["new"]], progress=progress, desc="문서 임베딩"
+        )
+
+    # 3. 임베딩이 모두 성공한 파일만 매니페스트에 반영 (실패 파일은 다음 실행에서 재시도)
+    for idx, file_name, entry, mtime, digest, plan in plans:
+        if any(item.id in report.failed_ids for item in plan["new"]):
+            counts["failed"] += 1
+            log_messages.append(f"[{idx}] ⚠️ {file_name} 임베딩 실패 (다음 인제스트에서 재시도)")
+            continue
+        chunks = plan["chunks"]
+        manifest.set(file_name, mtime, digest, plan["ids"], sum(c.tokens for c in chunks))
+        # BM25 색인도 청크 ID 기준으로 증분 갱신
+        if entry is None:
+            bm25.delete_source(file_name)
+        else:
+            bm25.delete(entry["chunk_ids"])
+        bm25.upsert((i, c.text, c.metadata) for i, c in zip(plan["ids"], chunks))
+        counts["updated" if entry else "added"] += 1
+        all_chunks.extend(chunks)
+        skipped_tokens += plan["reused_tokens"]
+        log_messages.append(
+            f"[{idx}] ✅ {file_name} {'갱신' if entry else '추가'} 완료 "
+            f"({len(chunks)}개 청크, 재사용 {plan['reused_tokens']} 토큰)"
+        )
+
+    manifest.record_embedding_rate(report.seconds, report.tokens)
+    manifest.rechunk = manifest.rechunk and counts["failed"] > 0
+    manifest.save()
+    bm25.save()
+    if settings.EXACT_SEARCH_ENABLED:
+        try:
+            synced = get_exact_index(store_path).refresh(store)
+            log_messages.append(
+                f"🧮 정확 검색 행렬 갱신: 추가 {synced['added']} / 삭제 {synced['removed']} (총 {synced['rows']}행)"
+            )
+        except Exception as e:
+            log_messages.append(f"⚠️ 정확 검색 행렬 갱신 실패: {e}")
+    time_saved = manifest.estimate_seconds(skipped_tokens)
+
+    embed_summary = report.summary()
+    chunk_summary = summarize_chunks(all_chunks)
+    log_messages.append(
+        f"📊 추가 {counts['added']} / 갱신 {counts['updated']} / 삭제 {counts['deleted']} / "
+        f"건너뜀 {counts['skipped']} / 실패 {counts['failed']} (절약 추정 {time_saved}초)"
+    )
+    log_messages.append(
+        f"⚡ 임베딩 {embed_summary['embedded']}개 청크 / {embed_summary['batches']}개 배치, "
+        f"{embed_summary['seconds']}초 ({embed_summary['docs_per_sec']} 청크/초, {embed_summary['tokens_per_sec']} 토큰/초)"
+    )
+    log_messages.append(
+        f"🧩 청크 {chunk_summary['chunks']}개 (평균 {chunk_summary['avg_tokens']} 토큰, 최대 {chunk_summary['max_tokens']} 토큰)"
+    )
+    log_messages.append(f"📁 저장 완료: {store_path}")
+
+    # 코퍼스가 바뀌었으면 시맨틱 답변 캐시 무효화 (이전 문서 기반 답변 제거)
+    # 새 버전에 인제스트하는 경우에는 별칭 전환 시점에 무효화됨 (vectorstore._resolve_active_path)
+    if is_active and (counts["added"] or counts["updated"] or counts["deleted"] or reset):
+        get_semantic_cache().invalidate()
+        log_messages.append("🧹 시맨틱 캐시 무효화 완료")
 
     # 임베딩 후 벡터 개수 리턴
     try:
@@ -56,5 +229,59 @@ def ingest_documents(reset: bool = False):
         "status": "success",
         "message": "문서 임베딩 완료",
         "vector_count": count,
+        **counts,
+        "embedding": embed_summary,
+        "skipped_tokens": skipped_tokens,
+        "time_saved_seconds": time_saved,
+        "chunks": chunk_summary,
         "log": log_messages,
     }
+
+
+def rebuild_collection(progress: bool = False) -> dict:
+    """
+    블루/그린 재구축: 새 버전 디렉토리에 전체 문서를 인제스트한 뒤 별칭을 원자적으로 전환
+
+    재구축 중에도 실행 중인 API는 기존 버전으로 응답하고, 전환 후 다음 요청부터 새 버전을 씁니다.
+    바뀌지 않은 청크는 디스크 임베딩 캐시에서 가져오므로 OpenAI를 다시 호출하지 않습니다.
+    실패한 파일이 있으면 전환하지 않고 새 버전 디렉토리를 삭제합니다.
+    이전 버전은 VECTORSTORE_KEEP_VERSIONS개까지 남겨 두어 rollback_collection()으로 즉시 되돌릴 수 있습니다.
+    """
+    if not _rebuild_lock.acquire(blocking=False):
+        return {"status": "busy", "message": "이미 재구축이 진행 중입니다."}
+    try:
+        alias = get_collection_alias()
+        previous = alias.active_version()
+        version = alias.create_version()
+        result = ingest_documents(progress=progress, store_path=alias.version_path(version))
+        log_messages = result.setdefault("log", [])
+        result["version"] = version
+
+        if result["status"] != "success" or result["failed"]:
+            alias.remove_version(version)
+            result["status"] = "error" if result["status"] == "success" else result["status"]
+            result["switched"] = False
+            log_messages.append(f"❌ 새 버전 {version} 인제스트 실패 → 전환하지 않음 (활성 버전: {previous})")
+            return result
+
+        alias.switch(version)
+        removed = alias.prune(settings.VECTORSTORE_KEEP_VERSIONS)
+        result["switched"] = True
+        result["previous_version"] = previous
+        result["pruned_versions"] = removed
+        log_messages.append(f"🔀 활성 벡터스토어 전환: {previous} → {version}")
+        if removed:
+            log_messages.append(f"🧹 오래된 버전 삭제: {', '.join(removed)}")
+        return result
+    finally:
+        _rebuild_lock.release()
+
+
+def rollback_collection() -> dict:
+    """직전 버전으로 별칭을 되돌림 (디렉토리는 그대로이므로 즉시 적용)"""
+    alias = get_collection_alias()
+    try:
+        state = alias.rollback()
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    return {"status": "success", "message": f"{state['previous']} → {state['active']} 롤백 완료", **state}
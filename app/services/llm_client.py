@@ -0,0 +1,280 @@
+"""
+LLM 클라이언트 레지스트리
+
+모든 서비스가 OpenAI 호출에 사용하는 클라이언트를 한 곳에서 생성/재사용합니다.
+- (model, temperature, purpose) 키별로 ChatOpenAI / OpenAIEmbeddings / OpenAI 인스턴스를 캐싱
+- 동기/비동기 httpx 커넥션 풀(keep-alive)을 프로세스 전체에서 공유
+- 클라이언트별 통계: 요청 수, 신규 커넥션 수, 커넥션 재사용률, 평균 핸드셰이크 시간
+- 모든 요청은 전송 전에 OpenAIScheduler(모델별 RPM/TPM + 우선순위)를 통과
+"""
+import threading
+import time
+from typing import Optional
+
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from openai import OpenAI
+
+from app.core.config import settings
+from app.services.openai_scheduler import estimate_request, get_scheduler, resolve_priority
+
+# 공유 커넥션 풀 설정
+_POOL_LIMITS = httpx.Limits(
+    max_connections=200,
+    max_keepalive_connections=50,
+    keepalive_expiry=60.0,
+)
+_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+
+class ClientStats:
+    """클라이언트 1개에 대한 커넥션 사용 통계 (스레드 안전)"""
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.handshake_seconds = 0.0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def record_handshake(self, seconds: float):
+        with self._lock:
+            self.handshake_seconds += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            requests = self.requests
+            new_connections = self.new_connections
+            handshake_seconds = self.handshake_seconds
+
+        model, temperature, purpose = self.key
+        reused = max(requests - new_connections, 0)
+        return {
+            "model": model,
+            "temperature": temperature,
+            "purpose": purpose,
+            "requests": requests,
+            "new_connections": new_connections,
+            "reuse_ratio": round(reused / requests, 3) if requests else 0.0,
+            "avg_handshake_ms": (
+                round(handshake_seconds / new_connections * 1000, 1) if new_connections else 0.0
+            ),
+        }
+
+
+class _HandshakeTrace:
+    """
+    httpcore trace 확장 콜백
+
+    요청마다 1개씩 생성되며, TCP 연결/TLS 핸드셰이크 이벤트가 발생한 경우에만
+    (= 풀에서 재사용할 커넥션이 없어 새로 연결한 경우) 통계를 기록합니다.
+    """
+
+    def __init__(self, stats: ClientStats):
+        self.stats = stats
+        self._mark: Optional[float] = None
+
+    def _handle(self, name: str):
+        if name == "connection.connect_tcp.started":
+            self.stats.record_new_connection()
+            self._mark = time.perf_counter()
+        elif name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self._mark is not None:
+                now = time.perf_counter()
+                self.stats.record_handshake(now - self._mark)
+                self._mark = now
+        elif name == "connection.start_tls.started" and self._mark is None:
+            self._mark = time.perf_counter()
+
+    def __call__(self, name: str, info: dict):
+        self._handle(name)
+
+
+class _AsyncHandshakeTrace(_HandshakeTrace):
+    """비동기 httpcore 풀용 trace 콜백 (코루틴이어야 함)"""
+
+    async def __call__(self, name: str, info: dict):
+        self._handle(name)
+
+
+# 공유 트랜스포트 (실제 커넥션 풀 보유) - 지연 초기화
+_sync_transport: Optional[httpx.HTTPTransport] = None
+_async_transport: Optional[httpx.AsyncHTTPTransport] = None
+
+# (model, temperature, purpose) -> 인스턴스 / 통계
+_clients: dict[tuple, object] = {}
+_stats: dict[tuple, ClientStats] = {}
+_lock = threading.Lock()
+
+
+def _get_transports() -> tuple[httpx.HTTPTransport, httpx.AsyncHTTPTransport]:
+    global _sync_transport, _async_transport
+    if _sync_transport is None:
+        _sync_transport = httpx.HTTPTransport(limits=_POOL_LIMITS)
+    if _async_transport is None:
+        _async_transport = httpx.AsyncHTTPTransport(limits=_POOL_LIMITS)
+    return _sync_transport, _async_transport
+
+
+def _get_stats(key: tuple) -> ClientStats:
+    if key not in _stats:
+        _stats[key] = ClientStats(key)
+    return _stats[key]
+
+
+def _build_http_clients(key: tuple) -> tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    공유 트랜스포트 위에 얇은 httpx 클라이언트를 생성
+
+    커넥션 풀은 트랜스포트가 소유하므로 모든 클라이언트가 같은 keep-alive 커넥션을
+    재사용하고, 이벤트 훅은 클라이언트별 통계만 분리해서 기록합니다.
+    요청 훅은 전송 전에 스케줄러에서 속도 제한 슬롯을 획득합니다.
+    """
+    sync_transport, async_transport = _get_transports()
+    stats = _get_stats(key)
+    purpose = key[2]
+    scheduler = get_scheduler() if settings.OPENAI_SCHEDULER_ENABLED else None
+
+    def on_request(request: httpx.Request):
+        if scheduler is not None:
+            model, tokens = estimate_request(request)
+            scheduler.acquire(model, tokens, resolve_priority(purpose))
+        stats.record_request()
+        request.extensions["trace"] = _HandshakeTrace(stats)
+
+    async def on_async_request(request: httpx.Request):
+        if scheduler is not None:
+            model, tokens = estimate_request(request)
+            await scheduler.aacquire(model, tokens, resolve_priority(purpose))
+        stats.record_request()
+        request.extensions["trace"] = _AsyncHandshakeTrace(stats)
+
+    def on_response(response: httpx.Response):
+        if scheduler is not None and response.status_code == 429:
+            scheduler.record_throttled(estimate_request(response.request)[0])
+
+    async def on_async_response(response: httpx.Response):
+        on_response(response)
+
+    http_client = httpx.Client(
+        transport=sync_transport,
+        timeout=_TIMEOUT,
+        event_hooks={"request": [on_request], "response": [on_response]},
+    )
+    http_async_client = httpx.AsyncClient(
+        transport=async_transport,
+        timeout=_TIMEOUT,
+        event_hooks={"request": [on_async_request], "response": [on_async_response]},
+    )
+    return http_client, http_async_client
+
+
+def get_chat_model(
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.0,
+    purpose: str = "chat",
+) -> ChatOpenAI:
+    """
+    공유 커넥션 풀을 사용하는 ChatOpenAI 인스턴스 반환 (키별 싱글톤)
+
+    Args:
+        model: OpenAI 채팅 모델명
+        temperature: 샘플링 온도
+        purpose: 호출 용도 ("chat", "analysis", "feedback" 등) - 통계 구분용
+
+    Example:
+        >>> llm = get_chat_model("gpt-4o-mini", 0.3, purpose="analysis")
+        >>> llm.invoke("안녕하세요")
+    """
+    key = (model, temperature, purpose)
+    with _lock:
+        if key not in _clients:
+            http_client, http_async_client = _build_http_clients(key)
+            _clients[key] = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                openai_api_key=settings.OPENAI_API_KEY,
+                openai_api_base=settings.OPENAI_BASE_URL,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+        return _clients[key]
+
+
+def get_embeddings(
+    model: str = "text-embedding-3-small",
+    purpose: str = "embedding",
+) -> OpenAIEmbeddings:
+    """공유 커넥션 풀을 사용하는 OpenAIEmbeddings 인스턴스 반환 (키별 싱글톤)"""
+    key = (model, None, purpose)
+    with _lock:
+        if key not in _clients:
+            http_client, http_async_client = _build_http_clients(key)
+            _clients[key] = OpenAIEmbeddings(
+                model=model,
+                openai_api_key=settings.OPENAI_API_KEY,
+                openai_api_base=settings.OPENAI_BASE_URL,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+        return _clients[key]
+
+
+def get_openai_client(purpose: str = "raw") -> OpenAI:
+    """
+    공유 커넥션 풀을 사용하는 OpenAI SDK 클라이언트 반환
+
+    LangChain을 거치지 않고 chat.completions.create 등을 직접 호출하는 모듈용입니다.
+    모델은 호출 시점에 지정하므로 키의 model 자리는 "*"로 둡니다.
+    """
+    key = ("*", None, purpose)
+    with _lock:
+        if key not in _clients:
+            http_client, _ = _build_http_clients(key)
+            _clients[key] = OpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL,
+                http_client=http_client,
+            )
+        return _clients[key]
+
+
+def _open_connections(transport) -> int:
+    """트랜스포트 풀에 현재 열려 있는 커넥션 수 (httpcore 내부 구현 의존)"""
+    try:
+        return len(transport._pool.connections)
+    except Exception:
+        return 0
+
+
+def get_client_stats() -> dict:
+    """
+    레지스트리 전체 통계 반환
+
+    Returns:
+        {
+            "pool": {"sync_open_connections": int, "async_open_connections": int, ...},
+            "clients": [{"model", "temperature", "purpose", "requests", "new_connections",
+                         "reuse_ratio", "avg_handshake_ms"}, ...]
+        }
+    """
+    with _lock:
+        stats = list(_stats.values())
+
+    return {
+        "pool": {
+            "sync_open_connections": _open_connections(_sync_transport) if _sync_transport else 0,
+            "async_open_connections": _open_connections(_async_transport) if _async_transport else 0,
+            "max_connections": _POOL_LIMITS.max_connections,
+            "max_keepalive_connections": _POOL_LIMITS.max_keepalive_connections,
+        },
+        "clients": [s.snapshot() for s in stats],
+    }
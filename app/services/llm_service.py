@@ -1,11 +1,13 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from app.core.config import settings
+from app.services.llm_client import get_chat_model
+from app.services.single_flight import single_flight
 
+CHAT_MODEL = "gpt-4o-mini"
 
-def get_ai_response(user_input: str) -> str:
-    """LangChain LCEL(LangChain Expression Language) 방식으로 AI 응답 생성"""
+
+def _build_chat_chain():
+    """LCEL 체인 구성: prompt | llm | output_parser"""
 
     # 프롬프트 템플릿 정의 (시스템 메시지와 사용자 메시지 분리)
     prompt = ChatPromptTemplate.from_messages([
@@ -13,16 +15,39 @@ def get_ai_response(user_input: str) -> str:
         ("human", "{question}")
     ])
 
-    # ChatOpenAI 모델 초기화 (gpt-4o-mini 사용)
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.5,
-        openai_api_key=settings.OPENAI_API_KEY
-    )
+    # 공유 레지스트리에서 ChatOpenAI 모델 조회 (gpt-4o-mini 사용)
+    llm = get_chat_model(CHAT_MODEL, temperature=0.5, purpose="chat")
 
-    # LCEL 체인 구성: prompt | llm | output_parser
-    chain = prompt | llm | StrOutputParser()
+    return prompt | llm | StrOutputParser()
 
+
+def get_ai_response(user_input: str) -> str:
+    """LangChain LCEL(LangChain Expression Language) 방식으로 AI 응답 생성 (동기, 스크립트용)"""
     # 체인 실행 (.invoke() 메서드 사용)
-    response = chain.invoke({"question": user_input})
-    return response
+    return _build_chat_chain().invoke({"question": user_input})
+
+
+async def aget_ai_response(user_input: str) -> str:
+    """
+    get_ai_response의 비동기 버전 (FastAPI 라우터용)
+
+    .ainvoke()를 사용하므로 OpenAI 응답을 기다리는 동안 이벤트 루프를 막지 않습니다.
+    같은 질문이 동시에 들어오면 LLM 호출 1번의 결과를 공유합니다 (single-flight).
+    """
+    return await single_flight.do(
+        "chat",
+        CHAT_MODEL,
+        user_input,
+        lambda: _build_chat_chain().ainvoke({"question": user_input}),
+    )
+
+
+async def astream_ai_response(user_input: str):
+    """
+    스트리밍 응답 생성 (.astream 사용)
+
+    토큰이 생성되는 즉시 문자열 조각을 yield 합니다.
+    """
+    async for chunk in _build_chat_chain().astream({"question": user_input}):
+        if chunk:
+            yield chunk
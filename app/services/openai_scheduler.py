@@ -0,0 +1,308 @@
+"""
+OpenAI 호출 스케줄러 (전역 속도 제한 + 우선순위)
+
+모든 OpenAI 요청은 llm_client 레지스트리의 httpx 요청 훅에서 이 스케줄러를 통과합니다.
+- 모델별 토큰 버킷: 분당 요청 수(RPM) / 분당 토큰 수(TPM)
+- 우선순위 클래스: INTERACTIVE(채팅) > BACKGROUND(분석) > BATCH(평가/임베딩 일괄 작업)
+  같은 모델에서 더 높은 우선순위의 대기 요청이 있으면 낮은 우선순위 요청은 기다립니다.
+  (오래 기다린 요청은 AGING_SECONDS마다 한 단계씩 우선순위가 올라가 기아 상태를 방지)
+- 모델/우선순위별 대기열 길이, 대기 시간, 429 응답 수 통계 제공
+"""
+import asyncio
+import contextvars
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+# 대기 중 상태 재확인 최대 간격 (초)
+_POLL_SECONDS = 0.05
+# 이 시간(초)만큼 기다릴 때마다 우선순위 한 단계 상승
+AGING_SECONDS = 30.0
+# 요청 본문에 max_tokens가 없을 때 가정하는 출력 토큰 수
+_DEFAULT_COMPLETION_TOKENS = 256
+
+
+class Priority(IntEnum):
+    """우선순위 클래스 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    BATCH = 2
+
+
+# 레지스트리 purpose -> 기본 우선순위
+PURPOSE_PRIORITY = {
+    "chat": Priority.INTERACTIVE,
+    "rag_chat": Priority.INTERACTIVE,
+    "personal_chat": Priority.INTERACTIVE,
+    "vectorstore": Priority.INTERACTIVE,  # 질의 임베딩 (일괄 임베딩은 priority_scope로 낮춤)
+    "analysis": Priority.BACKGROUND,
+    "feedback_analysis": Priority.BACKGROUND,
+    "feedback_suggestion": Priority.BACKGROUND,
+    "topic_index": Priority.BACKGROUND,
+    "evaluation": Priority.BATCH,
+    "conversation_retrain": Priority.BATCH,
+}
+
+# 호출 측에서 우선순위를 덮어쓰기 위한 컨텍스트 변수 (예: ingest 중 임베딩은 BATCH)
+_priority_override: contextvars.ContextVar[Optional[Priority]] = contextvars.ContextVar(
+    "openai_priority_override", default=None
+)
+
+
+@contextmanager
+def priority_scope(priority: Priority):
+    """
+    블록 안에서 발생하는 OpenAI 호출의 우선순위를 지정
+
+    Example:
+        >>> with priority_scope(Priority.BATCH):
+        ...     store.add_texts(texts)
+    """
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def resolve_priority(purpose: str) -> Priority:
+    override = _priority_override.get()
+    if override is not None:
+        return override
+    return PURPOSE_PRIORITY.get(purpose, Priority.BACKGROUND)
+
+
+class TokenBucket:
+    """분당 한도 기반 토큰 버킷 (호출 측에서 lock 보유)"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = now - self._updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount 만큼 사용 가능해질 때까지 남은 시간 (초)"""
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class _Ticket:
+    __slots__ = ("seq", "model", "priority", "tokens", "enqueued_at")
+
+    def __init__(self, seq: int, model: str, priority: Priority, tokens: int):
+        self.seq = seq
+        self.model = model
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+
+    def sort_key(self, now: float) -> tuple:
+        aged = int(self.priority) - int((now - self.enqueued_at) / AGING_SECONDS)
+        return (aged, self.seq)
+
+
+class _ClassStats:
+    __slots__ = ("granted", "wait_seconds", "max_wait_seconds")
+
+    def __init__(self):
+        self.granted = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+
+class OpenAIScheduler:
+    """
+    모델별 RPM/TPM 토큰 버킷 + 우선순위 대기열 (스레드/asyncio 모두 지원)
+
+    Args:
+        limits: {모델명: {"rpm": int, "tpm": int}}
+        default_rpm: limits에 없는 모델의 분당 요청 한도
+        default_tpm: limits에 없는 모델의 분당 토큰 한도
+    """
+
+    def __init__(self, limits: dict[str, dict[str, int]], default_rpm: int, default_tpm: int):
+        self._limits = limits
+        self._default_rpm = default_rpm
+        self._default_tpm = default_tpm
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._buckets: dict[str, tuple[TokenBucket, TokenBucket]] = {}
+        self._waiting: dict[str, list[_Ticket]] = {}
+        self._stats: dict[tuple[str, Priority], _ClassStats] = {}
+        self._throttled: dict[str, int] = {}
+
+    # -----------------------------------
+    # 획득
+    # -----------------------------------
+    def acquire(self, model: str, tokens: int, priority: Priority) -> float:
+        """동기 획득 (스레드 블로킹). 대기한 시간(초)을 반환"""
+        ticket = self._enqueue(model, tokens, priority)
+        try:
+            while True:
+                wait = self._try_grant(ticket)
+                if wait == 0.0:
+                    return time.monotonic() - ticket.enqueued_at
+                time.sleep(min(wait, _POLL_SECONDS))
+        finally:
+            self._dequeue(ticket)
+
+    async def aacquire(self, model: str, tokens: int, priority: Priority) -> float:
+        """비동기 획득 (이벤트 루프 비차단, 취소 가능). 대기한 시간(초)을 반환"""
+        ticket = self._enqueue(model, tokens, priority)
+        try:
+            while True:
+                wait = self._try_grant(ticket)
+                if wait == 0.0:
+                    return time.monotonic() - ticket.enqueued_at
+                await asyncio.sleep(min(wait, _POLL_SECONDS))
+        finally:
+            self._dequeue(ticket)
+
+    def record_throttled(self, model: str):
+        """OpenAI가 429를 반환한 경우 기록"""
+        with self._lock:
+            self._throttled[model] = self._throttled.get(model, 0) + 1
+
+    # -----------------------------------
+    # 내부 처리
+    # -----------------------------------
+    def _get_buckets(self, model: str) -> tuple[TokenBucket, TokenBucket]:
+        if model not in self._buckets:
+            limit = self._limits.get(model, {})
+            self._buckets[model] = (
+                TokenBucket(limit.get("rpm", self._default_rpm)),
+                TokenBucket(limit.get("tpm", self._default_tpm)),
+            )
+        return self._buckets[model]
+
+    def _enqueue(self, model: str, tokens: int, priority: Priority) -> _Ticket:
+        with self._lock:
+            ticket = _Ticket(next(self._seq), model, priority, tokens)
+            self._waiting.setdefault(model, []).append(ticket)
+            return ticket
+
+    def _dequeue(self, ticket: _Ticket):
+        with self._lock:
+            queue = self._waiting.get(ticket.model, [])
+            if ticket in queue:
+                queue.remove(ticket)
+
+    def _try_grant(self, ticket: _Ticket) -> float:
+        """허용되면 0.0, 아니면 다시 확인할 때까지 기다릴 시간(초)"""
+        with self._lock:
+            now = time.monotonic()
+            queue = self._waiting.get(ticket.model, [])
+            head = min(queue, key=lambda t: t.sort_key(now))
+            if head is not ticket:
+                return _POLL_SECONDS
+
+            request_bucket, token_bucket = self._get_buckets(ticket.model)
+            request_bucket.refill(now)
+            token_bucket.refill(now)
+            wait = max(request_bucket.wait_time(1), token_bucket.wait_time(ticket.tokens))
+            if wait > 0:
+                return wait
+
+            request_bucket.consume(1)
+            token_bucket.consume(ticket.tokens)
+            queue.remove(ticket)
+
+            waited = now - ticket.enqueued_at
+            stats = self._stats.setdefault((ticket.model, ticket.priority), _ClassStats())
+            stats.granted += 1
+            stats.wait_seconds += waited
+            stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+            return 0.0
+
+    # -----------------------------------
+    # 통계
+    # -----------------------------------
+    def stats(self) -> dict:
+        """
+        모델별 버킷 잔량, 우선순위별 대기열 길이 / 평균·최대 대기 시간, 429 응답 수
+        """
+        with self._lock:
+            now = time.monotonic()
+            result = {}
+            models = set(self._buckets) | set(self._waiting)
+            for model in models:
+                request_bucket, token_bucket = self._get_buckets(model)
+                request_bucket.refill(now)
+                token_bucket.refill(now)
+                queue = self._waiting.get(model, [])
+
+                classes = {}
+                for priority in Priority:
+                    s = self._stats.get((model, priority))
+                    classes[priority.name.lower()] = {
+                        "queue_depth": sum(1 for t in queue if t.priority == priority),
+                        "granted": s.granted if s else 0,
+                        "avg_wait_ms": round(s.wait_seconds / s.granted * 1000, 1) if s and s.granted else 0.0,
+                        "max_wait_ms": round(s.max_wait_seconds * 1000, 1) if s else 0.0,
+                    }
+
+                result[model] = {
+                    "rpm_limit": int(request_bucket.capacity),
+                    "tpm_limit": int(token_bucket.capacity),
+                    "requests_available": int(request_bucket.tokens),
+                    "tokens_available": int(token_bucket.tokens),
+                    "throttled_responses": self._throttled.get(model, 0),
+                    "priorities": classes,
+                }
+            return result
+
+
+def estimate_request(request: httpx.Request) -> tuple[str, int]:
+    """
+    OpenAI 요청 본문에서 (모델명, 예상 토큰 수) 추정
+
+    입력 토큰은 본문 바이트 수 / 4로 근사하고, 채팅 요청은 max_tokens(없으면 기본값)를 더합니다.
+    """
+    try:
+        body = request.content or b""
+    except httpx.RequestNotRead:
+        body = b""
+    model = "unknown"
+    completion_tokens = 0
+    try:
+        payload = json.loads(body)
+        model = payload.get("model", model)
+        if request.url.path.endswith("/chat/completions"):
+            completion_tokens = (
+                payload.get("max_completion_tokens")
+                or payload.get("max_tokens")
+                or _DEFAULT_COMPLETION_TOKENS
+            )
+    except (ValueError, AttributeError):
+        pass
+    return model, len(body) // 4 + int(completion_tokens)
+
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> OpenAIScheduler:
+    """OpenAIScheduler 싱글톤 반환"""
+    return OpenAIScheduler(
+        limits=settings.OPENAI_RATE_LIMITS,
+        default_rpm=settings.OPENAI_DEFAULT_RPM,
+        default_tpm=settings.OPENAI_DEFAULT_TPM,
+    )
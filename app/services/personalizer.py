@@ -1,6 +1,5 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
-from app.core.config import settings
+from app.services.llm_client import get_chat_model
 
 
 def summarize_context(logs):
@@ -8,16 +7,31 @@ def summarize_context(logs):
     return "\n".join(summaries)
 
 
-def generate_personal_answer(question, logs):
+def _build_messages(question, logs):
     context = summarize_context(logs)
-    messages = [
+    return [
         SystemMessage(content="너는 사용자의 과거 대화를 이해하고 개인화된 답변을 주는 어시스턴트야."),
         HumanMessage(content=f"이전 대화 내용:\n{context}\n\n새로운 질문: {question}")
     ]
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7,
-        openai_api_key=settings.OPENAI_API_KEY
-    )
-    response = llm.invoke(messages)
+
+
+def _get_llm():
+    return get_chat_model("gpt-4o-mini", temperature=0.7, purpose="personal_chat")
+
+
+def generate_personal_answer(question, logs):
+    response = _get_llm().invoke(_build_messages(question, logs))
     return response.content
+
+
+async def agenerate_personal_answer(question, logs):
+    """generate_personal_answer의 비동기 버전 (.ainvoke 사용)"""
+    response = await _get_llm().ainvoke(_build_messages(question, logs))
+    return response.content
+
+
+async def astream_personal_answer(question, logs):
+    """개인화 답변 스트리밍 (.astream 사용, 문자열 조각을 yield)"""
+    async for chunk in _get_llm().astream(_build_messages(question, logs)):
+        if chunk.content:
+            yield chunk.content
@@ -1,14 +1,108 @@
-from langchain_openai import ChatOpenAI
+import asyncio
+import logging
+import threading
+from typing import Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
 from app.services.vectorstore import get_vectorstore
+from app.services.llm_client import get_chat_model
+from app.services.semantic_cache import get_semantic_cache
+from app.services.single_flight import single_flight
+from app.services.deadline import Deadline
+from app.services.text_splitter import count_tokens
+from app.services.federated_retriever import get_federated_retriever
+from app.services.retriever import adense_search, ahybrid_search, dense_search, hybrid_search
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# 검색할 문서 개수
+TOP_K = 3
+RAG_MODEL = "gpt-4o-mini"
+# LLM 지연으로 답변을 만들지 못했을 때의 안내 문구
+FALLBACK_ANSWER = "죄송합니다. 지금은 답변 생성이 지연되고 있습니다. 잠시 후 다시 시도해주세요."
+
+
+# 검색 컨텍스트 통계 (청크 수 / 토큰 수)
+_context_lock = threading.Lock()
+_context_stats = {"calls": 0, "chunks": 0, "tokens": 0, "max_tokens": 0}
+
 
 def format_docs(docs):
-    """검색된 문서를 문자열로 포맷팅"""
-    return "\n\n".join(doc.page_content for doc in docs)
+    """
+    검색된 문서(청크)를 문자열로 포맷팅
+
+    청크에 출처/섹션 메타데이터가 있으면 "[파일명 > 섹션]" 머리글을 붙여
+    LLM이 어느 문서의 어느 부분인지 알 수 있게 합니다.
+    """
+    parts = []
+    for doc in docs:
+        metadata = getattr(doc, "metadata", None) or {}
+        header = " > ".join(v for v in (metadata.get("source"), metadata.get("section")) if v)
+        parts.append(f"[{header}]\n{doc.page_content}" if header else doc.page_content)
+    context = "\n\n".join(parts)
+    _record_context(len(docs), count_tokens(context))
+    return context
+
+
+def _record_context(chunks: int, tokens: int):
+    with _context_lock:
+        _context_stats["calls"] += 1
+        _context_stats["chunks"] += chunks
+        _context_stats["tokens"] += tokens
+        _context_stats["max_tokens"] = max(_context_stats["max_tokens"], tokens)
+
+
+def get_context_stats() -> dict:
+    """RAG 호출당 평균 검색 청크 수 / 컨텍스트 토큰 수"""
+    with _context_lock:
+        calls = _context_stats["calls"]
+        return {
+            **_context_stats,
+            "top_k": TOP_K,
+            "avg_chunks": round(_context_stats["chunks"] / calls, 2) if calls else 0.0,
+            "avg_tokens": round(_context_stats["tokens"] / calls, 1) if calls else 0.0,
+        }
+
+
+def _search(store, user_input: str, query_vector):
+    """
+    문서 검색 (HYBRID_RETRIEVAL_ENABLED면 BM25 + 벡터 RRF 결합)
+
+    FEDERATED_RETRIEVAL_ENABLED면 conversation_retrained도 함께 검색하여 토큰 예산 안에서 병합합니다.
+    """
+    if settings.FEDERATED_RETRIEVAL_ENABLED:
+        return get_federated_retriever().search(user_input, query_vector)
+    if settings.HYBRID_RETRIEVAL_ENABLED:
+        return hybrid_search(store, user_input, query_vector, TOP_K)
+    return dense_search(store, query_vector, TOP_K)
+
+
+async def _asearch(store, user_input: str, query_vector):
+    if settings.FEDERATED_RETRIEVAL_ENABLED:
+        return await get_federated_retriever().asearch(user_input, query_vector)
+    if settings.HYBRID_RETRIEVAL_ENABLED:
+        return await ahybrid_search(store, user_input, query_vector, TOP_K)
+    return await adense_search(store, query_vector, TOP_K)
+
+
+def _build_answer_chain():
+    """
+    답변 생성 LCEL 체인 구성: prompt -> llm -> output_parser
+
+    입력: {"context": 검색된 문서 문자열, "question": 사용자 질문}
+    질문 임베딩을 시맨틱 캐시 조회와 벡터 검색에 함께 쓰기 위해, 검색은 체인 밖에서 수행합니다.
+    """
+    # 프롬프트 템플릿 정의
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "당신은 도움이 되는 AI 어시스턴트입니다. 아래 제공된 컨텍스트를 바탕으로 질문에 답변해주세요.\n\n컨텍스트: {context}"),
+        ("human", "{question}")
+    ])
+
+    # LLM 조회 (공유 레지스트리)
+    llm = get_chat_model(RAG_MODEL, temperature=0.4, purpose="rag_chat")
+
+    return prompt | llm | StrOutputParser()
 
 
 def get_rag_response(user_input: str) -> str:
@@ -16,6 +110,8 @@ def get_rag_response(user_input: str) -> str:
     RAG(Retrieval-Augmented Generation) 방식으로 AI 응답 생성
 
     VectorStore에서 관련 문서를 검색하고, 해당 문서를 컨텍스트로 활용하여 답변을 생성합니다.
+    유사한 질문의 답변이 시맨틱 캐시에 있으면 검색/생성 없이 캐시된 답변을 반환합니다.
+    동기 버전으로, 스크립트/CLI에서 사용합니다. API 라우터는 aget_rag_response를 사용하세요.
 
     Args:
         user_input (str): 사용자 질문
@@ -23,31 +119,138 @@ def get_rag_response(user_input: str) -> str:
     Returns:
         str: AI 생성 답변
     """
-    # VectorStore에서 retriever 생성
     store = get_vectorstore()
-    retriever = store.as_retriever(search_kwargs={"k": 3})
+    query_vector = store.embeddings.embed_query(user_input)
 
-    # 프롬프트 템플릿 정의
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "당신은 도움이 되는 AI 어시스턴트입니다. 아래 제공된 컨텍스트를 바탕으로 질문에 답변해주세요.\n\n컨텍스트: {context}"),
-        ("human", "{question}")
-    ])
+    if settings.SEMANTIC_CACHE_ENABLED:
+        cached = get_semantic_cache().lookup(query_vector)
+        if cached is not None:
+            return cached
 
-    # LLM 초기화
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.4,
-        openai_api_key=settings.OPENAI_API_KEY
-    )
+    docs = _search(store, user_input, query_vector)
+    response = _build_answer_chain().invoke({"context": format_docs(docs), "question": user_input})
 
-    # LCEL 체인 구성: retriever -> format_docs -> prompt -> llm -> output_parser
-    rag_chain = (
-        {"context": retriever | format_docs, "question": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
+    if settings.SEMANTIC_CACHE_ENABLED:
+        get_semantic_cache().put(user_input, query_vector, response)
+    return response
+
+
+async def aget_rag_response(user_input: str, deadline: Optional[Deadline] = None) -> str:
+    """
+    get_rag_response의 비동기 버전
+
+    임베딩, 검색, LLM 호출 모두 비동기로 실행되어, 응답을 기다리는 동안 이벤트 루프가
+    다른 요청을 처리할 수 있습니다. 같은 질문이 동시에 들어오면 진행 중인 검색/생성
+    1건의 결과를 공유합니다 (single-flight).
+
+    deadline이 주어지면 예산 안에서 단계별로 강등합니다:
+    - 검색(임베딩 + 벡터 검색)이 예산 비율을 넘기면 컨텍스트 없이 답변 ("retrieval")
+    - LLM이 남은 예산 안에 끝나지 않으면 유사도 기준을 낮춘 캐시 답변 또는
+      안내 문구로 대체 ("generation")
+
+    Args:
+        user_input (str): 사용자 질문
+        deadline (Deadline, optional): 요청 지연 예산
+
+    Returns:
+        str: AI 생성 답변
+    """
+    answer, degraded = await single_flight.do(
+        "rag_chat", RAG_MODEL, user_input, lambda: _aget_rag_response(user_input, deadline)
     )
+    if deadline is not None:
+        for stage in degraded:
+            deadline.degrade(stage)
+    return answer
 
-    # 체인 실행
-    response = rag_chain.invoke(user_input)
-    return response
+
+async def _aget_rag_response(user_input: str, deadline: Optional[Deadline]) -> tuple[str, list[str]]:
+    """aget_rag_response의 실제 처리 (병합되지 않은 단일 실행). (답변, 강등된 단계 목록) 반환"""
+    store = get_vectorstore()
+    degraded: list[str] = []
+
+    async def retrieve():
+        vector = await store.embeddings.aembed_query(user_input)
+        if settings.SEMANTIC_CACHE_ENABLED:
+            cached = get_semantic_cache().lookup(vector)
+            if cached is not None:
+                return vector, None, cached
+        found = await _asearch(store, user_input, vector)
+        return vector, found, None
+
+    query_vector, docs = None, []
+    try:
+        if deadline is None:
+            query_vector, docs, cached = await retrieve()
+        else:
+            retrieval_ms = deadline.budget_ms * settings.RAG_RETRIEVAL_BUDGET_RATIO
+            query_vector, docs, cached = await deadline.run(retrieve(), max_ms=retrieval_ms)
+        if cached is not None:
+            return cached, degraded
+    except asyncio.TimeoutError:
+        if deadline is None:
+            raise
+        degraded.append("retrieval")
+        logger.warning("RAG 검색 예산 초과 - 컨텍스트 없이 답변합니다.")
+        docs = []
+
+    chain_input = {"context": format_docs(docs), "question": user_input}
+    try:
+        if deadline is None:
+            response = await _build_answer_chain().ainvoke(chain_input)
+        else:
+            response = await deadline.run(_build_answer_chain().ainvoke(chain_input))
+    except asyncio.TimeoutError:
+        if deadline is None:
+            raise
+        degraded.append("generation")
+        logger.warning("RAG 답변 생성 예산 초과 - 대체 답변을 반환합니다.")
+        return _fallback_answer(query_vector), degraded
+
+    # 컨텍스트 없이 만든 답변은 캐시하지 않음
+    if settings.SEMANTIC_CACHE_ENABLED and query_vector is not None and not degraded:
+        get_semantic_cache().put(user_input, query_vector, response)
+    return response, degraded
+
+
+def _fallback_answer(query_vector) -> str:
+    """LLM 지연 시 대체 답변: 완화된 임계값으로 캐시 조회, 없으면 안내 문구"""
+    if settings.SEMANTIC_CACHE_ENABLED and query_vector is not None:
+        cached = get_semantic_cache().lookup(query_vector, threshold=settings.SEMANTIC_CACHE_FALLBACK_THRESHOLD)
+        if cached is not None:
+            return cached
+    return FALLBACK_ANSWER
+
+
+async def astream_rag_response(user_input: str):
+    """
+    RAG 스트리밍 응답 생성 (.astream 사용)
+
+    검색이 끝난 뒤 LLM이 생성하는 토큰을 즉시 yield 하므로, 첫 토큰까지의 지연이
+    전체 생성 시간이 아니라 검색 + 첫 토큰 생성 시간으로 줄어듭니다.
+    시맨틱 캐시 적중 시에는 캐시된 답변 전체를 한 번에 yield 합니다.
+
+    Args:
+        user_input (str): 사용자 질문
+
+    Yields:
+        str: 답변 문자열 조각
+    """
+    store = get_vectorstore()
+    query_vector = await store.embeddings.aembed_query(user_input)
+
+    if settings.SEMANTIC_CACHE_ENABLED:
+        cached = get_semantic_cache().lookup(query_vector)
+        if cached is not None:
+            yield cached
+            return
+
+    docs = await _asearch(store, user_input, query_vector)
+    chunks = []
+    async for chunk in _build_answer_chain().astream({"context": format_docs(docs), "question": user_input}):
+        if chunk:
+            chunks.append(chunk)
+            yield chunk
+
+    if settings.SEMANTIC_CACHE_ENABLED and chunks:
+        get_semantic_cache().put(user_input, query_vector, "".join(chunks))
@@ -0,0 +1,263 @@
+"""
+LLM 분석 결과 캐시 (content-addressed)
+
+같은 텍스트를 다시 분석하는 경우(재시도, 백필, 평가 재실행, 반복되는 피드백 사유)
+LLM을 다시 호출하지 않고 저장된 결과를 반환합니다.
+- 키: sha256(함수 이름 + 프롬프트 템플릿 버전 + 모델 + 입력 텍스트)
+  → 프롬프트를 바꾸면 버전만 올려서 기존 결과를 자연스럽게 무효화
+- sqlite3 파일에 저장하여 API 서버 / 스크립트 / 재시작 간에 공유
+- 최대 항목 수 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+  (적중 시 사용 시각은 메모리에 모아 두었다가 저장 / 제거 시점에 한 번에 기록 → 조회는 SELECT 1회)
+- 비동기 함수에서는 sqlite I/O를 스레드에서 실행하여 이벤트 루프를 막지 않음
+- 함수별 적중/미스/저장 카운터 제공
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 제거 시 한 번에 지울 비율 (매 저장마다 DELETE가 일어나지 않도록 여유를 둠)
+_EVICT_FRACTION = 0.05
+# 메모리에 모아 둔 사용 시각이 이 개수를 넘으면 기록
+_TOUCH_FLUSH = 200
+
+_MISS = object()
+
+
+def make_key(function: str, version: str, model: str, payload: Any) -> str:
+    raw = json.dumps([function, version, model, payload], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    sqlite3 기반 LRU 결과 캐시 (스레드 안전)
+
+    Args:
+        path: sqlite 파일 경로
+        max_entries: 최대 항목 수
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, int]] = {}
+        # 아직 기록하지 않은 적중 항목의 사용 시각 (key → accessed_at)
+        self._touched: dict[str, float] = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                function TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_results_accessed_at ON results (accessed_at)")
+        self._conn.commit()
+
+    def get(self, function: str, key: str) -> Any:
+        """캐시된 값 반환 (없으면 _MISS)"""
+        return self.get_many(function, [key]).get(key, _MISS)
+
+    def get_many(self, function: str, keys: list[str]) -> dict[str, Any]:
+        """여러 키를 SELECT 한 번으로 조회 → {키: 값} (없는 키는 제외)"""
+        if not keys:
+            return {}
+        with self._lock:
+            stats = self._function_stats(function)
+            try:
+                placeholders = ",".join("?" * len(keys))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({placeholders})", list(keys)
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"결과 캐시 조회 실패: {e}")
+                stats["misses"] += len(keys)
+                return {}
+            now = time.time()
+            for key, _ in rows:
+                self._touched[key] = now
+            stats["hits"] += len(rows)
+            stats["misses"] += len(set(keys)) - len(rows)
+            if len(self._touched) >= _TOUCH_FLUSH:
+                self._flush_touched()
+        return {key: json.loads(value) for key, value in rows}
+
+    def put(self, function: str, key: str, value: Any):
+        self.put_many(function, {key: value})
+
+    def put_many(self, function: str, values: dict[str, Any]):
+        """여러 결과를 한 트랜잭션으로 저장"""
+        if not values:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO results (key, function, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    [(key, function, json.dumps(value, ensure_ascii=False), now, now) for key, value in values.items()],
+                )
+                self._flush_touched(commit=False)
+                self._evict_if_needed()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"결과 캐시 저장 실패: {e}")
+                return
+            self._function_stats(function)["stores"] += len(values)
+
+    def clear(self, function: Optional[str] = None):
+        """전체 또는 특정 함수의 캐시 삭제"""
+        with self._lock:
+            if function:
+                self._conn.execute("DELETE FROM results WHERE function = ?", (function,))
+            else:
+                self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._flush_touched()
+            size = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            per_function = {}
+            for function, s in self._stats.items():
+                lookups = s["hits"] + s["misses"]
+                per_function[function] = {
+                    **s,
+                    "hit_rate": round(s["hits"] / lookups, 3) if lookups else 0.0,
+                }
+            return {
+                "size": size,
+                "max_entries": self.max_entries,
+                "evictions": sum(s["evictions"] for s in self._stats.values()),
+                "functions": per_function,
+            }
+
+    # -----------------------------------
+    # 내부 헬퍼 (호출 측에서 lock 보유)
+    # -----------------------------------
+    def _function_stats(self, function: str) -> dict[str, int]:
+        return self._stats.setdefault(function, {"hits": 0, "misses": 0, "stores": 0, "evictions": 0})
+
+    def _flush_touched(self, commit: bool = True):
+        """모아 둔 사용 시각을 한 번에 기록 (LRU 제거 순서에 반영)"""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        try:
+            self._conn.executemany(
+                "UPDATE results SET accessed_at = ? WHERE key = ?", [(at, key) for key, at in touched.items()]
+            )
+            if commit:
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"결과 캐시 사용 시각 기록 실패: {e}")
+
+    def _evict_if_needed(self):
+        size = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if size <= self.max_entries:
+            return
+        excess = size - self.max_entries + max(int(self.max_entries * _EVICT_FRACTION), 1)
+        rows = self._conn.execute(
+            "SELECT key, function FROM results ORDER BY accessed_at LIMIT ?", (excess,)
+        ).fetchall()
+        self._conn.executemany("DELETE FROM results WHERE key = ?", [(key,) for key, _ in rows])
+        for _, function in rows:
+            self._function_stats(function)["evictions"] += 1
+
+
+def _default_cache_path() -> str:
+    """설정이 없으면 CHROMA_PATH와 같은 디렉토리에 저장"""
+    if settings.RESULT_CACHE_PATH:
+        return settings.RESULT_CACHE_PATH
+    chroma_parent = os.path.dirname(os.path.abspath(settings.CHROMA_PATH))
+    return os.path.join(chroma_parent, "result_cache.sqlite3")
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> ResultCache:
+    """ResultCache 싱글톤 반환"""
+    return ResultCache(_default_cache_path(), settings.RESULT_CACHE_MAX_ENTRIES)
+
+
+def cached_result(
+    function: str,
+    version: str,
+    model: str,
+    key_args: Iterable[str],
+    should_cache: Callable[[Any], bool] = lambda result: result is not None,
+):
+    """
+    LLM 호출 함수의 결과를 입력 텍스트 기준으로 캐싱하는 데코레이터 (동기/비동기 모두 지원)
+
+    Args:
+        function: 통계/키에 쓰는 함수 이름 (동기/비동기 버전이 같은 이름을 쓰면 결과 공유)
+        version: 프롬프트 템플릿 버전 (프롬프트 변경 시 올림)
+        model: LLM 모델명
+        key_args: 키에 포함할 인자 이름 (deadline 등 결과와 무관한 인자는 제외)
+        should_cache: 결과를 저장할지 판단 (오류/기본값 결과는 저장하지 않음)
+
+    Example:
+        >>> @cached_result("evaluate_response", "v1", "gpt-4o-mini", key_args=("answer", "question"))
+        ... def evaluate_response(answer, question): ...
+    """
+    key_args = tuple(key_args)
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        def lookup(args, kwargs):
+            if not settings.RESULT_CACHE_ENABLED:
+                return None, _MISS
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = make_key(function, version, model, [bound.arguments[name] for name in key_args])
+            return key, get_result_cache().get(function, key)
+
+        def store(key, result):
+            if key is not None and should_cache(result):
+                get_result_cache().put(function, key, result)
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                # sqlite I/O는 스레드에서 실행 (이벤트 루프 차단 방지)
+                key, cached = await asyncio.to_thread(lookup, args, kwargs)
+                if cached is not _MISS:
+                    return cached
+                result = await fn(*args, **kwargs)
+                await asyncio.to_thread(store, key, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key, cached = lookup(args, kwargs)
+            if cached is not _MISS:
+                return cached
+            result = fn(*args, **kwargs)
+            store(key, result)
+            return result
+        return wrapper
+
+    return decorator
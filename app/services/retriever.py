@@ -0,0 +1,355 @@
+"""
+하이브리드 검색 (BM25 + 벡터)
+
+Dense(Chroma) 검색만으로는 도구 이름, 강의명처럼 키워드가 중요한 한국어 질의를 놓치기 쉬워
+키워드 검색(BM25)을 함께 돌려 순위를 합칩니다.
+- 토크나이저: 한글은 글자 n-gram(기본 2-gram), 영문/숫자는 소문자 단어 단위
+  → 형태소 분석기 없이 조사/띄어쓰기 차이에 강함 ("랭체인으로" ↔ "랭체인")
+- 역색인: 인제스트 시 청크 ID 기준으로 추가/삭제 (증분 갱신), CHROMA_PATH 안 JSON 파일로 저장
+  다른 프로세스(인제스트 스크립트)가 파일을 갱신하면 다음 검색 때 다시 로드
+  색인 파일은 store 디렉토리 안에 있어 블루/그린 전환 시 활성 버전의 색인으로 함께 바뀜
+- 순위 결합: Reciprocal Rank Fusion (점수 = Σ 1 / (RRF_K + 순위)), 점수 척도 정규화 불필요
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from langchain_core.documents import Document
+
+from app.core.config import settings
+from app.services.collection_alias import active_store_path
+from app.services.exact_search import aexact_search, exact_search, get_exact_index
+from app.services.vectorstore import get_vectorstore
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "bm25_index.json"
+INDEX_VERSION = 1
+# BM25 파라미터 (일반적인 기본값)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD_RE = re.compile(r"[가-힣]+|[a-z0-9]+(?:[.+#-][a-z0-9]+)*")
+
+
+def tokenize(text: str, ngram: int = 2) -> list[str]:
+    """
+    BM25용 토큰화
+
+    Example:
+        >>> tokenize("LangChain 강의를 추천해주세요")
+        ['langchain', '강의', '의를', '추천', '천해', '해주', '주세', '세요']
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        if word[0] < "가" or len(word) <= ngram:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + ngram] for i in range(len(word) - ngram + 1))
+    return tokens
+
+
+class BM25Index:
+    """
+    청크 ID 기반 BM25 역색인 (스레드 안전)
+
+    Args:
+        path: 저장 파일 경로 (JSON: 청크 ID → 본문 / 메타데이터)
+        ngram: 한글 n-gram 크기
+    """
+
+    def __init__(self, path: str, ngram: int = 2):
+        self.path = path
+        self.ngram = ngram
+        self._lock = threading.Lock()
+        # 청크 ID → (본문, 메타데이터)
+        self._docs: dict[str, tuple[str, dict]] = {}
+        # 토큰 → {청크 ID: 출현 횟수}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+        self._loaded_mtime: Optional[float] = None
+        self.searches = 0
+        self._search_seconds = 0.0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # -----------------------------------
+    # 증분 갱신
+    # -----------------------------------
+    def upsert(self, items: Iterable[tuple[str, str, dict]]):
+        """(청크 ID, 본문, 메타데이터) 추가 또는 교체"""
+        with self._lock:
+            for doc_id, text, metadata in items:
+                self._remove(doc_id)
+                self._add(doc_id, text, metadata)
+
+    def delete(self, ids: Iterable[str]):
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def delete_source(self, source: str):
+        """metadata.source가 같은 청크 모두 삭제 (ID 없이 추가된 기존 벡터 정리용)"""
+        with self._lock:
+            for doc_id in [i for i, (_, metadata) in self._docs.items() if metadata.get("source") == source]:
+                self._remove(doc_id)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def rebuild_from_store(self, store):
+        """Chroma 컬렉션 전체로 색인 재구성 (색인 파일이 없는 기존 컬렉션용)"""
+        data = store.get(include=["documents", "metadatas"])
+        with self._lock:
+            self._clear()
+            for doc_id, text, metadata in zip(data["ids"], data["documents"], data["metadatas"]):
+                self._add(doc_id, text or "", metadata or {})
+        self.save()
+        logger.info(f"BM25 색인 재구성: {len(self._docs)}개 청크")
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체"""
+        with self._lock:
+            payload = {
+                "version": INDEX_VERSION,
+                "ngram": self.ngram,
+                "docs": {doc_id: [text, metadata] for doc_id, (text, metadata) in self._docs.items()},
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        with self._lock:
+            self._loaded_mtime = os.path.getmtime(self.path)
+
+    # -----------------------------------
+    # 검색
+    # -----------------------------------
+    def search(self, query: str, k: int) -> list[tuple[Document, float]]:
+        """BM25 점수 상위 k개 (점수가 0인 문서는 제외)"""
+        started = time.perf_counter()
+        self.refresh()
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs:
+                return []
+            avg_length = self._total_length / n_docs
+            scores: dict[str, float] = {}
+            for term, query_tf in Counter(tokenize(query, self.ngram)).items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+            top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            results = [
+                (Document(page_content=self._docs[doc_id][0], metadata=self._docs[doc_id][1], id=doc_id), score)
+                for doc_id, score in top
+            ]
+            self.searches += 1
+            self._search_seconds += time.perf_counter() - started
+            return results
+
+    def refresh(self):
+        """다른 프로세스가 색인 파일을 갱신했으면 다시 로드"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            self._load()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "terms": len(self._postings),
+                "searches": self.searches,
+                "avg_search_ms": round(self._search_seconds * 1000 / self.searches, 2) if self.searches else 0.0,
+            }
+
+    # -----------------------------------
+    # 내부 헬퍼 (호출 측에서 lock 보유)
+    # -----------------------------------
+    def _add(self, doc_id: str, text: str, metadata: dict):
+        tokens = tokenize(text, self.ngram)
+        self._docs[doc_id] = (text, metadata)
+        self._lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+        for term, tf in Counter(tokens).items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def _remove(self, doc_id: str):
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in set(tokenize(entry[0], self.ngram)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _clear(self):
+        self._docs, self._postings, self._lengths = {}, {}, {}
+        self._total_length = 0
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self._clear()
+            if data.get("version") == INDEX_VERSION and data.get("ngram") == self.ngram:
+                for doc_id, (text, metadata) in data.get("docs", {}).items():
+                    self._add(doc_id, text, metadata)
+            self._loaded_mtime = os.path.getmtime(self.path)
+
+
+def reciprocal_rank_fusion(rankings: list[list[Document]], k: int, rrf_k: int) -> list[Document]:
+    """
+    여러 순위 목록을 RRF로 결합하여 상위 k개 반환
+
+    같은 청크는 ID(없으면 본문)로 식별합니다.
+    """
+    return [doc for doc, _ in reciprocal_rank_fusion_with_scores(rankings, k, rrf_k)]
+
+
+def reciprocal_rank_fusion_with_scores(
+    rankings: list[list[Document]], k: int, rrf_k: int
+) -> list[tuple[Document, float]]:
+    """reciprocal_rank_fusion과 같지만 (Document, RRF 점수) 목록 반환"""
+    scores: dict[str, float] = {}
+    docs: dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, 1):
+            key = _doc_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            docs.setdefault(key, doc)
+    ordered = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [(docs[key], scores[key]) for key in ordered]
+
+
+def _doc_key(doc: Document) -> str:
+    return getattr(doc, "id", None) or doc.page_content
+
+
+def default_index_path(store_path: Optional[str] = None) -> str:
+    """Chroma 컬렉션과 같은 디렉토리에 저장 (reset 시 함께 삭제, 블루/그린 전환 시 함께 전환됨)"""
+    return os.path.join(store_path or active_store_path(), INDEX_FILE)
+
+
+def get_bm25_index(store_path: Optional[str] = None) -> BM25Index:
+    """BM25Index 반환 (store_path를 주지 않으면 활성 버전의 색인)"""
+    return _bm25_index_at(store_path or active_store_path())
+
+
+@lru_cache(maxsize=4)
+def _bm25_index_at(store_path: str) -> BM25Index:
+    """디렉토리별 싱글톤 (색인이 비어 있으면 Chroma 컬렉션에서 재구성)"""
+    index = BM25Index(default_index_path(store_path), settings.HYBRID_NGRAM)
+    if not len(index):
+        try:
+            index.rebuild_from_store(get_vectorstore(persist_directory=store_path))
+        except Exception as e:
+            logger.warning(f"BM25 색인 재구성 실패: {e}")
+    return index
+
+
+def _use_exact_search() -> bool:
+    """EXACT_SEARCH_ENABLED이고 내보낸 행렬이 있을 때만 (없으면 Chroma로 폴백)"""
+    return settings.EXACT_SEARCH_ENABLED and len(get_exact_index()) > 0
+
+
+def dense_search(store, query_vector: list[float], k: int) -> list[Document]:
+    """벡터 검색 (EXACT_SEARCH_ENABLED면 NumPy 정확 검색, 아니면 Chroma HNSW)"""
+    if _use_exact_search():
+        return exact_search(query_vector, k)
+    return store.similarity_search_by_vector(query_vector, k=k)
+
+
+def cosine_scores(store, results: list[tuple[Document, float]]) -> list[tuple[Document, float]]:
+    """
+    Chroma (Document, 거리) 목록 → (Document, 코사인 유사도) 목록
+
+    기본 l2 공간의 거리는 제곱 유클리드 거리이므로 단위 벡터(OpenAI 임베딩)에서 d = 2 - 2·cos,
+    cosine / ip 공간은 d = 1 - cos입니다. 컬렉션이 달라도 같은 척도로 비교할 수 있습니다.
+    """
+    space = (store._collection.metadata or {}).get("hnsw:space", "l2")
+    if space == "l2":
+        return [(doc, 1.0 - distance / 2) for doc, distance in results]
+    return [(doc, 1.0 - distance) for doc, distance in results]
+
+
+def dense_search_with_scores(store, query_vector: list[float], k: int) -> list[tuple[Document, float]]:
+    """dense_search와 같지만 (Document, 코사인 유사도) 목록 반환"""
+    if _use_exact_search():
+        return get_exact_index().search(query_vector, k)
+    return cosine_scores(store, store.similarity_search_by_vector_with_relevance_scores(query_vector, k=k))
+
+
+async def adense_search(store, query_vector: list[float], k: int) -> list[Document]:
+    if _use_exact_search():
+        return await aexact_search(query_vector, k)
+    return await store.asimilarity_search_by_vector(query_vector, k=k)
+
+
+def hybrid_search(store, query: str, query_vector: list[float], k: int) -> list[Document]:
+    """
+    벡터 검색 + BM25 검색 결과를 RRF로 결합
+
+    각 검색에서 HYBRID_FETCH_K개씩 가져와 결합한 뒤 상위 k개를 반환합니다.
+    """
+    return [doc for doc, _ in hybrid_search_with_scores(store, query, query_vector, k)]
+
+
+def hybrid_search_with_scores(store, query: str, query_vector: list[float], k: int) -> list[tuple[Document, float]]:
+    """
+    hybrid_search와 같은 순서로 (Document, 코사인 유사도) 목록 반환
+
+    RRF 점수는 순위로만 정해져 다른 컬렉션 점수와 비교할 수 없으므로 dense 검색의 코사인 유사도를 붙입니다.
+    BM25에서만 찾은 청크는 dense 후보 밖이므로 dense 후보 중 가장 낮은 유사도를 씁니다.
+    """
+    fetch_k = max(k, settings.HYBRID_FETCH_K)
+    dense = dense_search_with_scores(store, query_vector, fetch_k)
+    sparse = [doc for doc, _ in get_bm25_index().search(query, fetch_k)]
+    fused = reciprocal_rank_fusion_with_scores([[doc for doc, _ in dense], sparse], k, settings.HYBRID_RRF_K)
+    cosine = {_doc_key(doc): score for doc, score in dense}
+    floor = min(cosine.values(), default=0.0)
+    return [(doc, cosine.get(_doc_key(doc), floor)) for doc, _ in fused]
+
+
+def _bm25_search(query: str, k: int) -> list[tuple[Document, float]]:
+    return get_bm25_index().search(query, k)
+
+
+async def ahybrid_search(store, query: str, query_vector: list[float], k: int) -> list[Document]:
+    """hybrid_search의 비동기 버전 (BM25 검색은 dense 검색과 동시에 스레드에서 실행)"""
+    fetch_k = max(k, settings.HYBRID_FETCH_K)
+    # 첫 호출의 색인 로드 / Chroma 재구성과 점수 계산 모두 CPU / 파일 I/O라 이벤트 루프를 막지 않도록 분리
+    dense, scored = await asyncio.gather(
+        adense_search(store, query_vector, fetch_k),
+        asyncio.to_thread(_bm25_search, query, fetch_k),
+    )
+    sparse = [doc for doc, _ in scored]
+    return reciprocal_rank_fusion([dense, sparse], k, settings.HYBRID_RRF_K)
@@ -0,0 +1,304 @@
+"""
+RAG 시맨틱 답변 캐시
+
+질문 임베딩의 코사인 유사도가 임계값 이상인 이전 질문이 있으면, 검색과 LLM 호출 없이
+저장된 답변을 그대로 반환합니다.
+- 유사도 임계값 / TTL / 최대 항목 수(LRU 제거) 설정 가능
+- CHROMA_PATH 옆 .npz 파일에 주기적으로 저장하여 재시작 후에도 유지
+  (전체 스냅샷 쓰기는 백그라운드 스레드에서 실행하여 요청 경로를 막지 않음, 종료 시 flush)
+- 문서 코퍼스가 바뀌면 invalidate()로 전체 무효화 (버전 파일로 다른 워커에도 전파)
+- 적중/미스/제거 카운터 제공 (임계값 튜닝용)
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 파일 저장 최소 간격 (초) - 매 put마다 전체 행렬을 쓰지 않도록 제한
+_SAVE_INTERVAL_SECONDS = 30.0
+
+
+def _normalize(vector) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm > 0 else v
+
+
+class SemanticCache:
+    """
+    임베딩 유사도 기반 LRU + TTL 답변 캐시 (스레드 안전)
+
+    Args:
+        path: 저장 파일 경로 (.npz)
+        threshold: 적중으로 판단할 최소 코사인 유사도 (0~1)
+        ttl_seconds: 항목 유효 시간 (초)
+        max_entries: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+    """
+
+    def __init__(self, path: str, threshold: float, ttl_seconds: int, max_entries: int):
+        self.path = path
+        self.version_path = f"{path}.version"
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        # key -> {"question", "answer", "created_at", "vector"} (LRU 순서 유지)
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_keys: list[str] = []
+        self._dirty = False
+        self._last_save = 0.0
+        self._saving = False
+        self._save_thread: Optional[threading.Thread] = None
+        # invalidate / 버전 변경마다 증가 (그 전에 찍은 스냅샷이 무효화된 항목을 되살리지 않도록)
+        self._generation = 0
+        self._version = self._read_version()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._hit_similarity_sum = 0.0
+
+        self._load()
+
+    # -----------------------------------
+    # 조회 / 저장
+    # -----------------------------------
+    def lookup(self, vector, threshold: Optional[float] = None) -> Optional[str]:
+        """
+        유사한 질문의 캐시된 답변 반환 (없으면 None)
+
+        Args:
+            vector: 질문 임베딩
+            threshold: 이번 조회에만 적용할 유사도 임계값 (기본값: self.threshold)
+        """
+        threshold = self.threshold if threshold is None else threshold
+        query = _normalize(vector)
+        with self._lock:
+            self._check_version()
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            matrix, keys = self._get_matrix()
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+
+            if similarity < threshold:
+                self.misses += 1
+                return None
+
+            key = keys[best]
+            entry = self._entries[key]
+            if time.time() - entry["created_at"] > self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._hit_similarity_sum += similarity
+            return entry["answer"]
+
+    def put(self, question: str, vector, answer: str):
+        """새 질문/답변을 캐시에 저장"""
+        with self._lock:
+            self._check_version()
+            self._entries[uuid.uuid4().hex] = {
+                "question": question,
+                "answer": answer,
+                "created_at": time.time(),
+                "vector": _normalize(vector),
+            }
+            self._matrix = None
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            self._dirty = True
+            save_due = not self._saving and time.time() - self._last_save >= _SAVE_INTERVAL_SECONDS
+            if save_due:
+                self._saving = True
+        if save_due:
+            # 전체 스냅샷 np.savez는 요청 코루틴(이벤트 루프)을 막지 않도록 백그라운드 스레드에서 실행
+            self._save_thread = threading.Thread(target=self._save_in_background, name="semantic-cache-save", daemon=True)
+            self._save_thread.start()
+
+    def invalidate(self):
+        """코퍼스 변경 시 전체 무효화 (파일 삭제 + 버전 갱신으로 다른 워커에도 전파)"""
+        with self._lock:
+            self._clear()
+            self.invalidations += 1
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            with open(self.version_path, "w", encoding="utf-8") as f:
+                f.write(str(time.time()))
+            self._version = self._read_version()
+        logger.info("시맨틱 캐시 무효화 완료")
+
+    def flush(self):
+        """변경 사항을 즉시 파일로 저장 (서버 종료 시 호출)"""
+        # 진행 중인 백그라운드 저장이 끝난 뒤 남은 변경만 저장
+        save_thread = self._save_thread
+        if save_thread is not None:
+            save_thread.join()
+        with self._lock:
+            snapshot = self._snapshot() if self._dirty else None
+        if snapshot:
+            self._write(snapshot)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "avg_hit_similarity": round(self._hit_similarity_sum / self.hits, 4) if self.hits else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    # -----------------------------------
+    # 내부 헬퍼 (호출 측에서 lock 보유)
+    # -----------------------------------
+    def _get_matrix(self) -> tuple[np.ndarray, list[str]]:
+        if self._matrix is None:
+            self._matrix_keys = list(self._entries.keys())
+            self._matrix = np.stack([self._entries[k]["vector"] for k in self._matrix_keys])
+        return self._matrix, self._matrix_keys
+
+    def _remove(self, key: str):
+        self._entries.pop(key, None)
+        self._matrix = None
+        self._dirty = True
+
+    def _clear(self):
+        self._entries.clear()
+        self._matrix = None
+        self._dirty = False
+        self._generation += 1
+
+    def _read_version(self) -> float:
+        try:
+            return os.path.getmtime(self.version_path)
+        except OSError:
+            return 0.0
+
+    def _check_version(self):
+        """다른 프로세스(ingest 스크립트 등)가 무효화했으면 메모리 캐시도 비움"""
+        version = self._read_version()
+        if version != self._version:
+            self._clear()
+            self._version = version
+
+    def _snapshot(self) -> Optional[tuple[int, list[tuple[str, dict]]]]:
+        """저장할 항목 목록만 복사 (행렬 생성 / 파일 쓰기는 lock 밖 _write에서)"""
+        if not self._entries:
+            return None
+        self._dirty = False
+        self._last_save = time.time()
+        return self._generation, list(self._entries.items())
+
+    # -----------------------------------
+    # 파일 저장 (lock 없이 호출)
+    # -----------------------------------
+    def _save_in_background(self):
+        try:
+            with self._lock:
+                snapshot = self._snapshot()
+            if snapshot:
+                self._write(snapshot)
+        finally:
+            with self._lock:
+                self._saving = False
+
+    def _write(self, snapshot: tuple[int, list[tuple[str, dict]]]):
+        generation, items = snapshot
+        # 백그라운드 저장과 flush가 겹쳐도 서로의 임시 파일을 덮어쓰지 않도록 이름을 분리
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp.npz"
+        try:
+            np.savez(
+                tmp_path,
+                keys=np.array([key for key, _ in items]),
+                questions=np.array([e["question"] for _, e in items]),
+                answers=np.array([e["answer"] for _, e in items]),
+                created_at=np.array([e["created_at"] for _, e in items], dtype=np.float64),
+                vectors=np.stack([e["vector"] for _, e in items]),
+            )
+            with self._lock:
+                if generation == self._generation:
+                    os.replace(tmp_path, self.path)
+                    return
+            # 쓰는 동안 invalidate되었으면 버림 (무효화된 답변이 파일로 되살아나지 않도록)
+            os.remove(tmp_path)
+        except Exception as e:
+            logger.warning(f"시맨틱 캐시 저장 실패: {e}")
+            with self._lock:
+                self._dirty = True
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            data = np.load(self.path)
+            now = time.time()
+            for key, question, answer, created_at, vector in zip(
+                data["keys"], data["questions"], data["answers"], data["created_at"], data["vectors"]
+            ):
+                if now - float(created_at) > self.ttl_seconds:
+                    continue
+                self._entries[str(key)] = {
+                    "question": str(question),
+                    "answer": str(answer),
+                    "created_at": float(created_at),
+                    "vector": vector.astype(np.float32),
+                }
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            logger.info(f"시맨틱 캐시 로드: {len(self._entries)}개 항목")
+        except Exception as e:
+            logger.warning(f"시맨틱 캐시 로드 실패 (빈 캐시로 시작): {e}")
+            self._entries.clear()
+
+
+def _default_cache_path() -> str:
+    """설정이 없으면 CHROMA_PATH와 같은 디렉토리에 저장"""
+    if settings.SEMANTIC_CACHE_PATH:
+        return settings.SEMANTIC_CACHE_PATH
+    chroma_parent = os.path.dirname(os.path.abspath(settings.CHROMA_PATH))
+    return os.path.join(chroma_parent, "semantic_cache.npz")
+
+
+@lru_cache(maxsize=1)
+def get_semantic_cache() -> SemanticCache:
+    """SemanticCache 싱글톤 반환"""
+    return SemanticCache(
+        path=_default_cache_path(),
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    )
@@ -0,0 +1,271 @@
+"""
+로컬 한국어 감정 분류기 (LLM 앞단의 빠른 분류 계층)
+
+명확한 긍정/부정 문장은 프로세스 안에서 바로 분류하고, 확신도가 낮은 입력만 LLM으로 넘깁니다.
+- 감정 사전: 긍정/부정 어간 + 부정어("안", "못", "않", "없") 반전
+- 문자 n-gram(2~3) 나이브 베이즈: conversation_log의 LLM 라벨로 학습 (scripts/train_sentiment_classifier.py)
+- 두 신호가 일치하고 확신도가 SENTIMENT_LOCAL_CONFIDENCE 이상일 때만 로컬 결과 사용
+- 로컬 처리 / LLM 위임 횟수 통계 제공 (절약된 LLM 호출 비율)
+"""
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LABELS = ("긍정", "중립", "부정")
+
+# 어간 기준 감정 사전 (부분 문자열 매칭)
+POSITIVE_TERMS = (
+    "좋", "감사", "고마", "최고", "만족", "훌륭", "유용", "도움이 됐", "도움이 되", "도움됐", "도움 됐",
+    "정확", "친절", "명확", "이해가 잘", "잘 됐", "잘됐", "성공", "합격", "기쁘", "행복", "추천",
+    "완벽", "편리", "재미있", "설레", "든든", "괜찮",
+)
+NEGATIVE_TERMS = (
+    "싫", "별로", "나쁘", "나빠", "불만", "실망", "최악", "짜증", "화가", "화나", "답답", "불편",
+    "어렵", "어려워", "모르겠", "부정확", "틀렸", "틀린", "오류", "에러", "엉터리", "쓸모없", "불안",
+    "걱정", "힘들", "포기", "우울", "탈락", "불합격", "지루", "아쉽", "아쉬",
+)
+# 감정어를 반전시키는 부정 표현 (앞: "안 좋다", "못 했다" / 뒤: "좋지 않다", "도움이 없다")
+NEGATION_PREFIXES = ("안", "못")
+NEGATION_SUFFIXES = ("않", "없", "아니", "못")
+_NEGATION_WINDOW = 4  # 감정어 뒤 몇 글자 안의 부정 표현을 반영할지
+
+_NON_TEXT_RE = re.compile(r"[^0-9a-zA-Z가-힣\s]")
+# 앞쪽 부정어는 단독 어절일 때만 인정 ("안 좋다", "안좋다" O / "제안 좋다", "편안 좋다" X)
+_NEGATION_PREFIX_RE = re.compile(rf"(?:^|\s)(?:{'|'.join(NEGATION_PREFIXES)}) ?$")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class Prediction:
+    """로컬 분류 결과"""
+    label: str  # "긍정" | "중립" | "부정"
+    confidence: float  # 0~1
+    score: float  # -1.0(부정) ~ 1.0(긍정)
+    source: str  # "lexicon" | "model" | "lexicon+model"
+
+
+def _normalize_text(text: str) -> str:
+    text = _NON_TEXT_RE.sub(" ", text.lower())
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def char_ngrams(text: str, sizes: Iterable[int] = (2, 3)) -> list[str]:
+    """공백을 경계로 포함한 문자 n-gram (한국어 조사/어미 변화에 강함)"""
+    padded = f" {_normalize_text(text)} "
+    grams = []
+    for n in sizes:
+        grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def _is_negated(text: str, start: int, end: int) -> bool:
+    before = text[:start]
+    after = text[end:end + _NEGATION_WINDOW]
+    return bool(_NEGATION_PREFIX_RE.search(before)) or any(neg in after for neg in NEGATION_SUFFIXES)
+
+
+def lexicon_score(text: str) -> tuple[int, int]:
+    """
+    감정 사전 매칭 (긍정 수, 부정 수)
+
+    부정 표현이 가까이 붙은 감정어는 반대 극성으로 셉니다. ("좋지 않다" → 부정)
+    """
+    normalized = _normalize_text(text)
+    positive = negative = 0
+    for terms, polarity in ((POSITIVE_TERMS, 1), (NEGATIVE_TERMS, -1)):
+        for term in terms:
+            start = normalized.find(term)
+            while start != -1:
+                end = start + len(term)
+                sign = -polarity if _is_negated(normalized, start, end) else polarity
+                if sign > 0:
+                    positive += 1
+                else:
+                    negative += 1
+                start = normalized.find(term, end)
+    return positive, negative
+
+
+class NaiveBayesModel:
+    """문자 n-gram 다항 나이브 베이즈 (라플라스 스무딩)"""
+
+    def __init__(self, class_counts: dict[str, int], feature_counts: dict[str, dict[str, int]], alpha: float = 1.0):
+        self.class_counts = class_counts
+        self.feature_counts = feature_counts
+        self.alpha = alpha
+        self.vocabulary = set().union(*(c.keys() for c in feature_counts.values())) if feature_counts else set()
+        self._totals = {label: sum(c.values()) for label, c in feature_counts.items()}
+        total_docs = sum(class_counts.values())
+        self._log_priors = {
+            label: math.log(count / total_docs) for label, count in class_counts.items() if count
+        }
+
+    @classmethod
+    def train(cls, samples: Iterable[tuple[str, str]], alpha: float = 1.0) -> "NaiveBayesModel":
+        """samples: [(텍스트, 라벨), ...]"""
+        class_counts: Counter = Counter()
+        feature_counts: dict[str, Counter] = {label: Counter() for label in LABELS}
+        for text, label in samples:
+            if label not in feature_counts:
+                continue
+            class_counts[label] += 1
+            feature_counts[label].update(char_ngrams(text))
+        return cls(dict(class_counts), {k: dict(v) for k, v in feature_counts.items()}, alpha)
+
+    def predict_proba(self, text: str) -> dict[str, float]:
+        grams = [g for g in char_ngrams(text) if g in self.vocabulary]
+        vocab_size = len(self.vocabulary) or 1
+        log_probs = {}
+        for label, log_prior in self._log_priors.items():
+            counts = self.feature_counts.get(label, {})
+            denominator = self._totals.get(label, 0) + self.alpha * vocab_size
+            log_probs[label] = log_prior + sum(
+                math.log((counts.get(g, 0) + self.alpha) / denominator) for g in grams
+            )
+        if not log_probs:
+            return {}
+        peak = max(log_probs.values())
+        exp = {label: math.exp(lp - peak) for label, lp in log_probs.items()}
+        total = sum(exp.values())
+        return {label: value / total for label, value in exp.items()}
+
+    def to_dict(self) -> dict:
+        return {"alpha": self.alpha, "class_counts": self.class_counts, "feature_counts": self.feature_counts}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NaiveBayesModel":
+        return cls(data["class_counts"], data["feature_counts"], data.get("alpha", 1.0))
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayesModel":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+class SentimentClassifier:
+    """
+    감정 사전 + 나이브 베이즈 캐스케이드 (스레드 안전)
+
+    Args:
+        model: 학습된 NaiveBayesModel (없으면 감정 사전만 사용)
+        threshold: 로컬 결과를 채택할 최소 확신도
+    """
+
+    def __init__(self, model: Optional[NaiveBayesModel], threshold: float):
+        self.model = model
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self.local = 0
+        self.escalated = 0
+
+    def predict(self, text: str) -> Prediction:
+        """확신도와 관계없이 로컬 예측 반환 (보정/평가용)"""
+        positive, negative = lexicon_score(text)
+        hits = positive + negative
+        lex_label = None
+        lex_confidence = 0.0
+        if hits and positive != negative:
+            lex_label = "긍정" if positive > negative else "부정"
+            # 한쪽으로 쏠릴수록, 매칭이 많을수록 확신도 증가
+            margin = abs(positive - negative) / hits
+            lex_confidence = margin * (1 - 0.5 ** abs(positive - negative))
+        lex_score = (positive - negative) / hits if hits else 0.0
+
+        if self.model is None:
+            if lex_label is None:
+                return Prediction("중립", 0.0, 0.0, "lexicon")
+            return Prediction(lex_label, lex_confidence, lex_score, "lexicon")
+
+        probs = self.model.predict_proba(text)
+        if not probs:
+            return Prediction(lex_label or "중립", lex_confidence, lex_score, "lexicon")
+        model_label = max(probs, key=probs.get)
+        model_confidence = probs[model_label]
+        model_score = probs.get("긍정", 0.0) - probs.get("부정", 0.0)
+
+        if lex_label is None:
+            return Prediction(model_label, model_confidence, model_score, "model")
+        if lex_label == model_label:
+            # 독립적인 두 신호가 일치하면 noisy-OR로 결합
+            confidence = 1 - (1 - model_confidence) * (1 - lex_confidence)
+            return Prediction(model_label, confidence, (model_score + lex_score) / 2, "lexicon+model")
+        # 두 신호가 엇갈리면 확신하지 않음 → LLM 위임
+        return Prediction(model_label, 0.0, model_score, "lexicon+model")
+
+    def classify(self, text: str) -> Optional[Prediction]:
+        """
+        확신도가 임계값 이상이면 로컬 예측, 아니면 None (호출 측에서 LLM 사용)
+
+        Example:
+            >>> prediction = get_sentiment_classifier().classify("정말 도움이 됐어요, 감사합니다!")
+            >>> prediction.label if prediction else "LLM 위임"
+            '긍정'
+        """
+        if not text or not text.strip():
+            return None
+        prediction = self.predict(text)
+        confident = prediction.confidence >= self.threshold
+        with self._lock:
+            if confident:
+                self.local += 1
+            else:
+                self.escalated += 1
+        return prediction if confident else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.local + self.escalated
+            return {
+                "model_loaded": self.model is not None,
+                "threshold": self.threshold,
+                "local": self.local,
+                "escalated": self.escalated,
+                "llm_calls_saved_ratio": round(self.local / total, 3) if total else 0.0,
+            }
+
+
+def default_model_path() -> str:
+    """설정이 없으면 CHROMA_PATH와 같은 디렉토리에 저장"""
+    if settings.SENTIMENT_MODEL_PATH:
+        return settings.SENTIMENT_MODEL_PATH
+    chroma_parent = os.path.dirname(os.path.abspath(settings.CHROMA_PATH))
+    return os.path.join(chroma_parent, "sentiment_nb.json")
+
+
+@lru_cache(maxsize=1)
+def get_sentiment_classifier() -> SentimentClassifier:
+    """SentimentClassifier 싱글톤 반환 (학습된 모델이 없으면 감정 사전만 사용)"""
+    model = None
+    path = default_model_path()
+    if os.path.exists(path):
+        try:
+            model = NaiveBayesModel.load(path)
+            logger.info(f"감정 분류 모델 로드: {path}")
+        except Exception as e:
+            logger.warning(f"감정 분류 모델 로드 실패 (감정 사전만 사용): {e}")
+    return SentimentClassifier(model, settings.SENTIMENT_LOCAL_CONFIDENCE)
+
+
+def classify_sentiment(text: str) -> Optional[Prediction]:
+    """로컬 분류기 사용이 켜져 있으면 확신도 높은 예측 반환, 아니면 None"""
+    if not settings.SENTIMENT_LOCAL_ENABLED:
+        return None
+    return get_sentiment_classifier().classify(text)
@@ -0,0 +1,87 @@
+"""
+동일 요청 병합 (single-flight)
+
+같은 질문이 동시에 여러 번 들어오면 첫 요청(leader)만 검색/LLM 호출을 수행하고,
+나머지 요청은 진행 중인 작업의 결과를 함께 기다립니다.
+- 키: (엔드포인트, 모델, 정규화된 질문)
+- 엔드포인트별 병합 비율(coalesced / calls) 통계 제공
+"""
+import asyncio
+import re
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """대소문자/공백/끝 문장부호 차이를 무시한 질문 키 생성"""
+    normalized = _WHITESPACE_RE.sub(" ", question).strip().lower()
+    return normalized.rstrip("?!.。？！ ")
+
+
+class SingleFlight:
+    """asyncio 기반 진행 중 요청 병합기 (이벤트 루프 1개 기준)"""
+
+    def __init__(self):
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    async def do(
+        self,
+        endpoint: str,
+        model: str,
+        question: str,
+        fn: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        동일 키의 진행 중 작업이 있으면 그 결과를 기다리고, 없으면 fn()을 실행
+
+        Args:
+            endpoint: 엔드포인트 이름 (예: "rag_chat")
+            model: 답변 생성 모델명
+            question: 사용자 질문 (정규화하여 키로 사용)
+            fn: 실제 작업을 수행하는 코루틴 팩토리
+        """
+        key = (endpoint, model, normalize_question(question))
+        stats = self._stats.setdefault(endpoint, {"calls": 0, "coalesced": 0})
+        stats["calls"] += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+
+        # shield: 한 요청이 취소(클라이언트 연결 종료)되어도 공유 작업은 계속 진행
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: tuple, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록 처리
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """엔드포인트별 호출 수, 병합 수, 병합 비율, 현재 진행 중인 작업 수"""
+        in_flight: dict[str, int] = {}
+        for endpoint, _, _ in self._inflight:
+            in_flight[endpoint] = in_flight.get(endpoint, 0) + 1
+
+        return {
+            endpoint: {
+                "calls": s["calls"],
+                "coalesced": s["coalesced"],
+                "coalescing_ratio": round(s["coalesced"] / s["calls"], 3) if s["calls"] else 0.0,
+                "in_flight": in_flight.get(endpoint, 0),
+            }
+            for endpoint, s in self._stats.items()
+        }
+
+
+# 프로세스 전역 인스턴스
+single_flight = SingleFlight()
@@ -0,0 +1,241 @@
+"""
+문서 청킹 (RAG 인제스트용)
+
+파일 전체를 벡터 1개로 임베딩하지 않고, 검색에 적합한 크기의 청크로 나눕니다.
+- 제목 인식: 마크다운 제목(#, ##, ...)을 기준으로 섹션을 먼저 나누고, 청크는 섹션 경계를 넘지 않음
+- 토큰 인식: 청크 크기 / 겹침을 토큰 수로 지정 (tiktoken이 있으면 사용, 없으면 근사치)
+- 재귀 분할: 문단 → 줄 → 문장 → 단어 → 글자 순으로 큰 단위부터 잘라 최대한 의미 단위 유지
+- 청크 메타데이터: source(파일명), section(제목 경로), offset(원문 내 시작 위치), chunk(순번), tokens
+"""
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_CODE_FENCE_RE = re.compile(r"^```.*?^```", re.MULTILINE | re.DOTALL)
+_SEPARATORS = ("\n\n", "\n", ". ", "? ", "! ", " ", "")
+
+
+@lru_cache(maxsize=1)
+def _get_encoder():
+    """
+    cl100k_base 인코더 (없으면 None → 근사치 사용)
+
+    tiktoken은 설치되어 있어도 인코딩 파일을 내려받지 못하면 실패하므로, 모든 예외를 잡아
+    None을 캐시합니다 (lru_cache는 예외를 캐시하지 않으므로 여기서 잡지 않으면 매 호출마다 재시도).
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except ImportError:
+        return None
+    except Exception as e:
+        logger.warning(f"tiktoken 인코더 로드 실패 (토큰 수 근사치 사용): {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    토큰 수 계산
+
+    tiktoken 인코더를 쓸 수 있으면 cl100k_base 기준으로 정확히 세고, 없으면
+    영문/숫자는 4글자당 1토큰, 한글 등 그 외 문자는 글자당 1토큰으로 근사합니다.
+    """
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+@dataclass
+class Chunk:
+    """분할된 청크 1개"""
+    text: str
+    source: str
+    section: str
+    offset: int
+    index: int
+    tokens: int
+
+    @property
+    def metadata(self) -> dict:
+        return {
+            "source": self.source,
+            "section": self.section,
+            "offset": self.offset,
+            "chunk": self.index,
+            "tokens": self.tokens,
+        }
+
+
+def split_sections(text: str) -> list[tuple[str, int, int]]:
+    """
+    마크다운 제목 기준 섹션 분할
+
+    코드 블록 안의 "# 주석"은 제목으로 보지 않고, 본문 없이 바로 하위 제목이 오는
+    섹션은 건너뜁니다 (제목 경로는 하위 섹션 메타데이터에 남음).
+
+    Returns:
+        [(제목 경로 "상위 > 하위", 시작 offset, 끝 offset), ...] - 제목이 없으면 섹션 1개("")
+    """
+    fences = [(m.start(), m.end()) for m in _CODE_FENCE_RE.finditer(text)]
+    headings = [
+        m for m in _HEADING_RE.finditer(text)
+        if not any(start < m.start() < end for start, end in fences)
+    ]
+    if not headings:
+        return [("", 0, len(text))]
+
+    sections = []
+    if headings[0].start() > 0 and text[:headings[0].start()].strip():
+        sections.append(("", 0, headings[0].start()))
+
+    path: list[tuple[int, str]] = []
+    for i, match in enumerate(headings):
+        level = len(match.group(1))
+        while path and path[-1][0] >= level:
+            path.pop()
+        path.append((level, match.group(2).strip()))
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+        if not text[match.end():end].strip():
+            continue
+        sections.append((" > ".join(title for _, title in path), match.start(), end))
+    return sections
+
+
+class RecursiveTokenSplitter:
+    """
+    토큰 기준 재귀 분할기
+
+    Args:
+        chunk_tokens: 청크 최대 토큰 수
+        overlap_tokens: 이웃 청크와 겹칠 토큰 수 (문맥 유지용)
+        length_fn: 토큰 수 계산 함수
+    """
+
+    def __init__(self, chunk_tokens: int, overlap_tokens: int, length_fn: Callable[[str], int] = count_tokens):
+        if overlap_tokens >= chunk_tokens:
+            raise ValueError("overlap_tokens는 chunk_tokens보다 작아야 합니다.")
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.length_fn = length_fn
+
+    def split_spans(self, text: str, start: int, end: int) -> list[tuple[int, int]]:
+        """text[start:end]를 청크 (시작, 끝) offset 목록으로 분할"""
+        pieces = self._split_recursive(text, start, end, 0)
+        return self._merge(text, pieces)
+
+    def _split_recursive(self, text: str, start: int, end: int, level: int) -> list[tuple[int, int]]:
+        if self.length_fn(text[start:end]) <= self.chunk_tokens:
+            return [(start, end)]
+        separator = _SEPARATORS[level] if level < len(_SEPARATORS) else ""
+        if separator == "":
+            return self._split_characters(text, start, end)
+
+        spans = []
+        cursor = start
+        while cursor < end:
+            found = text.find(separator, cursor, end)
+            piece_end = end if found == -1 else found + len(separator)
+            spans.append((cursor, piece_end))
+            cursor = piece_end
+        if len(spans) == 1:
+            return self._split_recursive(text, start, end, level + 1)
+
+        result = []
+        for s, e in spans:
+            if self.length_fn(text[s:e]) > self.chunk_tokens:
+                result.extend(self._split_recursive(text, s, e, level + 1))
+            else:
+                result.append((s, e))
+        return result
+
+    def _split_characters(self, text: str, start: int, end: int) -> list[tuple[int, int]]:
+        """구분자가 없는 긴 문자열: 토큰 한도에 맞춰 글자 단위로 자름"""
+        spans = []
+        cursor = start
+        while cursor < end:
+            lo, hi = cursor + 1, end
+            while lo < hi:  # 한도 안에 들어가는 가장 긴 끝 위치 (이진 탐색)
+                mid = (lo + hi + 1) // 2
+                if self.length_fn(text[cursor:mid]) <= self.chunk_tokens:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            spans.append((cursor, lo))
+            cursor = lo
+        return spans
+
+    def _merge(self, text: str, pieces: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """작은 조각을 chunk_tokens까지 이어 붙이고, 다음 청크는 끝부분 overlap_tokens만큼 겹쳐 시작"""
+        chunks = []
+        window: list[tuple[int, int, int]] = []  # (start, end, tokens)
+        window_tokens = 0
+        for s, e in pieces:
+            tokens = self.length_fn(text[s:e])
+            if window and window_tokens + tokens > self.chunk_tokens:
+                chunks.append((window[0][0], window[-1][1]))
+                # 겹침: 뒤에서부터 overlap_tokens 이내의 조각만 남김
+                while window and (window_tokens > self.overlap_tokens or window_tokens + tokens > self.chunk_tokens):
+                    window_tokens -= window.pop(0)[2]
+            window.append((s, e, tokens))
+            window_tokens += tokens
+        if window:
+            chunks.append((window[0][0], window[-1][1]))
+        return chunks
+
+
+def split_document(
+    text: str,
+    source: str,
+    chunk_tokens: Optional[int] = None,
+    overlap_tokens: Optional[int] = None,
+) -> list[Chunk]:
+    """
+    문서 1개를 제목 인식 + 토큰 기준으로 청킹
+
+    Args:
+        text: 문서 원문
+        source: 파일명 (메타데이터)
+        chunk_tokens: 청크 최대 토큰 수 (기본값: settings.CHUNK_SIZE_TOKENS)
+        overlap_tokens: 겹침 토큰 수 (기본값: settings.CHUNK_OVERLAP_TOKENS)
+
+    Example:
+        >>> chunks = split_document(open("docs/guide.md").read(), "guide.md")
+        >>> chunks[0].metadata
+        {'source': 'guide.md', 'section': '설치 > 요구 사항', 'offset': 0, 'chunk': 0, 'tokens': 312}
+    """
+    splitter = RecursiveTokenSplitter(
+        chunk_tokens or settings.CHUNK_SIZE_TOKENS,
+        settings.CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens,
+    )
+    chunks = []
+    for section, start, end in split_sections(text):
+        for s, e in splitter.split_spans(text, start, end):
+            # 앞뒤 공백은 잘라내되 offset은 실제 내용 시작 위치로 보정
+            raw = text[s:e]
+            body = raw.strip()
+            if not body:
+                continue
+            offset = s + (len(raw) - len(raw.lstrip()))
+            chunks.append(Chunk(body, source, section, offset, len(chunks), count_tokens(body)))
+    return chunks
+
+
+def summarize_chunks(chunks: list[Chunk]) -> dict:
+    """청크 수 / 평균·최대 토큰 수 (인제스트 결과 보고용)"""
+    if not chunks:
+        return {"chunks": 0, "avg_tokens": 0.0, "max_tokens": 0}
+    tokens = [c.tokens for c in chunks]
+    return {
+        "chunks": len(chunks),
+        "avg_tokens": round(sum(tokens) / len(tokens), 1),
+        "max_tokens": max(tokens),
+    }
@@ -0,0 +1,175 @@
+"""
+주제 정규화(canonicalization) 인덱스
+
+extract_topic / batch_analyzer가 만든 자유 형식 주제 문구를 정규화된 주제 ID(topic_cluster)로 매핑합니다.
+- 원문 주제를 임베딩하고, 가장 가까운 클러스터 중심과의 코사인 유사도가
+  TOPIC_CLUSTER_THRESHOLD 이상이면 그 클러스터에 배정 (중심은 누적 평균으로 갱신)
+- 가까운 클러스터가 없으면 새 클러스터를 즉석에서 생성
+- 같은 원문 문구는 메모리 캐시로 재사용 (임베딩 호출 생략)
+집계는 conversation_log.topic_id 정수 GROUP BY로 처리합니다.
+"""
+import threading
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.topic_cluster import TopicCluster
+from app.services.llm_client import get_embeddings
+
+TOPIC_EMBEDDING_MODEL = "text-embedding-3-small"
+# 원문 주제 -> 클러스터 ID 메모리 캐시 최대 크기
+_MAX_MEMO_ENTRIES = 10000
+
+
+def normalize_topic(topic: str) -> str:
+    """비교용 주제 키 (공백/따옴표/대소문자 차이 무시)"""
+    return " ".join(topic.strip().strip("\"'").lower().split())
+
+
+def _unit(vector) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm > 0 else v
+
+
+class TopicIndex:
+    """
+    임베딩 최근접 중심 기반 주제 클러스터 인덱스 (스레드 안전)
+
+    Args:
+        threshold: 기존 클러스터에 배정할 최소 코사인 유사도
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self._embeddings = get_embeddings(TOPIC_EMBEDDING_MODEL, purpose="topic_index")
+        self._lock = threading.Lock()
+        self._ids: list[int] = []
+        self._labels: dict[int, str] = {}
+        self._sizes: dict[int, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._memo: dict[str, int] = {}
+        self.assigned = 0
+        self.created = 0
+        self.memo_hits = 0
+        self._load_new_clusters()
+
+    def assign(self, topic: str) -> Optional[int]:
+        """원문 주제 1개를 클러스터 ID로 매핑 (빈 문자열이면 None)"""
+        return self.assign_many([topic])[0]
+
+    def assign_many(self, topics: Iterable[Optional[str]]) -> list[Optional[int]]:
+        """
+        원문 주제 여러 개를 클러스터 ID로 매핑 (임베딩은 한 번에 요청)
+
+        Example:
+            >>> get_topic_index().assign_many(["파이썬 학습", "Python 공부", "면접 준비"])
+            [3, 3, 7]
+        """
+        topics = list(topics)
+        keys = [normalize_topic(t) if t else "" for t in topics]
+        originals = {k: t.strip().strip("\"'") for k, t in zip(keys, topics) if k}
+        with self._lock:
+            missing = sorted({k for k in keys if k and k not in self._memo})
+            self.memo_hits += sum(1 for k in keys if k and k in self._memo)
+
+        if missing:
+            vectors = [_unit(v) for v in self._embeddings.embed_documents(missing)]
+            with self._lock:
+                db = SessionLocal()
+                try:
+                    # 다른 프로세스(백필 스크립트 등)가 만든 클러스터 먼저 반영
+                    self._load_new_clusters(db)
+                    for key, vector in zip(missing, vectors):
+                        if key not in self._memo:
+                            self._memo[key] = self._assign_vector(db, originals[key], vector)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    # 커밋되지 않은 클러스터가 메모리에 남지 않도록 다시 로드
+                    self._reset()
+                    raise
+                finally:
+                    db.close()
+                if len(self._memo) > _MAX_MEMO_ENTRIES:
+                    self._memo.clear()
+
+        with self._lock:
+            ids = [self._memo.get(k) if k else None for k in keys]
+            self.assigned += sum(1 for i in ids if i is not None)
+            return ids
+
+    def labels(self) -> dict[int, str]:
+        with self._lock:
+            return dict(self._labels)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "clusters": len(self._ids),
+                "threshold": self.threshold,
+                "assigned": self.assigned,
+                "created": self.created,
+                "memo_size": len(self._memo),
+                "memo_hits": self.memo_hits,
+            }
+
+    # -----------------------------------
+    # 내부 헬퍼 (호출 측에서 lock 보유)
+    # -----------------------------------
+    def _assign_vector(self, db, label: str, vector: np.ndarray) -> int:
+        if self._centroids is not None and len(self._ids):
+            scores = self._centroids @ vector
+            best = int(np.argmax(scores))
+            if float(scores[best]) >= self.threshold:
+                cluster_id = self._ids[best]
+                size = self._sizes[cluster_id]
+                centroid = _unit(self._centroids[best] * size + vector)
+                self._centroids[best] = centroid
+                self._sizes[cluster_id] = size + 1
+                db.query(TopicCluster).filter(TopicCluster.id == cluster_id).update(
+                    {"centroid": centroid.tobytes(), "size": size + 1}, synchronize_session=False
+                )
+                return cluster_id
+
+        cluster = TopicCluster(label=label[:100], centroid=vector.tobytes(), size=1)
+        db.add(cluster)
+        db.flush()
+        self._append(cluster.id, cluster.label, vector, 1)
+        self.created += 1
+        return cluster.id
+
+    def _append(self, cluster_id: int, label: str, centroid: np.ndarray, size: int):
+        self._ids.append(cluster_id)
+        self._labels[cluster_id] = label
+        self._sizes[cluster_id] = size
+        row = centroid.reshape(1, -1)
+        self._centroids = row if self._centroids is None else np.vstack([self._centroids, row])
+
+    def _load_new_clusters(self, db=None):
+        """아직 메모리에 없는 클러스터를 DB에서 읽어 옴 (id 증가 순)"""
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            last_id = self._ids[-1] if self._ids else 0
+            rows = db.query(TopicCluster).filter(TopicCluster.id > last_id).order_by(TopicCluster.id).all()
+            for row in rows:
+                self._append(row.id, row.label, np.frombuffer(row.centroid, dtype=np.float32).copy(), row.size)
+        finally:
+            if own_session:
+                db.close()
+
+    def _reset(self):
+        self._ids, self._labels, self._sizes = [], {}, {}
+        self._centroids = None
+        self._memo.clear()
+        self._load_new_clusters()
+
+
+@lru_cache(maxsize=1)
+def get_topic_index() -> TopicIndex:
+    """TopicIndex 싱글톤 반환"""
+    return TopicIndex(settings.TOPIC_CLUSTER_THRESHOLD)
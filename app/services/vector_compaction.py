@@ -0,0 +1,302 @@
+"""
+벡터스토어 중복 압축 (완전 중복 + 근접 중복 일괄 삭제)
+
+인제스트 / 재학습이 같은 내용을 반복해서 넣으면서 컬렉션에 같거나 거의 같은 벡터가 쌓이면
+디스크 / 메모리와 HNSW 검색 비용이 함께 늘어납니다. 컬렉션을 한 번 훑어 중복을 찾아 일괄 삭제합니다.
+- 완전 중복: 본문 sha256이 같은 청크 (먼저 들어간 것만 남김)
+- 근접 중복: 정규화한 임베딩의 코사인 유사도가 임계값 이상인 쌍을 블록 단위 행렬 곱으로 찾음
+  (block × block 크기만 메모리에 올리므로 n × n 행렬을 만들지 않음), 먼저 들어간 쪽을 남김
+- 삭제 전후 디스크 크기와 검색 지연(남길 청크의 저장된 임베딩으로 질의, OpenAI 호출 없음)을 측정하여 보고
+Chroma는 삭제한 행의 공간을 SQLite 파일에서 바로 돌려주지 않으므로 삭제 후 VACUUM을 실행합니다.
+HNSW 색인 파일의 삭제된 자리는 이후 추가되는 벡터가 재사용합니다.
+conversation_retrained에서 삭제한 conv-* ID는 파일로 남겨 app/vector_retrain.py가 다시 추가하지 않게 합니다.
+"""
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.collection_alias import active_store_path, is_reserved_entry
+from app.services.exact_search import get_exact_index
+from app.services.federated_retriever import CONVERSATION_COLLECTION, DOCS_COLLECTION, get_conversation_store
+from app.services.ingest_manifest import IngestManifest, content_hash, default_manifest_path
+from app.services.retriever import get_bm25_index
+from app.services.semantic_cache import get_semantic_cache
+from app.services.vectorstore import get_vectorstore
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 Chroma에서 가져오거나 삭제할 청크 수
+_FETCH_BATCH = 1000
+_DELETE_BATCH = 5000
+# 검색 지연 측정용 질의 수 / top-k
+LATENCY_PROBES = 50
+LATENCY_K = 5
+# 보고서에 남길 삭제 예시 수
+SAMPLE_PAIRS = 5
+# 압축으로 삭제한 대화 벡터 ID 기록 (재학습 워터마크와 같은 디렉토리)
+COMPACTED_FILE = f"{CONVERSATION_COLLECTION}_compacted.json"
+
+_compact_lock = threading.Lock()
+
+
+def find_duplicates(
+    hashes: list[str], embeddings: np.ndarray, threshold: float, block_size: int = 1024
+) -> dict[int, tuple[int, str]]:
+    """
+    삭제할 중복 행 찾기 (앞쪽 행을 남김)
+
+    Args:
+        hashes: 행별 본문 해시
+        embeddings: (행 수, 차원) 임베딩 행렬
+        threshold: 근접 중복으로 볼 코사인 유사도 하한
+        block_size: 블록 행렬 곱 크기
+
+    Returns:
+        {삭제할 행: (남기는 행, "exact" | "near")}
+    """
+    duplicates: dict[int, tuple[int, str]] = {}
+    first_row: dict[str, int] = {}
+    for row, digest in enumerate(hashes):
+        if digest in first_row:
+            duplicates[row] = (first_row[digest], "exact")
+        else:
+            first_row[digest] = row
+
+    rows = np.array(sorted(first_row.values()), dtype=np.int64)
+    if len(rows) < 2:
+        return duplicates
+    matrix = embeddings[rows].astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+
+    # 앞쪽 블록부터 확정: 이미 삭제된 행은 이후 비교에서 제외하여 큰 중복 묶음도 대표 1개와만 비교
+    alive = np.ones(len(rows), dtype=bool)
+    for i0 in range(0, len(rows), block_size):
+        i1 = min(i0 + block_size, len(rows))
+        partners: dict[int, list[int]] = {}
+        for j0 in range(0, i1, block_size):
+            j1 = min(j0 + block_size, i1)
+            sims = matrix[i0:i1] @ matrix[j0:j1].T
+            sims[:, ~alive[j0:j1]] = -1.0
+            if j0 == i0:
+                sims[np.triu_indices(i1 - i0)] = -1.0  # 자기 자신 / 뒤쪽 행 제외
+            for r, c in zip(*np.nonzero(sims >= threshold)):
+                partners.setdefault(i0 + int(r), []).append(j0 + int(c))
+        for r in sorted(partners):
+            kept = next((c for c in partners[r] if alive[c]), None)
+            if kept is not None:
+                alive[r] = False
+                duplicates[int(rows[r])] = (int(rows[kept]), "near")
+    return duplicates
+
+
+def measure_latency(collection, probes: list) -> dict:
+    """컬렉션 크기와 검색 지연 (첫 질의는 색인 로드를 포함하므로 측정에서 제외)"""
+    size = collection.count()
+    latencies = []
+    if size and probes:
+        k = min(LATENCY_K, size)
+        collection.query(query_embeddings=[probes[0]], n_results=k, include=[])
+        for vector in probes:
+            started = time.perf_counter()
+            collection.query(query_embeddings=[vector], n_results=k, include=[])
+            latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    p95 = latencies[max(math.ceil(0.95 * len(latencies)) - 1, 0)] if latencies else 0.0
+    return {
+        "size": size,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p95_ms": round(p95, 3),
+    }
+
+
+def compacted_ids_path(store_path: Optional[str] = None) -> str:
+    return os.path.join(store_path or settings.CHROMA_PATH, COMPACTED_FILE)
+
+
+def load_compacted_ids(store_path: Optional[str] = None) -> set[str]:
+    """압축으로 삭제한 conversation_retrained 벡터 ID (재학습에서 다시 추가하지 않음)"""
+    try:
+        with open(compacted_ids_path(store_path), "r", encoding="utf-8") as f:
+            return set(json.load(f).get("ids", []))
+    except (OSError, ValueError):
+        return set()
+
+
+def record_compacted_ids(removed: list[str], store_path: Optional[str] = None):
+    """기존 기록에 합쳐 임시 파일에 쓴 뒤 교체"""
+    path = compacted_ids_path(store_path)
+    ids = load_compacted_ids(store_path) | set(removed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"ids": sorted(ids), "updated_at": datetime.now().isoformat(timespec="seconds")}, f)
+    os.replace(tmp_path, path)
+
+
+def compact_collection(
+    collection_name: str = DOCS_COLLECTION,
+    threshold: Optional[float] = None,
+    block_size: Optional[int] = None,
+    dry_run: bool = False,
+    vacuum: bool = True,
+) -> dict:
+    """
+    컬렉션의 완전 / 근접 중복 벡터를 찾아 일괄 삭제하고 회수량과 검색 지연 변화를 보고
+
+    ai_career_docs는 활성 버전에서 삭제하고 BM25 색인 / 정확 검색 행렬 / 인제스트 매니페스트와
+    시맨틱 캐시도 함께 갱신합니다. conversation_retrained는 삭제한 ID를 기록하여 재학습이 되살리지 않게 합니다.
+    dry_run이면 찾기만 하고 삭제하지 않습니다.
+    """
+    if collection_name == DOCS_COLLECTION:
+        store_path = active_store_path()
+        store = get_vectorstore(persist_directory=store_path)
+    elif collection_name == CONVERSATION_COLLECTION:
+        store_path = settings.CHROMA_PATH
+        store = get_conversation_store()
+    else:
+        return {"status": "error", "message": f"지원하지 않는 컬렉션입니다: {collection_name}"}
+    if not _compact_lock.acquire(blocking=False):
+        return {"status": "busy", "message": "이미 압축이 진행 중입니다."}
+    try:
+        return _compact(store, store_path, collection_name, threshold or settings.VECTOR_COMPACTION_THRESHOLD,
+                        block_size or settings.VECTOR_COMPACTION_BLOCK_SIZE, dry_run, vacuum)
+    finally:
+        _compact_lock.release()
+
+
+# -----------------------------------
+# 내부 헬퍼
+# -----------------------------------
+def _compact(store, store_path: str, collection_name: str, threshold: float, block_size: int,
+             dry_run: bool, vacuum: bool) -> dict:
+    started = time.perf_counter()
+    collection = store._collection
+    ids, hashes, embeddings = _load_collection(collection)
+    duplicates = find_duplicates(hashes, embeddings, threshold, block_size)
+    removed_ids = [ids[row] for row in sorted(duplicates)]
+
+    kept_rows = [row for row in range(len(ids)) if row not in duplicates]
+    step = max(len(kept_rows) // LATENCY_PROBES, 1)
+    probes = [embeddings[row].tolist() for row in kept_rows[::step][:LATENCY_PROBES]]
+    dim = int(embeddings.shape[1]) if len(ids) else 0
+
+    disk_before = _directory_bytes(store_path)
+    before = measure_latency(collection, probes)
+    after = before
+    if removed_ids and not dry_run:
+        for start in range(0, len(removed_ids), _DELETE_BATCH):
+            collection.delete(ids=removed_ids[start:start + _DELETE_BATCH])
+        if collection_name == DOCS_COLLECTION:
+            _sync_docs_indexes(store, store_path, set(removed_ids))
+        else:
+            record_compacted_ids(removed_ids, store_path)
+        if vacuum:
+            _vacuum(store_path)
+        after = measure_latency(collection, probes)
+    disk_after = _directory_bytes(store_path)
+
+    exact = sum(1 for _, kind in duplicates.values() if kind == "exact")
+    report = {
+        "status": "success",
+        "collection": collection_name,
+        "dry_run": dry_run,
+        "threshold": threshold,
+        "scanned": len(ids),
+        "exact_duplicates": exact,
+        "near_duplicates": len(duplicates) - exact,
+        "removed": 0 if dry_run else len(removed_ids),
+        "vector_bytes_reclaimed": 0 if dry_run else len(removed_ids) * dim * 4,
+        "disk_bytes": {"before": disk_before, "after": disk_after, "reclaimed": disk_before - disk_after},
+        "latency": {"before": before, "after": after},
+        "samples": [
+            {"removed": ids[row], "kept": ids[kept], "kind": kind}
+            for row, (kept, kind) in sorted(duplicates.items())[:SAMPLE_PAIRS]
+        ],
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+    logger.info(
+        f"벡터 압축 ({collection_name}{', dry-run' if dry_run else ''}): {len(ids)}개 중 완전 중복 {exact} / "
+        f"근접 중복 {len(duplicates) - exact}, 디스크 {disk_before} → {disk_after} bytes"
+    )
+    return report
+
+
+def _load_collection(collection) -> tuple[list[str], list[str], np.ndarray]:
+    """ID / 본문 해시 / 임베딩을 배치로 읽음 (본문은 해시만 보관)"""
+    total = collection.count()
+    ids, hashes = [], []
+    embeddings: Optional[np.ndarray] = None
+    for offset in range(0, total, _FETCH_BATCH):
+        batch = collection.get(limit=_FETCH_BATCH, offset=offset, include=["embeddings", "documents"])
+        if not len(batch["ids"]):
+            break
+        vectors = np.asarray(batch["embeddings"], dtype=np.float32)
+        if embeddings is None:
+            embeddings = np.empty((total, vectors.shape[1]), dtype=np.float32)
+        embeddings[len(ids):len(ids) + len(vectors)] = vectors
+        ids.extend(batch["ids"])
+        hashes.extend(content_hash(text or "") for text in batch["documents"])
+    if embeddings is None:
+        return [], [], np.empty((0, 0), dtype=np.float32)
+    return ids, hashes, embeddings[:len(ids)]
+
+
+def _sync_docs_indexes(store, store_path: str, removed: set[str]):
+    """삭제한 청크를 BM25 색인 / 정확 검색 행렬 / 매니페스트에서도 제거"""
+    bm25 = get_bm25_index(store_path)
+    bm25.delete(removed)
+    bm25.save()
+    if settings.EXACT_SEARCH_ENABLED:
+        try:
+            get_exact_index(store_path).refresh(store)
+        except Exception as e:
+            logger.warning(f"정확 검색 행렬 갱신 실패: {e}")
+    # 매니페스트에서도 빼 두어야, 남긴 쪽 파일이 바뀌어 사라졌을 때 다음 인제스트가 이 청크를 다시 추가함
+    manifest = IngestManifest(default_manifest_path(store_path))
+    for entry in manifest.files.values():
+        entry["chunk_ids"] = [i for i in entry["chunk_ids"] if i not in removed]
+    manifest.save()
+    get_semantic_cache().invalidate()
+
+
+def _vacuum(store_path: str):
+    """삭제한 행의 공간을 파일 시스템에 돌려줌 (다른 연결이 쓰는 중이면 건너뜀)"""
+    path = os.path.join(store_path, "chroma.sqlite3")
+    if not os.path.exists(path):
+        return
+    try:
+        conn = sqlite3.connect(path, timeout=5)
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Chroma SQLite VACUUM 실패: {e}")
+
+
+def _directory_bytes(path: str) -> int:
+    """store 디렉토리 크기 (레거시 레이아웃이면 다른 버전 / 별칭 파일 제외)"""
+    total = 0
+    if not os.path.isdir(path):
+        return 0
+    for name in os.listdir(path):
+        if path == settings.CHROMA_PATH and is_reserved_entry(name):
+            continue
+        target = os.path.join(path, name)
+        if os.path.isfile(target):
+            total += os.path.getsize(target)
+            continue
+        for root, _, files in os.walk(target):
+            total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
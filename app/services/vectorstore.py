@@ -1,9 +1,23 @@
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 from app.core.config import settings
+from app.services.llm_client import get_embeddings
+from app.services.embedding_cache import cached_embeddings
+from app.services.collection_alias import active_store_path
+from app.services.semantic_cache import get_semantic_cache
+import logging
 import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
 from functools import lru_cache
 from enum import Enum
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 
 class EmbeddingModel(str, Enum):
@@ -13,25 +27,189 @@ class EmbeddingModel(str, Enum):
     LARGE = "text-embedding-3-large"    # 최고 성능 ($0.13/1M tokens)
 
 
+def normalize_query(text: str) -> str:
+    """질의 캐시 키 정규화 (유니코드 NFKC + 앞뒤/연속 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class QueryEmbeddingCache:
+    """
+    정규화된 질의 → 임베딩 메모리 LRU 캐시 (TTL + 항목 수 / 메모리 상한, 스레드 안전)
+
+    벡터는 float32 배열로 보관하여 메모리 사용량을 항목당 (차원 × 4바이트)로 제한합니다.
+    적중 시 절약된 시간은 미스 때 실제 임베딩에 걸린 평균 시간으로 추정합니다.
+
+    Args:
+        ttl_seconds: 항목 유효 시간 (초)
+        max_entries: 최대 항목 수
+        max_bytes: 벡터 메모리 상한 (바이트)
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (vector, created_at) (LRU 순서 유지)
+        self._entries: OrderedDict[str, tuple[np.ndarray, float]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._miss_seconds = 0.0
+
+    def get(self, key: str) -> Optional[list[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] > self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0].tolist()
+
+    def put(self, key: str, vector: list[float], elapsed: float):
+        """미스 후 임베딩 결과 저장 (elapsed: 실제 임베딩에 걸린 시간, 절약 시간 추정용)"""
+        array = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._miss_seconds += elapsed
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (array, time.time())
+            self._bytes += array.nbytes
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            avg_miss_ms = self._miss_seconds * 1000 / self.misses if self.misses else 0.0
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "avg_embed_ms": round(avg_miss_ms, 1),
+                "latency_saved_ms": round(avg_miss_ms * self.hits, 1),
+            }
+
+    def _remove(self, key: str):
+        vector, _ = self._entries.pop(key)
+        self._bytes -= vector.nbytes
+
+
 @lru_cache(maxsize=1)
-def get_vectorstore(embedding_model: EmbeddingModel = EmbeddingModel.SMALL):
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """QueryEmbeddingCache 싱글톤 반환"""
+    return QueryEmbeddingCache(
+        settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        settings.QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+        settings.QUERY_EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+class QueryCachedEmbeddings(Embeddings):
     """
-    Chroma VectorStore 초기화 (싱글톤 패턴)
+    embed_query / aembed_query만 메모리 LRU를 거치는 Embeddings 래퍼
+
+    문서 임베딩(embed_documents)은 그대로 내부 모델에 전달합니다.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: QueryEmbeddingCache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        key = normalize_query(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            started = time.perf_counter()
+            vector = self.embeddings.embed_query(key)
+            self.cache.put(key, vector, time.perf_counter() - started)
+        return vector
+
+    async def aembed_query(self, text: str) -> list[float]:
+        key = normalize_query(text)
+        vector = self.cache.get(key)
+        if vector is None:
+            started = time.perf_counter()
+            vector = await self.embeddings.aembed_query(key)
+            self.cache.put(key, vector, time.perf_counter() - started)
+        return vector
+
+
+_active_path: Optional[str] = None
 
-    첫 호출 시에만 인스턴스를 생성하고, 이후 호출에서는 캐시된 인스턴스를 재사용합니다.
+
+def get_vectorstore(
+    embedding_model: EmbeddingModel = EmbeddingModel.SMALL,
+    persist_directory: Optional[str] = None,
+):
+    """
+    Chroma VectorStore 반환 (디렉토리별 싱글톤)
+
+    디렉토리마다 첫 호출 시에만 인스턴스를 생성하고, 이후 호출에서는 캐시된 인스턴스를 재사용합니다.
+    persist_directory를 주지 않으면 별칭(active_collection.json)이 가리키는 활성 버전을 쓰므로,
+    블루/그린 재구축으로 별칭이 바뀌면 재시작 없이 다음 호출부터 새 버전으로 전환됩니다.
 
     Args:
         embedding_model (EmbeddingModel): 사용할 OpenAI 임베딩 모델. 기본값은 SMALL.
+        persist_directory (str, optional): Chroma 디렉토리 (재구축 중인 새 버전 등)
+    """
+    if persist_directory is None:
+        persist_directory = _resolve_active_path()
+    return _open_vectorstore(embedding_model, persist_directory)
+
+
+def _resolve_active_path() -> str:
+    """활성 버전 디렉토리 (버전이 바뀌었으면 이전 문서 기반 시맨틱 캐시 답변 무효화)"""
+    global _active_path
+    path = active_store_path()
+    if _active_path is not None and path != _active_path:
+        logger.info(f"활성 벡터스토어 전환: {_active_path} → {path}")
+        get_semantic_cache().invalidate()
+    _active_path = path
+    return path
+
+
+@lru_cache(maxsize=4)
+def _open_vectorstore(embedding_model: EmbeddingModel, persist_directory: str):
+    """
+    임베딩은 디스크 임베딩 캐시를 거치므로, Chroma를 다시 만들어도 같은 텍스트는 재임베딩하지 않습니다.
+    질의 임베딩은 그 앞의 메모리 LRU(QueryCachedEmbeddings)에서 먼저 찾고, 디스크 캐시는
+    QUERY_EMBEDDING_CACHE_DISK가 켜져 있을 때만 거칩니다 (비동기 경로에서는 스레드에서 조회 / 저장).
+    직전 버전 핸들도 캐시에 남아 있으므로 롤백 후 첫 요청도 바로 응답합니다.
     """
-    os.makedirs(settings.CHROMA_PATH, exist_ok=True)
-    embeddings = OpenAIEmbeddings(
-        model=embedding_model.value,
-        openai_api_key=settings.OPENAI_API_KEY
+    os.makedirs(persist_directory, exist_ok=True)
+    embeddings = cached_embeddings(
+        get_embeddings(embedding_model.value, purpose="vectorstore"),
+        embedding_model.value,
+        cache_queries=settings.QUERY_EMBEDDING_CACHE_DISK,
     )
+    if settings.QUERY_EMBEDDING_CACHE_ENABLED:
+        embeddings = QueryCachedEmbeddings(embeddings, get_query_embedding_cache())
     vectorstore = Chroma(
         collection_name="ai_career_docs",
         embedding_function=embeddings,
-        persist_directory=settings.CHROMA_PATH,
+        persist_directory=persist_directory,
     )
     return vectorstore
 
@@ -6,16 +6,43 @@ vector_retrain.py
 대화 로그를 기반으로 벡터스토어를 재학습시켜
 이전 대화 패턴을 RAG에 활용할 수 있도록 합니다.
 
+선별 (feedback_log + conversation_evaluation):
+  - 마지막 피드백이 like인 대화, 또는 피드백 없이 평가 점수((relevance + clarity) / 2)가
+    RETRAIN_MIN_SCORE 이상인 대화만 색인
+  - 마지막 피드백이 dislike이면 색인하지 않고, 이미 색인된 벡터는 제거 (나중에 받은 피드백 포함)
+
+증분 처리:
+  - 마지막으로 확인한 conversation_log.id / feedback_log.id / conversation_evaluation.evaluated_at(워터마크)을
+    컬렉션과 같은 디렉토리에 저장하고, 다음 실행에서는 새 대화와 워터마크 이후 피드백 / 평가가 달린
+    대화만 처리 (실행 비용 = 변경분, 선별 신호도 처리하는 대화 id에 대해서만 조회)
+  - id 순으로 RETRAIN_CHUNK_ROWS행씩 키셋 페이징(id > 마지막 id LIMIT n)으로 읽어 메모리 사용량 제한
+    (서버 측 커서를 열어 두지 않으므로 같은 연결에서 선별 신호 / 재판정 쿼리를 함께 실행 가능)
+  - 벡터 ID는 conv-{conversation_id}로 고정하여 upsert → 재실행해도 중복 없음
+  - 중복 압축(scripts/compact_vectorstore.py)으로 삭제된 벡터 ID는 다시 추가하지 않음 (--full 포함)
+  - 실행 전후 컬렉션 크기와 검색 지연을 측정하여 출력
+
 실행 방법:
   python -m app.vector_retrain
+  python -m app.vector_retrain --full   # 워터마크 무시하고 전체 다시 선별 / 반영
 --------------------------------
 """
+import json
+import math
 import os
+import sys
+import time
+from typing import Optional
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, inspect, text
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
 from dotenv import load_dotenv
+from app.core.config import settings
+from app.services.llm_client import get_embeddings
+from app.services.embedding_cache import cached_embeddings
+from app.services.batch_embedder import BatchEmbedder, EmbedItem
+from app.services.openai_scheduler import Priority, priority_scope
+from app.services.text_splitter import count_tokens
+from app.services.vector_compaction import load_compacted_ids
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
@@ -27,80 +54,357 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./local.db")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 CHROMA_PATH = os.getenv("CHROMA_PATH", "./chroma_db")
 
+COLLECTION_NAME = "conversation_retrained"
+WATERMARK_FILE = f"{COLLECTION_NAME}_watermark.json"
+# 검색 지연 측정용 질의 수 / top-k
+LATENCY_PROBES = 20
+LATENCY_K = 3
+
 if not OPENAI_API_KEY:
     raise ValueError("❌ OPENAI_API_KEY is not set in .env file")
 
 engine = create_engine(DATABASE_URL)
 
+CONVERSATION_COLUMNS = "id, question, answer, sentiment, topic, created_at"
 
-def retrain_vectorstore():
-    """
-    대화 로그를 벡터스토어에 재학습시킵니다.
 
-    동작:
-        1. conversation_log 테이블에서 모든 대화 조회
-        2. "Q: {질문}\nA: {답변}" 형식으로 데이터 변환
-        3. OpenAI 임베딩 생성
-        4. Chroma 벡터스토어에 메타데이터와 함께 저장
+def _watermark_path() -> str:
+    """컬렉션과 같은 디렉토리에 저장 (Chroma 초기화 시 함께 삭제됨)"""
+    return os.path.join(CHROMA_PATH, WATERMARK_FILE)
 
-    벡터스토어 컬렉션:
-        - 이름: "conversation_retrained"
-        - 경로: CHROMA_PATH (기본값: ./chroma_db)
+
+def load_watermark() -> dict:
     """
-    print("📊 Starting vectorstore retraining...")
+    마지막으로 확인한 conversation_log.id / feedback_log.id / conversation_evaluation.evaluated_at
 
+    선별 기준(RETRAIN_MIN_SCORE)이 바뀌었거나 기록이 없으면 0부터 (전체 다시 선별)
+    """
     try:
-        # 1. 대화 로그 조회 (ID와 생성일자 포함)
-        df = pd.read_sql(
-            "SELECT id, question, answer, sentiment, topic, created_at FROM conversation_log",
-            engine
+        with open(_watermark_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    if data.get("min_score") != settings.RETRAIN_MIN_SCORE:
+        return {"last_id": 0, "last_feedback_id": 0, "last_evaluated_at": None}
+    return {
+        "last_id": int(data.get("last_id", 0)),
+        "last_feedback_id": int(data.get("last_feedback_id", 0)),
+        "last_evaluated_at": data.get("last_evaluated_at"),
+    }
+
+
+def save_watermark(last_id: int, last_feedback_id: int, last_evaluated_at: Optional[str]):
+    """임시 파일에 쓴 뒤 교체"""
+    os.makedirs(CHROMA_PATH, exist_ok=True)
+    tmp_path = f"{_watermark_path()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "last_id": int(last_id),
+                "last_feedback_id": int(last_feedback_id),
+                "last_evaluated_at": last_evaluated_at,
+                "min_score": settings.RETRAIN_MIN_SCORE,
+                "updated_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+            },
+            f,
+        )
+    os.replace(tmp_path, _watermark_path())
+
+
+def _vector_ids(conversation_ids: pd.Series) -> pd.Series:
+    return "conv-" + conversation_ids.astype(int).astype(str)
+
+
+def _has_evaluations(conn) -> bool:
+    return inspect(conn).has_table("conversation_evaluation")
+
+
+def _has_evaluated_at(conn) -> bool:
+    """evaluated_at 컬럼이 없는 기존 평가 테이블이면 False (평가 워터마크 미사용)"""
+    return any(c["name"] == "evaluated_at" for c in inspect(conn).get_columns("conversation_evaluation"))
+
+
+def load_signals(conn, conversation_ids: list[int]) -> pd.DataFrame:
+    """
+    주어진 대화들의 선별 신호 (conversation_id 인덱스)
+
+    - last_feedback: 가장 최근 피드백 ('like' / 'dislike', 없으면 NaN)
+    - eval_score: conversation_evaluation의 (relevance + clarity) / 2 (없으면 NaN)
+    """
+    ids = [int(i) for i in conversation_ids]
+    if not ids:
+        return pd.DataFrame(columns=["last_feedback", "eval_score"], index=pd.Index([], dtype=int))
+    feedback = pd.read_sql(
+        text(
+            "SELECT f.conversation_id, f.feedback AS last_feedback FROM feedback_log f "
+            "JOIN (SELECT conversation_id, MAX(id) AS max_id FROM feedback_log "
+            "WHERE conversation_id IN :ids GROUP BY conversation_id) m ON f.id = m.max_id"
+        ).bindparams(bindparam("ids", expanding=True)),
+        conn,
+        params={"ids": ids},
+    ).set_index("conversation_id")
+
+    if _has_evaluations(conn):
+        evaluation = pd.read_sql(
+            text(
+                "SELECT conversation_id, relevance, clarity FROM conversation_evaluation WHERE conversation_id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            conn,
+            params={"ids": ids},
         )
+        evaluation["eval_score"] = (evaluation["relevance"] + evaluation["clarity"]) / 2
+        scores = evaluation.groupby("conversation_id")["eval_score"].max()
+    else:
+        scores = pd.Series(dtype=float, name="eval_score")
+
+    signals = feedback.join(scores, how="outer")
+    signals.index = signals.index.astype(int)
+    return signals
+
+
+def changed_conversations(conn, state: dict) -> list[int]:
+    """워터마크 이후 새 피드백 / 평가가 달린 대화 id (워터마크 이전 대화만, 새 대화는 청크 처리에서 판정)"""
+    changed = set(
+        pd.read_sql(
+            text("SELECT DISTINCT conversation_id FROM feedback_log WHERE id > :last_feedback_id"),
+            conn,
+            params={"last_feedback_id": state["last_feedback_id"]},
+        )["conversation_id"].dropna().astype(int)
+    )
+    if _has_evaluations(conn):
+        if _has_evaluated_at(conn):
+            query = "SELECT DISTINCT conversation_id FROM conversation_evaluation"
+            params = {}
+            if state["last_evaluated_at"]:
+                query += " WHERE evaluated_at > :last_evaluated_at"
+                params["last_evaluated_at"] = state["last_evaluated_at"]
+            evaluated = pd.read_sql(text(query), conn, params=params)
+        else:
+            # evaluated_at 도입 전 테이블은 변경분을 알 수 없으므로 전체 (evaluate_response 재실행 후 해소)
+            evaluated = pd.read_sql(text("SELECT DISTINCT conversation_id FROM conversation_evaluation"), conn)
+        changed |= set(evaluated["conversation_id"].dropna().astype(int))
+    return sorted(cid for cid in changed if cid <= state["last_id"])
+
+
+def _latest_evaluated_at(conn) -> Optional[str]:
+    if not (_has_evaluations(conn) and _has_evaluated_at(conn)):
+        return None
+    latest = conn.execute(text("SELECT MAX(evaluated_at) FROM conversation_evaluation")).scalar()
+    return str(latest) if latest is not None else None
+
+
+def select_rows(df: pd.DataFrame, signals: pd.DataFrame, compacted: frozenset = frozenset()) -> pd.Series:
+    """
+    색인 대상 여부 (like 또는 피드백 없이 평가 점수 기준 이상, dislike는 제외)
+
+    compacted: 중복 압축으로 삭제된 벡터 ID (남긴 대표 벡터와 거의 같으므로 다시 추가하지 않음)
+    """
+    joined = df[["id"]].join(signals, on="id")
+    liked = joined["last_feedback"].eq("like")
+    high_score = joined["last_feedback"].isna() & joined["eval_score"].ge(settings.RETRAIN_MIN_SCORE)
+    return (liked | high_score) & ~_vector_ids(df["id"]).isin(compacted)
+
 
+def build_items(df: pd.DataFrame) -> list[EmbedItem]:
+    """
+    대화 로그 DataFrame → EmbedItem 목록 (행 단위 반복 없이 컬럼 연산으로 생성)
+
+    텍스트: "Q: {질문}\nA: {답변}", 벡터 ID: conv-{id}
+    """
+    texts = "Q: " + df["question"].fillna("").astype(str) + "\nA: " + df["answer"].fillna("").astype(str)
+    metadatas = pd.DataFrame({
+        "conversation_id": df["id"].astype(str),
+        "sentiment": df["sentiment"].fillna("unknown").astype(str),
+        "topic": df["topic"].fillna("general").astype(str),
+        "created_at": df["created_at"].astype(str),
+        "source": "conversation_log",
+    }).to_dict("records")
+    ids = _vector_ids(df["id"]).tolist()
+    return [
+        EmbedItem(doc_id, doc_text, metadata, count_tokens(doc_text))
+        for doc_id, doc_text, metadata in zip(ids, texts.tolist(), metadatas)
+    ]
+
+
+def measure_collection(collection, probes: list) -> dict:
+    """컬렉션 크기와 검색 지연 (probes: 질의로 쓸 저장된 임베딩, OpenAI 호출 없음)"""
+    size = collection.count()
+    latencies = []
+    for vector in probes if size else []:
+        started = time.perf_counter()
+        collection.query(query_embeddings=[vector], n_results=min(LATENCY_K, size), include=[])
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    p95 = latencies[max(math.ceil(0.95 * len(latencies)) - 1, 0)] if latencies else 0.0
+    return {
+        "size": size,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p95_ms": round(p95, 2),
+    }
+
+
+def _sample_probes(collection) -> list:
+    data = collection.get(limit=LATENCY_PROBES, include=["embeddings"])
+    embeddings = data.get("embeddings")
+    return [list(map(float, v)) for v in embeddings] if embeddings is not None else []
+
+
+def _upsert(embedder: BatchEmbedder, df: pd.DataFrame) -> set[str]:
+    """선별된 대화 upsert → 실패한 벡터 ID 집합"""
+    if df.empty:
+        return set()
+    with priority_scope(Priority.BATCH):
+        return embedder.upsert(build_items(df), desc="대화 임베딩").failed_ids
+
+
+def _reconcile(
+    conn, vectorstore, embedder: BatchEmbedder, conversation_ids: list[int], compacted: frozenset
+) -> dict:
+    """
+    이미 지나간 대화 중 선별 신호가 바뀐 대화를 다시 판정
+
+    새로 dislike를 받은 대화는 벡터를 제거하고, 새로 like / 높은 점수를 받은 대화는 추가합니다.
+    """
+    counts = {"indexed": 0, "evicted": 0, "failed": 0}
+    query = text(
+        f"SELECT {CONVERSATION_COLUMNS} FROM conversation_log WHERE id IN :ids ORDER BY id"
+    ).bindparams(bindparam("ids", expanding=True))
+    for start in range(0, len(conversation_ids), settings.RETRAIN_CHUNK_ROWS):
+        df = pd.read_sql(query, conn, params={"ids": conversation_ids[start:start + settings.RETRAIN_CHUNK_ROWS]})
         if df.empty:
-            print("⚠️ No conversation data found in database.")
-            return
+            continue
+        keep = select_rows(df, load_signals(conn, df["id"].tolist()), compacted)
+        vector_ids = _vector_ids(df["id"])
+        existing = set(vectorstore._collection.get(ids=vector_ids.tolist(), include=[])["ids"])
+        present = vector_ids.isin(existing)
 
-        print(f"✅ Found {len(df)} conversations to process.")
+        evict = vector_ids[present & ~keep].tolist()
+        if evict:
+            vectorstore._collection.delete(ids=evict)
+        failed = _upsert(embedder, df[keep & ~present])
+        counts["evicted"] += len(evict)
+        counts["failed"] += len(failed)
+        counts["indexed"] += int((keep & ~present).sum()) - len(failed)
+    return counts
 
-        # 2. 데이터 변환 (Q&A 형식)
-        texts = [
-            f"Q: {row['question']}\nA: {row['answer']}"
-            for _, row in df.iterrows()
-        ]
 
-        # 3. 메타데이터 생성 (출처 추적용)
-        metadatas = [
-            {
-                "conversation_id": str(row["id"]),
-                "sentiment": row["sentiment"] if pd.notna(row["sentiment"]) else "unknown",
-                "topic": row["topic"] if pd.notna(row["topic"]) else "general",
-                "created_at": str(row["created_at"]),
-                "source": "conversation_log"
-            }
-            for _, row in df.iterrows()
-        ]
-
-        # 4. OpenAI 임베딩 초기화
-        embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small",
-            openai_api_key=OPENAI_API_KEY
+def retrain_vectorstore(full: bool = False) -> dict:
+    """
+    피드백 / 평가로 선별한 대화만 벡터스토어에 증분 반영합니다.
+
+    동작:
+        1. 워터마크 이후 새 피드백을 받았거나 평가된 기존 대화는 다시 판정하여 추가 / 제거
+        2. 워터마크보다 큰 conversation_log 행을 id 순으로 청크 단위 조회하고, 청크의 대화에 대해서만
+           feedback_log(마지막 피드백)와 conversation_evaluation(평가 점수)으로 선별 신호를 조회하여
+           선별된 행만 토큰 기준 배치로 임베딩, conv-{id} ID로 upsert (디스크 임베딩 캐시 경유)
+        3. 청크가 모두 성공하면 워터마크 갱신 (실패 시 실패한 가장 작은 id 직전까지만)
+
+    벡터스토어 컬렉션:
+        - 이름: "conversation_retrained"
+        - 경로: CHROMA_PATH (기본값: ./chroma_db)
+
+    Args:
+        full: 워터마크를 무시하고 전체 대화를 다시 선별 / 반영
+
+    Returns:
+        {"indexed", "skipped", "evicted", "failed", "watermark", "before", "after", "seconds"}
+        before / after: {"size": 벡터 수, "mean_ms", "p95_ms": 검색 지연}
+    """
+    print("📊 Starting vectorstore retraining...")
+    started = time.perf_counter()
+
+    try:
+        # 1. OpenAI 임베딩 초기화 (디스크 임베딩 캐시 경유 → 이미 임베딩한 대화는 재호출 없음)
+        embeddings = cached_embeddings(
+            get_embeddings("text-embedding-3-small", purpose="conversation_retrain"), "text-embedding-3-small"
         )
 
-        # 5. Chroma 벡터스토어 초기화
+        # 2. Chroma 벡터스토어 초기화
         vectorstore = Chroma(
-            collection_name="conversation_retrained",
+            collection_name=COLLECTION_NAME,
             embedding_function=embeddings,
             persist_directory=CHROMA_PATH
         )
+        collection = vectorstore._collection
+        probes = _sample_probes(collection)
+        before = measure_collection(collection, probes)
 
-        # 6. 텍스트와 메타데이터 추가
-        print("🔄 Adding texts to vectorstore...")
-        vectorstore.add_texts(texts=texts, metadatas=metadatas)
+        state = {"last_id": 0, "last_feedback_id": 0, "last_evaluated_at": None} if full else load_watermark()
+        if state["last_id"] == 0:
+            # 워터마크 도입 / 선별 기준 변경 전에 추가된 벡터 정리 (이후 선별된 대화만 다시 upsert)
+            collection.delete(where={"source": "conversation_log"})
+        print(
+            f"🔖 Watermark: conversation_log.id > {state['last_id']}, feedback_log.id > {state['last_feedback_id']}, "
+            f"evaluated_at > {state['last_evaluated_at']}"
+        )
+
+        compacted = frozenset(load_compacted_ids(CHROMA_PATH))
+        embedder = BatchEmbedder(vectorstore)
+        counts = {"indexed": 0, "skipped": 0, "evicted": 0, "failed": 0}
+        watermark = state["last_id"]
+        with engine.connect() as conn:
+            last_feedback_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM feedback_log")).scalar()
+            last_evaluated_at = _latest_evaluated_at(conn)
+
+            # 3. 이미 지나간 대화 중 워터마크 이후 새 피드백 / 평가가 달린 대화만 다시 판정
+            if state["last_id"]:
+                reconciled = _reconcile(conn, vectorstore, embedder, changed_conversations(conn, state), compacted)
+                for key, value in reconciled.items():
+                    counts[key] += value
+
+            # 4. 새 행만 id 순으로 청크 단위 조회 (키셋 페이징: 청크마다 쿼리가 끝나므로 열린 커서 없음)
+            query = text(
+                f"SELECT {CONVERSATION_COLUMNS} FROM conversation_log WHERE id > :last_id ORDER BY id LIMIT :limit"
+            )
+            while True:
+                df = pd.read_sql(query, conn, params={"last_id": watermark, "limit": settings.RETRAIN_CHUNK_ROWS})
+                if df.empty:
+                    break
+                keep = select_rows(df, load_signals(conn, df["id"].tolist()), compacted)
+                failed_ids = _upsert(embedder, df[keep])
+                counts["skipped"] += int((~keep).sum())
+
+                if failed_ids:
+                    # 실패한 가장 작은 id 직전까지만 워터마크 전진 (다음 실행에서 그 뒤부터 재시도)
+                    failed_rows = df[_vector_ids(df["id"]).isin(failed_ids)]
+                    counts["failed"] += len(failed_rows)
+                    counts["indexed"] += int(keep.sum()) - len(failed_rows)
+                    watermark = max(watermark, int(failed_rows["id"].min()) - 1)
+                    print(f"⚠️ {len(failed_rows)} conversations failed to embed; will retry from id {watermark + 1}")
+                    break
+
+                counts["indexed"] += int(keep.sum())
+                watermark = int(df["id"].max())
+                save_watermark(watermark, state["last_feedback_id"], state["last_evaluated_at"])
+                print(f"   - Indexed {counts['indexed']} / skipped {counts['skipped']} (watermark {watermark})")
+
+        # 피드백 / 평가 워터마크는 재판정이 끝난 뒤에만 전진
+        if counts["failed"]:
+            save_watermark(watermark, state["last_feedback_id"], state["last_evaluated_at"])
+        else:
+            save_watermark(watermark, last_feedback_id, last_evaluated_at)
+        after = measure_collection(collection, probes)
 
         print(f"✅ Vectorstore retraining complete!")
-        print(f"   - Collection: conversation_retrained")
+        print(f"   - Collection: {COLLECTION_NAME}")
         print(f"   - Location: {CHROMA_PATH}")
-        print(f"   - Documents added: {len(texts)}")
+        print(
+            f"   - Indexed: {counts['indexed']}, skipped (not selected): {counts['skipped']}, "
+            f"evicted: {counts['evicted']}, failed: {counts['failed']}"
+        )
+        print(f"   - Collection size: {before['size']} → {after['size']}")
+        print(
+            f"   - Search latency (mean / p95): {before['mean_ms']} / {before['p95_ms']} ms → "
+            f"{after['mean_ms']} / {after['p95_ms']} ms"
+        )
+
+        return {
+            **counts,
+            "watermark": watermark,
+            "before": before,
+            "after": after,
+            "seconds": round(time.perf_counter() - started, 2),
+        }
 
     except Exception as e:
         print(f"❌ Error during vectorstore retraining: {e}")
@@ -108,4 +412,4 @@ def retrain_vectorstore():
 
 
 if __name__ == "__main__":
-    retrain_vectorstore()
+    retrain_vectorstore(full="--full" in sys.argv[1:])
@@ -237,15 +237,19 @@ with tab4:
 
     topic_query = f"""
         SELECT
-            topic,
-            COUNT(*) as count
-        FROM conversation_log
-        WHERE created_at >= '{start_date}' AND created_at <= '{end_date} 23:59:59'
-            AND topic IS NOT NULL
-            AND topic != ''
-        GROUP BY topic
-        ORDER BY count DESC
-        LIMIT 20
+            tc.label AS topic,
+            t.count
+        FROM (
+            SELECT topic_id, COUNT(*) AS count
+            FROM conversation_log
+            WHERE created_at >= '{start_date}' AND created_at <= '{end_date} 23:59:59'
+                AND topic_id IS NOT NULL
+            GROUP BY topic_id
+            ORDER BY count DESC
+            LIMIT 20
+        ) t
+        JOIN topic_cluster tc ON tc.id = t.topic_id
+        ORDER BY t.count DESC
     """
     topic_df = safe_query(topic_query, "주제 분석 조회 실패")
 
@@ -0,0 +1,161 @@
+"""
+대화 감정/주제 백필 스크립트
+-----------------------------------------
+conversation_log에서 sentiment가 NULL인 과거 행을 일괄 분석 엔진(batch_analyzer)으로
+채웁니다. LLM 1회 호출로 --batch-size 건을 분류하고, --concurrency 개 배치를 동시에 보냅니다.
+재시도 후에도 일괄 응답에서 빠진 행은 항목별 분석기(analyzer)로 한 건씩 다시 분류합니다.
+종료 시 처리량(행/분)과 행당 토큰 수를 보고합니다.
+
+실행 예시:
+    python scripts/backfill_analysis.py
+    python scripts/backfill_analysis.py --batch-size 20 --concurrency 4
+    python scripts/backfill_analysis.py --limit 100 --dry-run
+
+옵션:
+    --batch-size INT   LLM 1회 호출로 분석할 행 수 (기본 20)
+    --concurrency INT  동시에 보낼 배치 수 (기본 4)
+    --limit INT        최대 처리 행 수 (기본: 전체)
+    --dry-run          분석만 하고 DB는 갱신하지 않음
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.database import SessionLocal
+from app.models.conversation_log import ConversationLog
+from app.services.analyzer import aanalyze_sentiment, aextract_topic
+from app.services.batch_analyzer import MAX_TOPIC_CHARS, BatchResult, aanalyze_batch
+from app.services.conversation_logger import update_conversation_analyses
+from app.services.openai_scheduler import Priority, priority_scope
+
+# DB에서 한 번에 읽어 올 행 수 (배치 여러 개 분량)
+READ_CHUNK_SIZE = 200
+
+
+def count_pending() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(ConversationLog).filter(ConversationLog.sentiment.is_(None)).count()
+    finally:
+        db.close()
+
+
+def load_pending(after_id: int, limit: int) -> list[tuple[int, str]]:
+    """sentiment가 NULL인 행을 id 순서로 읽음 (keyset 페이지네이션)"""
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ConversationLog.id, ConversationLog.answer)
+            .filter(ConversationLog.sentiment.is_(None), ConversationLog.id > after_id)
+            .order_by(ConversationLog.id)
+            .limit(limit)
+            .all()
+        )
+        return [(row.id, row.answer or "") for row in rows]
+    finally:
+        db.close()
+
+
+async def analyze_individually(items: list[tuple[int, str]]) -> dict[int, dict]:
+    """일괄 분석에서 끝내 빠진 행을 항목별 분석기로 분류 (로컬 분류기 → LLM, 결과 캐시 경유)"""
+    results = {}
+    for item_id, text in items:
+        try:
+            sentiment, topic = await asyncio.gather(aanalyze_sentiment(text), aextract_topic(text))
+        except Exception as e:
+            print(f"   ⚠️ 항목별 분석 실패 (id {item_id}): {e}")
+            continue
+        topic = (topic or "").strip().strip("\"'")
+        if sentiment and topic:
+            results[item_id] = {"sentiment": sentiment, "topic": topic[:MAX_TOPIC_CHARS]}
+    return results
+
+
+async def process_chunk(rows: list[tuple[int, str]], batch_size: int, concurrency: int, dry_run: bool) -> BatchResult:
+    semaphore = asyncio.Semaphore(concurrency)
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+
+    async def run(batch):
+        async with semaphore:
+            try:
+                result = await aanalyze_batch(batch)
+            except Exception as e:
+                print(f"   ⚠️ 배치 실패 (id {batch[0][0]}~{batch[-1][0]}): {e}")
+                return BatchResult(failed=[item_id for item_id, _ in batch])
+            if result.failed:
+                failed = set(result.failed)
+                recovered = await analyze_individually([item for item in batch if item[0] in failed])
+                result.results.update(recovered)
+                result.failed = [item_id for item_id in result.failed if item_id not in recovered]
+            if not dry_run:
+                await asyncio.to_thread(update_conversation_analyses, result.results)
+            return result
+
+    total = BatchResult()
+    for result in await asyncio.gather(*(run(b) for b in batches)):
+        total.merge(result)
+        total.failed.extend(result.failed)
+    return total
+
+
+async def backfill(batch_size: int, concurrency: int, limit: int | None, dry_run: bool) -> BatchResult:
+    total = BatchResult()
+    after_id = 0
+    processed = 0
+    started = time.perf_counter()
+
+    while limit is None or processed < limit:
+        read_size = READ_CHUNK_SIZE if limit is None else min(READ_CHUNK_SIZE, limit - processed)
+        rows = load_pending(after_id, read_size)
+        if not rows:
+            break
+        after_id = rows[-1][0]
+        processed += len(rows)
+
+        result = await process_chunk(rows, batch_size, concurrency, dry_run)
+        total.merge(result)
+        total.failed.extend(result.failed)
+
+        elapsed_min = (time.perf_counter() - started) / 60
+        print(f"   … {processed}행 처리 (성공 {len(total.results)}, 실패 {len(total.failed)}), "
+              f"{len(total.results) / elapsed_min:.0f}행/분")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="conversation_log 감정/주제 백필")
+    parser.add_argument("--batch-size", type=int, default=20, help="LLM 1회 호출로 분석할 행 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 보낼 배치 수")
+    parser.add_argument("--limit", type=int, default=None, help="최대 처리 행 수")
+    parser.add_argument("--dry-run", action="store_true", help="DB를 갱신하지 않음")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("🧠 대화 감정/주제 백필 시작")
+    print("=" * 60)
+    print(f"   대상: sentiment IS NULL {count_pending()}행, 배치 {args.batch_size}건 × 동시 {args.concurrency}개"
+          + (" (dry-run)" if args.dry_run else ""))
+
+    started = time.perf_counter()
+    # 대화형 요청보다 낮은 우선순위로 OpenAI 호출
+    with priority_scope(Priority.BATCH):
+        total = asyncio.run(backfill(args.batch_size, args.concurrency, args.limit, args.dry_run))
+    elapsed = time.perf_counter() - started
+
+    succeeded = len(total.results)
+    print("\n" + "=" * 60)
+    print(f"✅ 완료: 성공 {succeeded}행, 실패 {len(total.failed)}행, {elapsed:.1f}초")
+    if succeeded:
+        print(f"   처리량: {succeeded / (elapsed / 60):.0f}행/분")
+        print(f"   LLM 호출: {total.llm_calls}회 (호출당 {succeeded / total.llm_calls:.1f}행)")
+        print(f"   토큰: {total.tokens}개 (행당 {total.tokens / succeeded:.1f}개)")
+        print(f"   결과 캐시 적중: {total.cache_hits}행 (LLM 생략)")
+        print(f"   로컬 감정 분류: {total.local_sentiments}행 ({total.local_sentiments / succeeded:.0%}, LLM에는 주제만 요청)")
+    if total.failed:
+        print(f"   실패 id (다음 실행 시 재시도): {total.failed[:20]}{' …' if len(total.failed) > 20 else ''}")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+주제 정규화 백필 스크립트
+-----------------------------------------
+conversation_log에서 topic은 있지만 topic_id가 없는 행(정규화 도입 이전 데이터,
+정규화 실패 행)을 topic_index로 정규화하여 topic_id를 채웁니다.
+
+실행 예시:
+    python scripts/backfill_topic_ids.py
+    python scripts/backfill_topic_ids.py --chunk-size 200 --limit 1000
+
+옵션:
+    --chunk-size INT  한 번에 읽어 정규화할 행 수 (기본 500)
+    --limit INT       최대 처리 행 수 (기본: 전체)
+"""
+
+import argparse
+import time
+
+from app.database import SessionLocal
+from app.models.conversation_log import ConversationLog
+from app.services.openai_scheduler import Priority, priority_scope
+from app.services.topic_index import get_topic_index
+
+
+def load_pending(after_id: int, limit: int) -> list[tuple[int, str]]:
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ConversationLog.id, ConversationLog.topic)
+            .filter(
+                ConversationLog.topic.isnot(None),
+                ConversationLog.topic_id.is_(None),
+                ConversationLog.id > after_id,
+            )
+            .order_by(ConversationLog.id)
+            .limit(limit)
+            .all()
+        )
+        return [(row.id, row.topic) for row in rows]
+    finally:
+        db.close()
+
+
+def save_topic_ids(pairs: list[tuple[int, int]]):
+    db = SessionLocal()
+    try:
+        for log_id, topic_id in pairs:
+            db.query(ConversationLog).filter(ConversationLog.id == log_id).update(
+                {"topic_id": topic_id}, synchronize_session=False
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="conversation_log.topic_id 백필")
+    parser.add_argument("--chunk-size", type=int, default=500, help="한 번에 정규화할 행 수")
+    parser.add_argument("--limit", type=int, default=None, help="최대 처리 행 수")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("🏷️ 주제 정규화 백필 시작")
+    print("=" * 60)
+
+    index = get_topic_index()
+    clusters_before = index.stats()["clusters"]
+    started = time.perf_counter()
+    after_id = 0
+    processed = 0
+
+    with priority_scope(Priority.BATCH):
+        while args.limit is None or processed < args.limit:
+            size = args.chunk_size if args.limit is None else min(args.chunk_size, args.limit - processed)
+            rows = load_pending(after_id, size)
+            if not rows:
+                break
+            after_id = rows[-1][0]
+            topic_ids = index.assign_many([topic for _, topic in rows])
+            save_topic_ids([(log_id, tid) for (log_id, _), tid in zip(rows, topic_ids) if tid is not None])
+            processed += len(rows)
+            print(f"   … {processed}행 처리, 클러스터 {index.stats()['clusters']}개")
+
+    stats = index.stats()
+    print("\n" + "=" * 60)
+    print(f"✅ 완료: {processed}행, {time.perf_counter() - started:.1f}초")
+    print(f"   클러스터: {clusters_before}개 → {stats['clusters']}개 (신규 {stats['created']}개)")
+    if processed:
+        print(f"   원문 주제 재사용(임베딩 생략): {stats['memo_hits']}건")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
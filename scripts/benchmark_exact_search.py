@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+NumPy 정확 검색 vs Chroma 벤치마크
+-----------------------------------------
+컬렉션 크기별(기본 1k / 10k / 100k)로 임시 Chroma 컬렉션에 무작위 정규화 벡터를 넣고,
+같은 질의 벡터로 두 경로의 검색 지연을 비교합니다.
+- chroma: store.similarity_search_by_vector (HNSW 근사 검색)
+- exact: ExactSearchIndex.search (memmap 행렬 @ 질의 + argpartition)
+
+HNSW 결과가 정확 top-k와 얼마나 겹치는지(recall@k)도 함께 기록합니다.
+OpenAI를 호출하지 않으며, 임시 디렉토리를 쓰므로 실제 Chroma DB에는 영향이 없습니다.
+
+실행 예시:
+    python scripts/benchmark_exact_search.py
+    python scripts/benchmark_exact_search.py --sizes 1000 10000 --dim 1536 --queries 200
+"""
+import argparse
+import json
+import math
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from langchain_chroma import Chroma
+
+# 프로젝트 루트를 sys.path에 추가
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.exact_search import ExactSearchIndex
+
+DEFAULT_OUTPUT = PROJECT_ROOT / "reports" / "exact_search_benchmark.json"
+ADD_BATCH = 5000
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """nearest-rank 백분위수 (입력은 정렬된 리스트)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def random_unit_vectors(rng, count: int, dim: int) -> np.ndarray:
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def time_searches(search, queries: np.ndarray) -> tuple[list[list[str]], dict]:
+    results, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        docs = search(query.tolist())
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append([doc.id for doc in docs])
+    latencies.sort()
+    return results, {
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+    }
+
+
+def run_size(size: int, args, rng) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = Chroma(
+            collection_name="benchmark",
+            persist_directory=str(Path(tmp_dir) / "chroma"),
+            collection_metadata={"hnsw:space": "cosine"},
+        )
+        started = time.perf_counter()
+        for start in range(0, size, ADD_BATCH):
+            count = min(ADD_BATCH, size - start)
+            store._collection.add(
+                ids=[f"doc-{i}" for i in range(start, start + count)],
+                embeddings=random_unit_vectors(rng, count, args.dim).tolist(),
+                documents=[f"문서 {i}" for i in range(start, start + count)],
+                metadatas=[{"source": "benchmark"} for _ in range(count)],
+            )
+        load_seconds = time.perf_counter() - started
+
+        index = ExactSearchIndex(str(Path(tmp_dir) / "exact"))
+        started = time.perf_counter()
+        index.refresh(store)
+        export_seconds = time.perf_counter() - started
+
+        queries = random_unit_vectors(rng, args.queries, args.dim)
+        chroma_ids, chroma_latency = time_searches(
+            lambda v: store.similarity_search_by_vector(v, k=args.k), queries
+        )
+        exact_ids, exact_latency = time_searches(
+            lambda v: [doc for doc, _ in index.search(v, args.k)], queries
+        )
+        overlap = [len(set(a) & set(b)) / args.k for a, b in zip(chroma_ids, exact_ids)]
+
+        stats = index.stats()
+        return {
+            "size": size,
+            "dim": args.dim,
+            "load_seconds": round(load_seconds, 2),
+            "export_seconds": round(export_seconds, 2),
+            "matrix_mb": round(stats["matrix_bytes"] / 1024 / 1024, 1),
+            "chroma": chroma_latency,
+            "exact": exact_latency,
+            "speedup_p50": round(chroma_latency["p50_ms"] / exact_latency["p50_ms"], 2)
+            if exact_latency["p50_ms"] else None,
+            f"chroma_recall@{args.k}": round(sum(overlap) / len(overlap), 3),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy 정확 검색 vs Chroma 지연 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dim", type=int, default=1536, help="벡터 차원 (text-embedding-3-small: 1536)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100, help="크기별 질의 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    results = []
+    for size in args.sizes:
+        print(f"⏳ {size}개 벡터 준비 중...")
+        results.append(run_size(size, args, rng))
+
+    print("\n" + "=" * 84)
+    print(f"{'size':>8}{'chroma p50':>12}{'p95':>9}{'exact p50':>12}{'p95':>9}{'speedup':>10}"
+          f"{f'recall@{args.k}':>12}{'matrix MB':>12}")
+    print("-" * 84)
+    for r in results:
+        print(
+            f"{r['size']:>8}{r['chroma']['p50_ms']:>12.3f}{r['chroma']['p95_ms']:>9.3f}"
+            f"{r['exact']['p50_ms']:>12.3f}{r['exact']['p95_ms']:>9.3f}{(r['speedup_p50'] or 0):>10.2f}"
+            f"{r[f'chroma_recall@{args.k}']:>12.3f}{r['matrix_mb']:>12.1f}"
+        )
+    print("=" * 84)
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "k": args.k,
+        "queries": args.queries,
+        "results": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+검색 지연 / 재현율 벤치마크 (Dense 단독 vs 하이브리드)
+-----------------------------------------
+현재 Chroma 컬렉션(ai_career_docs)에 대해 같은 질의 집합으로 두 경로를 비교합니다.
+- dense: store.similarity_search_by_vector (기존 경로)
+- hybrid: BM25 + 벡터 RRF 결합 (app/services/retriever.py)
+
+질의 집합:
+    기본값은 청크의 섹션 제목(마지막 제목)을 질의로 쓰고, 같은 섹션의 청크를 정답으로 봅니다.
+    --queries로 JSONL 파일({"query": "...", "sources": ["파일명", ...]})을 주면 정답은
+    해당 파일에서 나온 청크입니다.
+
+질의 임베딩은 미리 한 번 계산해서 두 경로가 같은 벡터를 쓰므로, 지연은 검색 단계만 측정합니다.
+실제 토큰을 쓰지 않으려면 fake OpenAI 서버로 인제스트/실행하세요 (이 경우 dense 재현율은 의미 없음).
+
+실행 예시:
+    python scripts/benchmark_retrieval.py
+    python scripts/benchmark_retrieval.py --k 3 --max-queries 200
+    python scripts/benchmark_retrieval.py --queries reports/retrieval_queries.jsonl
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.retriever import get_bm25_index, hybrid_search
+from app.services.vectorstore import get_vectorstore
+
+DEFAULT_OUTPUT = PROJECT_ROOT / "reports" / "retrieval_benchmark.json"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """nearest-rank 백분위수 (입력은 정렬된 리스트)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def build_section_queries(store, max_queries: int) -> list[dict]:
+    """섹션 제목 → 같은 섹션 청크 ID 집합"""
+    data = store.get(include=["metadatas"])
+    sections: dict[tuple[str, str], set[str]] = {}
+    for doc_id, metadata in zip(data["ids"], data["metadatas"]):
+        section = (metadata or {}).get("section")
+        if section:
+            sections.setdefault((metadata.get("source", ""), section), set()).add(doc_id)
+    queries = [
+        {"query": section.split(" > ")[-1], "relevant": ids}
+        for (_, section), ids in sorted(sections.items())
+    ]
+    return queries[:max_queries]
+
+
+def load_query_file(store, path: str, max_queries: int) -> list[dict]:
+    """JSONL 질의 파일 → 정답 source의 청크 ID 집합"""
+    data = store.get(include=["metadatas"])
+    by_source: dict[str, set[str]] = {}
+    for doc_id, metadata in zip(data["ids"], data["metadatas"]):
+        by_source.setdefault((metadata or {}).get("source", ""), set()).add(doc_id)
+
+    queries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            relevant = set().union(*(by_source.get(s, set()) for s in item["sources"]))
+            queries.append({"query": item["query"], "relevant": relevant})
+    return queries[:max_queries]
+
+
+def run_mode(name: str, search, queries: list[dict], vectors: list, k: int) -> dict:
+    latencies, hits, reciprocal_ranks = [], 0, 0.0
+    for query, vector in zip(queries, vectors):
+        started = time.perf_counter()
+        docs = search(query["query"], vector)
+        latencies.append((time.perf_counter() - started) * 1000)
+        ranks = [rank for rank, doc in enumerate(docs[:k], 1) if doc.id in query["relevant"]]
+        if ranks:
+            hits += 1
+            reciprocal_ranks += 1 / ranks[0]
+    latencies.sort()
+    return {
+        "mode": name,
+        "queries": len(queries),
+        f"recall@{k}": round(hits / len(queries), 3),
+        "mrr": round(reciprocal_ranks / len(queries), 3),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 지연 / 재현율 벤치마크 (dense vs hybrid)")
+    parser.add_argument("--k", type=int, default=3, help="top-k (rag_service.TOP_K와 동일하게)")
+    parser.add_argument("--max-queries", type=int, default=300)
+    parser.add_argument("--queries", default=None, help="JSONL 질의 파일 (query, sources)")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    store = get_vectorstore()
+    if args.queries:
+        queries = load_query_file(store, args.queries, args.max_queries)
+    else:
+        queries = build_section_queries(store, args.max_queries)
+    if not queries:
+        print("⚠️ 질의를 만들 수 없습니다. 먼저 scripts/ingest_docs.py로 문서를 인제스트하세요.")
+        return
+
+    print(f"🔎 질의 {len(queries)}개, BM25 색인 {len(get_bm25_index())}개 청크")
+    vectors = store.embeddings.embed_documents([q["query"] for q in queries])
+
+    results = [
+        run_mode("dense", lambda q, v: store.similarity_search_by_vector(v, k=args.k), queries, vectors, args.k),
+        run_mode("hybrid", lambda q, v: hybrid_search(store, q, v, args.k), queries, vectors, args.k),
+    ]
+
+    print("\n" + "=" * 72)
+    print(f"{'mode':<10}{'queries':>9}{f'recall@{args.k}':>12}{'mrr':>8}{'p50':>10}{'p95':>10}{'mean':>10}")
+    print("-" * 72)
+    for r in results:
+        print(
+            f"{r['mode']:<10}{r['queries']:>9}{r[f'recall@{args.k}']:>12.3f}{r['mrr']:>8.3f}"
+            f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['mean_ms']:>10.2f}"
+        )
+    print("=" * 72)
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "k": args.k,
+        "query_set": args.queries or "section_titles",
+        "results": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
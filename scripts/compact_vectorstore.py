@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+중복 벡터 압축 스크립트
+-----------------------------------------
+컬렉션에서 완전 중복(본문 해시가 같은 청크)과 근접 중복(코사인 유사도 ≥ 임계값)을 찾아 일괄 삭제하고,
+회수한 벡터 수 / 디스크 바이트와 삭제 전후 검색 지연을 출력합니다. OpenAI를 호출하지 않습니다.
+
+실행 예시:
+    python scripts/compact_vectorstore.py --dry-run
+    python scripts/compact_vectorstore.py --collection conversation_retrained --threshold 0.97
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.federated_retriever import CONVERSATION_COLLECTION, DOCS_COLLECTION
+from app.services.vector_compaction import compact_collection
+
+DEFAULT_OUTPUT = PROJECT_ROOT / "reports" / "vector_compaction.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chroma 컬렉션 중복 벡터 압축")
+    parser.add_argument("--collection", default=DOCS_COLLECTION, choices=[DOCS_COLLECTION, CONVERSATION_COLLECTION])
+    parser.add_argument("--threshold", type=float, help="근접 중복 코사인 유사도 하한 (기본: VECTOR_COMPACTION_THRESHOLD)")
+    parser.add_argument("--block-size", type=int, help="블록 행렬 곱 크기 (기본: VECTOR_COMPACTION_BLOCK_SIZE)")
+    parser.add_argument("--dry-run", action="store_true", help="찾기만 하고 삭제하지 않음")
+    parser.add_argument("--no-vacuum", action="store_true", help="삭제 후 SQLite VACUUM 생략")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    report = compact_collection(
+        args.collection,
+        threshold=args.threshold,
+        block_size=args.block_size,
+        dry_run=args.dry_run,
+        vacuum=not args.no_vacuum,
+    )
+    if report["status"] != "success":
+        print(f"❌ {report['message']}")
+        sys.exit(1)
+
+    before, after = report["latency"]["before"], report["latency"]["after"]
+    disk = report["disk_bytes"]
+    print("\n" + "=" * 60)
+    print(f"🧹 {report['collection']} 압축{' (dry-run)' if report['dry_run'] else ''} - 임계값 {report['threshold']}")
+    print("=" * 60)
+    print(f"   - 검사: {report['scanned']}개, 완전 중복: {report['exact_duplicates']}개, "
+          f"근접 중복: {report['near_duplicates']}개")
+    print(f"   - 삭제: {report['removed']}개 (벡터 {report['vector_bytes_reclaimed'] / 1024 / 1024:.1f} MB)")
+    print(f"   - 디스크: {disk['before'] / 1024 / 1024:.1f} MB → {disk['after'] / 1024 / 1024:.1f} MB")
+    print(f"   - 검색 지연 (mean / p95): {before['mean_ms']} / {before['p95_ms']} ms → "
+          f"{after['mean_ms']} / {after['p95_ms']} ms")
+    for sample in report["samples"]:
+        print(f"     · [{sample['kind']}] {sample['removed']} → 유지 {sample['kept']}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps({"generated_at": datetime.now().isoformat(timespec="seconds"), **report}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    print(f"💾 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
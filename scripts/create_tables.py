@@ -12,6 +12,7 @@ sys.path.insert(0, str(project_root))
 
 from app.database import Base, engine
 from app.models.conversation_log import ConversationLog  # noqa: F401
+from app.models.topic_cluster import TopicCluster  # noqa: F401
 
 if __name__ == "__main__":
     print("🔨 데이터베이스 테이블 생성 중...")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+로컬 Fake OpenAI 서버 (부하 테스트용)
+-----------------------------------------
+실제 토큰을 쓰지 않고 API 서버를 부하 테스트하기 위한 OpenAI 호환 스텁입니다.
+- POST /v1/chat/completions : 일반 / 스트리밍(SSE) 응답, 지연 분포 설정 가능
+- POST /v1/embeddings       : 입력 텍스트 해시 기반 결정적(deterministic) 임베딩
+- 오류 주입 (--error-rate)  : 지정 비율로 429 응답
+
+지연 분포:
+    첫 토큰까지의 지연은 로그정규분포로 샘플링합니다 (--latency-median-ms, --latency-p95-ms).
+    이후 토큰마다 --token-delay-ms 만큼 추가됩니다 (스트리밍 시 토큰 간격).
+
+실행 예시:
+    python scripts/fake_openai_server.py --port 9000
+    python scripts/fake_openai_server.py --latency-median-ms 400 --latency-p95-ms 1500 --error-rate 0.01
+
+API 서버를 fake 서버로 연결:
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=sk-fake \\
+        poetry run uvicorn app.main:app --port 8000
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+import uuid
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# 모델별 임베딩 차원
+EMBEDDING_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+# 런타임 설정 (main()에서 CLI 인자로 덮어씀)
+config = {
+    "latency_median_ms": 300.0,
+    "latency_p95_ms": 1200.0,
+    "token_delay_ms": 15.0,
+    "embedding_latency_ms": 50.0,
+    "error_rate": 0.0,
+}
+
+app = FastAPI(title="Fake OpenAI Server")
+
+
+# -----------------------------------
+# 지연 / 결정적 출력 헬퍼
+# -----------------------------------
+def sample_latency_seconds() -> float:
+    """중앙값과 p95로 정의된 로그정규분포에서 지연 시간 샘플링"""
+    median = max(config["latency_median_ms"], 1.0)
+    p95 = max(config["latency_p95_ms"], median)
+    sigma = math.log(p95 / median) / 1.645  # p95 = median * exp(1.645 * sigma)
+    return random.lognormvariate(math.log(median), sigma) / 1000
+
+
+def _seed(value) -> int:
+    raw = value if isinstance(value, str) else json.dumps(value)
+    return int.from_bytes(hashlib.sha256(raw.encode("utf-8")).digest()[:8], "little")
+
+
+def deterministic_embedding(value, dimensions: int) -> list[float]:
+    """같은 입력에는 항상 같은 단위 벡터를 반환 (텍스트 또는 토큰 ID 배열)"""
+    rng = np.random.default_rng(_seed(value))
+    vector = rng.standard_normal(dimensions).astype(np.float32)
+    vector /= np.linalg.norm(vector)
+    return vector.tolist()
+
+
+def fake_completion_text(messages: list[dict]) -> str:
+    """프롬프트 유형에 맞춰 파서가 처리할 수 있는 결정적 응답 생성"""
+    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+    pick = _seed(prompt)
+
+    if "'긍정', '중립', '부정'" in prompt:
+        return ["긍정", "중립", "부정"][pick % 3]
+    if "주제를 한 단어" in prompt:
+        return ["커리어 전환", "파이썬 학습", "포트폴리오", "면접 준비"][pick % 4]
+    if '"relevance"' in prompt:
+        return json.dumps({"relevance": 7, "clarity": 8, "emotion": 7, "comment": "fake evaluation"})
+    if '"score"' in prompt and "피드백" in prompt:
+        return json.dumps({"sentiment": "중립", "score": 0.0}, ensure_ascii=False)
+
+    question = str(messages[-1].get("content", ""))[:80] if messages else ""
+    return f"[fake] '{question}'에 대한 테스트 답변입니다. " + "AI 커리어 전환을 위해 꾸준히 학습하세요. " * 4
+
+
+def _usage(prompt_text: str, completion_text: str) -> dict:
+    prompt_tokens = max(len(prompt_text) // 4, 1)
+    completion_tokens = max(len(completion_text) // 4, 1)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _rate_limited() -> JSONResponse | None:
+    if config["error_rate"] > 0 and random.random() < config["error_rate"]:
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "fake rate limit", "type": "rate_limit_exceeded"}},
+        )
+    return None
+
+
+# -----------------------------------
+# 엔드포인트
+# -----------------------------------
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    error = _rate_limited()
+    if error:
+        return error
+
+    body = await request.json()
+    model = body.get("model", "gpt-4o-mini")
+    messages = body.get("messages", [])
+    text = fake_completion_text(messages)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+
+    # 단어 단위로 토큰 분할 (공백 유지)
+    tokens = [word + " " for word in text.split(" ")]
+    tokens[-1] = tokens[-1].rstrip()
+
+    await asyncio.sleep(sample_latency_seconds())
+
+    if body.get("stream"):
+        async def event_stream():
+            for idx, token in enumerate(tokens):
+                if idx:
+                    await asyncio.sleep(config["token_delay_ms"] / 1000)
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            done = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            }
+            yield f"data: {json.dumps(done)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    await asyncio.sleep(config["token_delay_ms"] * len(tokens) / 1000)
+    prompt_text = "".join(str(m.get("content", "")) for m in messages)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": _usage(prompt_text, text),
+    }
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    error = _rate_limited()
+    if error:
+        return error
+
+    body = await request.json()
+    model = body.get("model", "text-embedding-3-small")
+    dimensions = body.get("dimensions") or EMBEDDING_DIMENSIONS.get(model, 1536)
+    inputs = body.get("input", [])
+    # 단일 문자열 / 단일 토큰 배열도 허용
+    if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+        inputs = [inputs]
+
+    await asyncio.sleep(config["embedding_latency_ms"] / 1000)
+
+    total_tokens = sum(len(i) if isinstance(i, list) else max(len(i) // 4, 1) for i in inputs)
+    return {
+        "object": "list",
+        "model": model,
+        "data": [
+            {"object": "embedding", "index": idx, "embedding": deterministic_embedding(value, dimensions)}
+            for idx, value in enumerate(inputs)
+        ],
+        "usage": {"prompt_tokens": total_tokens, "total_tokens": total_tokens},
+    }
+
+
+@app.get("/v1/models")
+async def list_models():
+    names = ["gpt-4o-mini", *EMBEDDING_DIMENSIONS.keys()]
+    return {"object": "list", "data": [{"id": name, "object": "model", "owned_by": "fake"} for name in names]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 Fake OpenAI 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-median-ms", type=float, default=config["latency_median_ms"],
+                        help="첫 토큰까지 지연 중앙값 (ms)")
+    parser.add_argument("--latency-p95-ms", type=float, default=config["latency_p95_ms"],
+                        help="첫 토큰까지 지연 p95 (ms)")
+    parser.add_argument("--token-delay-ms", type=float, default=config["token_delay_ms"],
+                        help="토큰 간 지연 (ms)")
+    parser.add_argument("--embedding-latency-ms", type=float, default=config["embedding_latency_ms"],
+                        help="임베딩 요청 지연 (ms)")
+    parser.add_argument("--error-rate", type=float, default=config["error_rate"],
+                        help="429 응답 비율 (0.0 ~ 1.0)")
+    parser.add_argument("--seed", type=int, default=None, help="지연 샘플링 난수 시드")
+    args = parser.parse_args()
+
+    config.update({
+        "latency_median_ms": args.latency_median_ms,
+        "latency_p95_ms": args.latency_p95_ms,
+        "token_delay_ms": args.token_delay_ms,
+        "embedding_latency_ms": args.embedding_latency_ms,
+        "error_rate": args.error_rate,
+    })
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    print(f"🤖 Fake OpenAI 서버 시작: http://{args.host}:{args.port}/v1")
+    print(f"   지연: median {args.latency_median_ms}ms / p95 {args.latency_p95_ms}ms, "
+          f"토큰 간 {args.token_delay_ms}ms, 오류율 {args.error_rate:.1%}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 """
 문서 자동 임베딩 & 관리 CLI 유틸 (RAG용)
 -----------------------------------------
-docs/ 폴더의 텍스트 문서를 읽어 Chroma DB에 임베딩하거나,
+docs/ 폴더의 텍스트/마크다운 문서를 청크로 나눠 Chroma DB에 임베딩하거나
+(매니페스트 기준으로 새로 생기거나 바뀐 파일만 임베딩, 삭제된 파일의 벡터는 제거),
 DB를 초기화(--reset), 개수 확인(--count)할 수 있습니다.
 
 실행 예시:
@@ -10,54 +11,30 @@ DB를 초기화(--reset), 개수 확인(--count)할 수 있습니다.
     poetry run python scripts/ingest_docs.py --count
 """
 
-import os
 import sys
-import shutil
 import requests
-from app.services.vectorstore import get_vectorstore
-from app.core.config import settings
+from app.services.collection_alias import active_store_path
+from app.services.ingest_service import ingest_documents, reset_chroma as reset_store
 
-CHROMA_PATH = settings.CHROMA_PATH
-DOCS_PATH = "docs"
 API_URL = "http://127.0.0.1:8000/api/vector-count"
 
 
 def reset_chroma():
-    """기존 Chroma DB 삭제"""
-    if os.path.exists(CHROMA_PATH):
-        shutil.rmtree(CHROMA_PATH)
-        print(f"🧹 기존 Chroma DB 초기화 완료: {CHROMA_PATH}")
-    else:
-        print("ℹ️ 초기화할 Chroma DB가 없습니다. (처음 실행일 수 있습니다.)")
+    """활성 버전의 Chroma DB 삭제 (다른 블루/그린 버전은 유지)"""
+    print(reset_store())
 
 
 def ingest_docs():
-    """docs 폴더 내 모든 .txt 파일을 Chroma에 임베딩"""
-    if not os.path.exists(DOCS_PATH):
-        print(f"❌ {DOCS_PATH}/ 폴더가 없습니다. 먼저 생성해주세요.")
-        return
-
-    txt_files = [f for f in os.listdir(DOCS_PATH) if f.endswith(".txt")]
-    if not txt_files:
-        print(f"⚠️ {DOCS_PATH}/ 폴더에 .txt 문서가 없습니다.")
+    """docs 폴더 내 .txt/.md 파일 중 새로 생기거나 바뀐 파일만 청크 단위로 Chroma에 임베딩"""
+    result = ingest_documents(progress=True)
+    if result["status"] != "success":
+        print(f"⚠️ {result['message']}")
         return
 
-    store = get_vectorstore()
-    print(f"\n📂 총 {len(txt_files)}개 문서를 Chroma에 임베딩합니다...\n")
-
-    for idx, file_name in enumerate(txt_files, 1):
-        file_path = os.path.join(DOCS_PATH, file_name)
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
-
-        print(f"[{idx}/{len(txt_files)}] → 임베딩 중: {file_name}")
-        try:
-            store.add_texts([text], metadatas=[{"source": file_name}])
-        except Exception as e:
-            print(f"⚠️ {file_name} 처리 중 오류 발생: {e}")
-
-    print("\n✅ 모든 문서 임베딩 완료!")
-    print(f"📁 Chroma 경로: {CHROMA_PATH}")
+    for line in result["log"]:
+        print(line)
+    print("\n✅ 문서 임베딩 완료!")
+    print(f"📁 Chroma 경로: {active_store_path()}")
 
 
 def verify_vector_count():
@@ -82,7 +59,7 @@ def show_help():
     print(
         """
 🧠 사용법:
-    poetry run python scripts/ingest_docs.py         # 문서 임베딩
+    poetry run python scripts/ingest_docs.py         # 문서 임베딩 (변경된 파일만)
     poetry run python scripts/ingest_docs.py --reset # 기존 DB 삭제 후 새로 임베딩
     poetry run python scripts/ingest_docs.py --count # 벡터 개수만 확인
 
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+API 부하 테스트 하네스
+-----------------------------------------
+고정 요청률(open-loop)로 주요 엔드포인트를 호출하고 p50/p95/p99 지연, 처리량, 오류율을
+JSON 베이스라인으로 저장합니다. 릴리스 간 베이스라인을 비교(--compare)할 수 있습니다.
+
+실제 토큰을 쓰지 않으려면 API 서버를 fake OpenAI 서버에 연결해서 실행하세요:
+    python scripts/fake_openai_server.py --port 9000
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=sk-fake \\
+        poetry run uvicorn app.main:app --port 8000
+
+실행 예시:
+    python scripts/load_test.py --rate 20 --duration 30
+    python scripts/load_test.py --scenarios rag_chat,chat --rate 50 --unique-questions
+    python scripts/load_test.py --output reports/load_baseline_v2.json --compare reports/load_baseline.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = PROJECT_ROOT / "reports" / "load_baseline.json"
+
+QUESTIONS = [
+    "비전공자가 AI 엔지니어로 전환하려면 무엇부터 공부해야 하나요?",
+    "파이썬 백엔드 개발자가 LLM 서비스를 만들려면 어떤 기술이 필요한가요?",
+    "RAG 프로젝트를 포트폴리오로 준비하는 방법을 알려주세요.",
+    "6개월 안에 AI 커리어 전환이 가능할까요?",
+    "LangChain과 FastAPI를 함께 쓰는 구조를 설명해주세요.",
+    "AI 엔지니어 면접에서 자주 나오는 질문은 무엇인가요?",
+]
+
+# 시나리오 이름 -> (HTTP 메서드, 경로, 요청 본문 생성 함수)
+SCENARIOS = {
+    "chat": ("POST", "/api/chat", lambda q, i: {"question": q}),
+    "rag_chat": ("POST", "/api/rag-chat", lambda q, i: {"question": q}),
+    "personal_chat": ("POST", "/api/personal-chat", lambda q, i: {"question": q, "user_id": f"loadtest-{i % 20}"}),
+    "feedback": ("POST", "/api/feedback", lambda q, i: {"conversation_id": "1", "feedback": "like" if i % 3 else "dislike"}),
+    "insights_stats": ("GET", "/api/insights/stats", None),
+    "insights_topics": ("GET", "/api/insights/topics", None),
+    "insights_sentiment_trend": ("GET", "/api/insights/sentiment-trend", None),
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """nearest-rank 백분위수 (입력은 정렬된 리스트)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def _send(client: httpx.AsyncClient, scenario: str, index: int, question: str, results: list):
+    method, path, body_fn = SCENARIOS[scenario]
+    started = time.perf_counter()
+    status = 0
+    try:
+        if method == "GET":
+            response = await client.get(path)
+        else:
+            response = await client.post(path, json=body_fn(question, index))
+        status = response.status_code
+    except httpx.HTTPError:
+        status = 0  # 연결 오류 / 타임아웃
+    results.append({"latency_ms": (time.perf_counter() - started) * 1000, "status": status})
+
+
+async def run_scenario(
+    base_url: str,
+    scenario: str,
+    rate: float,
+    duration: float,
+    unique_questions: bool,
+    timeout: float,
+) -> dict:
+    """
+    한 시나리오를 고정 요청률로 실행 (응답을 기다리지 않고 일정 간격으로 요청 발사)
+
+    Returns:
+        {"requests", "errors", "error_rate", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "max_ms"}
+    """
+    results: list[dict] = []
+    total = max(int(rate * duration), 1)
+    questions = itertools.cycle(QUESTIONS)
+    limits = httpx.Limits(max_connections=1000, max_keepalive_connections=200)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        tasks = []
+        for i in range(total):
+            delay = started + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            question = next(questions)
+            if unique_questions:
+                question = f"{question} (#{i})"
+            tasks.append(asyncio.create_task(_send(client, scenario, i, question, results)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(r["latency_ms"] for r in results)
+    errors = sum(1 for r in results if r["status"] == 0 or r["status"] >= 400)
+    return {
+        "requests": len(results),
+        "errors": errors,
+        "error_rate": round(errors / len(results), 4),
+        "throughput_rps": round((len(results) - errors) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(latencies[-1], 1),
+    }
+
+
+def print_report(report: dict):
+    print("\n" + "=" * 92)
+    print(f"{'scenario':<26}{'reqs':>7}{'err%':>8}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    print("-" * 92)
+    for name, r in report["scenarios"].items():
+        print(
+            f"{name:<26}{r['requests']:>7}{r['error_rate'] * 100:>7.1f}%{r['throughput_rps']:>9.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}"
+        )
+    print("=" * 92)
+
+
+def print_comparison(current: dict, baseline: dict):
+    """이전 베이스라인 대비 변화율 출력 (지연은 +가 느려짐, 처리량은 +가 좋아짐)"""
+    print(f"\n📊 베이스라인 비교 (기준: {baseline.get('generated_at', '?')})")
+    print(f"{'scenario':<26}{'p50':>10}{'p95':>10}{'p99':>10}{'rps':>10}{'err%':>10}")
+    for name, cur in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            print(f"{name:<26}{'(신규)':>10}")
+            continue
+
+        def change(key):
+            return f"{(cur[key] - base[key]) / base[key] * 100:+.1f}%" if base[key] else "n/a"
+
+        err_diff = (cur["error_rate"] - base["error_rate"]) * 100
+        print(
+            f"{name:<26}{change('p50_ms'):>10}{change('p95_ms'):>10}{change('p99_ms'):>10}"
+            f"{change('throughput_rps'):>10}{err_diff:>+9.1f}p"
+        )
+
+
+async def main_async(args) -> dict:
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        print(f"⚠️ 알 수 없는 시나리오: {', '.join(unknown)} (사용 가능: {', '.join(SCENARIOS)})")
+        sys.exit(1)
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "rate_rps": args.rate,
+        "duration_s": args.duration,
+        "unique_questions": args.unique_questions,
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        print(f"🚀 {scenario}: {args.rate} req/s × {args.duration}s")
+        report["scenarios"][scenario] = await run_scenario(
+            args.base_url, scenario, args.rate, args.duration, args.unique_questions, args.timeout
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 부하 테스트 (고정 요청률)")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"쉼표로 구분한 시나리오 목록 (기본: 전체 - {', '.join(SCENARIOS)})")
+    parser.add_argument("--rate", type=float, default=10.0, help="초당 요청 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="시나리오별 실행 시간 (초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--unique-questions", action="store_true",
+                        help="질문마다 번호를 붙여 캐시/병합 효과를 배제")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="결과 JSON 경로")
+    parser.add_argument("--compare", default=None, help="비교할 이전 베이스라인 JSON 경로")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,83 +8,54 @@
     python scripts/retrain_vectorstore.py
     python scripts/retrain_vectorstore.py --threshold 0.4
     python scripts/retrain_vectorstore.py --force
+    python scripts/retrain_vectorstore.py --rollback
 
 옵션:
     --threshold FLOAT  부정 피드백 임계값 (기본 0.3 = 30%)
     --force            피드백 비율 무시하고 강제로 재학습 실행
     --check-only       재학습 필요 여부만 확인하고 종료
+    --rollback         직전 버전으로 즉시 되돌림 (재학습 없음)
+    --versions         보관 중인 버전과 활성 버전 출력
+
+재학습은 블루/그린 방식입니다. CHROMA_PATH/versions/ 아래 새 버전에 임베딩한 뒤
+별칭 파일을 원자적으로 전환하므로, 실행 중인 API 서버는 재시작 없이 새 버전으로 넘어갑니다.
 """
 
 import sys
-import os
-import shutil
 from datetime import datetime
 from sqlalchemy import text
 from app.database import SessionLocal
 from app.utils.vector_retrain import retrain_if_needed
-from app.services.vectorstore import get_vectorstore
-from app.core.config import settings
+from app.services.collection_alias import get_collection_alias
+from app.services.ingest_service import rebuild_collection, rollback_collection
 from app.utils.slack_notifier import send_slack_message
 
-DOCS_PATH = "docs"
-CHROMA_PATH = settings.CHROMA_PATH
-
 
 def perform_retraining():
     """
-    벡터스토어 재학습 실행
-    - docs/ 폴더의 모든 .txt 문서를 다시 읽어서 임베딩
-    - 기존 Chroma DB는 백업 후 재생성
+    벡터스토어 재학습 실행 (블루/그린)
+    - docs/ 폴더의 모든 .txt/.md 문서를 새 버전 디렉토리에 청크 단위로 임베딩
+    - 모두 성공하면 활성 버전 별칭을 전환 (기존 버전은 롤백용으로 보관)
     """
     print("\n" + "=" * 60)
-    print("🔄 벡터스토어 재학습 시작")
+    print("🔄 벡터스토어 재학습 시작 (블루/그린)")
     print("=" * 60 + "\n")
 
-    # 1. 기존 Chroma DB 백업
-    if os.path.exists(CHROMA_PATH):
-        backup_path = f"{CHROMA_PATH}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        print(f"📦 기존 벡터스토어 백업: {backup_path}")
-        shutil.move(CHROMA_PATH, backup_path)
-        print("✅ 백업 완료\n")
-
-    # 2. 문서 목록 확인
-    if not os.path.exists(DOCS_PATH):
-        print(f"❌ {DOCS_PATH}/ 폴더가 없습니다.")
-        return False
-
-    txt_files = [f for f in os.listdir(DOCS_PATH) if f.endswith(".txt") or f.endswith(".md")]
-    if not txt_files:
-        print(f"⚠️ {DOCS_PATH}/ 폴더에 문서가 없습니다.")
-        return False
-
-    print(f"📂 총 {len(txt_files)}개 문서를 재임베딩합니다...\n")
-
-    # 3. 새로운 벡터스토어 생성 및 임베딩
     try:
-        store = get_vectorstore()
-        success_count = 0
-        error_count = 0
-
-        for idx, file_name in enumerate(txt_files, 1):
-            file_path = os.path.join(DOCS_PATH, file_name)
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    text = f.read()
-
-                print(f"[{idx}/{len(txt_files)}] → 임베딩 중: {file_name}")
-                store.add_texts([text], metadatas=[{"source": file_name}])
-                success_count += 1
-
-            except Exception as e:
-                print(f"⚠️ {file_name} 처리 중 오류: {e}")
-                error_count += 1
-
-        # 4. 결과 요약
+        result = rebuild_collection(progress=True)
+        for line in result.get("log", []):
+            print(line)
+        if not result.get("switched"):
+            print(f"❌ {result.get('message', '새 버전으로 전환하지 않았습니다.')}")
+            return False
+
+        # 결과 요약
         print("\n" + "=" * 60)
         print("✅ 벡터스토어 재학습 완료!")
         print("=" * 60)
-        print(f"📊 성공: {success_count}개, 실패: {error_count}개")
-        print(f"📁 Chroma 경로: {CHROMA_PATH}\n")
+        print(f"📊 성공: {result['added']}개, 실패: {result['failed']}개")
+        print(f"🔀 활성 버전: {result['previous_version']} → {result['version']}")
+        print("↩️  되돌리려면: python scripts/retrain_vectorstore.py --rollback\n")
 
         return True
 
@@ -105,6 +76,18 @@ def main():
         print(__doc__)
         return
 
+    if "--versions" in args:
+        stats = get_collection_alias().stats()
+        for version in stats["versions"]:
+            marker = "▶" if version == stats["active"] else " "
+            print(f"{marker} {version}")
+        return
+
+    if "--rollback" in args:
+        result = rollback_collection()
+        print(f"{'✅' if result['status'] == 'success' else '❌'} {result['message']}")
+        return
+
     if "--force" in args:
         force_retrain = True
         args.remove("--force")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+벡터스토어 블루/그린 별칭 테스트 스크립트 (OpenAI / Chroma 호출 없음)
+
+Usage:
+    python scripts/test_collection_alias.py
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.collection_alias import LEGACY_VERSION, CollectionAlias
+
+
+def _touch_later(path: str):
+    """다른 프로세스가 나중에 쓴 것처럼 mtime을 뒤로 미룸 (같은 시각 단위 안의 연속 전환 방지)"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_switch_and_reload():
+    """별칭이 없으면 레거시, 전환하면 다른 인스턴스(프로세스)도 새 버전을 봄"""
+    print("=" * 80)
+    print("[전환 / 다른 인스턴스 재로드 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as root:
+        alias = CollectionAlias(root)
+        assert alias.active_version() == LEGACY_VERSION
+        assert alias.active_path() == root
+
+        version = alias.create_version()
+        assert os.path.isdir(alias.version_path(version))
+        state = alias.switch(version)
+        assert state == {"active": version, "previous": LEGACY_VERSION, "switched_at": state["switched_at"]}
+        assert alias.active_path() == os.path.join(root, "versions", version)
+
+        other = CollectionAlias(root)
+        assert other.active_version() == version and other.reloads == 0
+
+        newer = alias.create_version()
+        alias.switch(newer)
+        _touch_later(alias.path)
+        assert other.active_version() == newer
+        assert other.reloads == 1
+
+        try:
+            alias.switch("v-missing")
+            raise AssertionError("존재하지 않는 버전으로 전환됨")
+        except ValueError:
+            pass
+        print(f"상태: {other.stats()}")
+    print("[성공] 전환 / 재로드 정상")
+
+
+def test_rollback():
+    """롤백은 직전 버전으로, 다시 롤백하면 원래 버전으로"""
+    print("\n" + "=" * 80)
+    print("[롤백 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as root:
+        alias = CollectionAlias(root)
+        try:
+            alias.rollback()
+            raise AssertionError("이전 버전 없이 롤백됨")
+        except ValueError:
+            pass
+
+        first = alias.create_version()
+        second = alias.create_version()
+        alias.switch(first)
+        alias.switch(second)
+
+        assert alias.rollback()["active"] == first
+        assert alias.rollback()["active"] == second
+        assert alias.stats()["previous"] == first
+    print("[성공] 롤백 정상")
+
+
+def test_prune_keeps_active_and_previous():
+    """prune은 활성 / 직전 버전을 남기고 오래된 버전부터 삭제"""
+    print("\n" + "=" * 80)
+    print("[오래된 버전 정리 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as root:
+        alias = CollectionAlias(root)
+        versions = [alias.create_version() for _ in range(4)]
+        alias.switch(versions[2])
+        alias.switch(versions[3])
+
+        removed = alias.prune(keep=3)
+        assert removed == [versions[0]]
+        assert not os.path.exists(alias.version_path(versions[0]))
+        assert alias.versions() == versions[1:]
+
+        for protected in (versions[3], versions[2], LEGACY_VERSION):
+            try:
+                alias.remove_version(protected)
+                raise AssertionError(f"보호된 버전이 삭제됨: {protected}")
+            except ValueError:
+                pass
+        alias.remove_version(versions[1])
+        assert alias.versions() == versions[2:]
+        print(f"남은 버전: {alias.versions()}")
+    print("[성공] 버전 정리 정상")
+
+
+if __name__ == "__main__":
+    test_switch_and_reload()
+    test_rollback()
+    test_prune_keeps_active_and_previous()
+    print("\n모든 테스트 통과")
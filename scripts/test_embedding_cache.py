@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+디스크 임베딩 캐시 테스트 스크립트 (OpenAI 호출 없음)
+
+Usage:
+    python scripts/test_embedding_cache.py
+"""
+import asyncio
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.embedding_cache import CachedEmbeddings, EmbeddingStore
+
+
+class FakeEmbeddings:
+    """요청된 텍스트를 기록하는 가짜 임베딩 모델"""
+
+    def __init__(self):
+        self.requested = []
+
+    def embed_documents(self, texts):
+        self.requested.extend(texts)
+        return [[float(len(t)), 0.5, -1.0] for t in texts]
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+
+def test_reuse_across_instances():
+    """같은 디렉토리를 여는 다른 인스턴스(재구축 / 다른 프로세스)도 캐시 재사용"""
+    print("=" * 80)
+    print("[캐시 재사용 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake = FakeEmbeddings()
+        first = CachedEmbeddings(fake, "model-a", EmbeddingStore(tmp_dir))
+        vectors = first.embed_documents(["가나", "abc", "가나"])
+        assert fake.requested == ["가나", "abc"]  # 중복 텍스트는 한 번만 요청
+        assert vectors[0] == vectors[2] == [2.0, 0.5, -1.0]
+
+        second = CachedEmbeddings(fake, "model-a", EmbeddingStore(tmp_dir))
+        assert second.embed_query("abc") == [3.0, 0.5, -1.0]
+        assert asyncio.run(second.aembed_documents(["가나", "새 문장"]))[1] == [4.0, 0.5, -1.0]
+        assert fake.requested == ["가나", "abc", "새 문장"]
+
+        # 다른 인스턴스가 추가한 행도 다시 매핑해서 읽음
+        assert first.embed_query("새 문장") == [4.0, 0.5, -1.0]
+        assert fake.requested == ["가나", "abc", "새 문장"]
+
+        stats = first.store.stats()
+        print(f"통계: {stats}")
+        assert stats["size"] == 3 and stats["hits"] == 1
+    print("[성공] 인스턴스 간 캐시 재사용 정상")
+
+
+def test_model_is_part_of_key():
+    """모델이 다르면 별도 항목"""
+    print("\n" + "=" * 80)
+    print("[모델별 키 분리 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = EmbeddingStore(tmp_dir)
+        fake = FakeEmbeddings()
+        CachedEmbeddings(fake, "model-a", store).embed_query("같은 문장")
+        CachedEmbeddings(fake, "model-b", store).embed_query("같은 문장")
+        CachedEmbeddings(fake, "model-a", store).embed_query("같은 문장")
+        assert fake.requested == ["같은 문장", "같은 문장"]
+        assert store.stats()["models"] == {"model-a": 1, "model-b": 1}
+    print("[성공] 모델별 키 분리 정상")
+
+
+def test_async_store_io_off_event_loop():
+    """비동기 메서드는 저장소 조회 / 저장을 이벤트 루프 스레드가 아닌 곳에서 실행"""
+    print("\n" + "=" * 80)
+    print("[비동기 저장소 I/O 스레드 테스트]")
+    print("=" * 80)
+
+    class RecordingStore(EmbeddingStore):
+        def __init__(self, directory):
+            super().__init__(directory)
+            self.threads = []
+
+        def get_many(self, keys):
+            self.threads.append(threading.get_ident())
+            return super().get_many(keys)
+
+        def put_many(self, model, items):
+            self.threads.append(threading.get_ident())
+            super().put_many(model, items)
+
+    async def run(cached):
+        loop_thread = threading.get_ident()
+        vectors = await cached.aembed_documents(["비동기 문장"])
+        return loop_thread, vectors
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = RecordingStore(tmp_dir)
+        loop_thread, vectors = asyncio.run(run(CachedEmbeddings(FakeEmbeddings(), "model-a", store)))
+        assert vectors == [[6.0, 0.5, -1.0]]
+        assert len(store.threads) == 2 and loop_thread not in store.threads
+    print("[성공] 저장소 I/O가 이벤트 루프 밖에서 실행")
+
+
+if __name__ == "__main__":
+    test_reuse_across_instances()
+    test_model_is_part_of_key()
+    test_async_store_io_off_event_loop()
+    print("\n모든 테스트 통과")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+연합 검색 병합 테스트 스크립트 (OpenAI / Chroma 호출 없음)
+
+가짜 컬렉션(고정된 코사인 유사도 결과)으로 FederatedRetriever의 병합 순서를 확인합니다.
+
+Usage:
+    python scripts/test_federated_retriever.py
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.documents import Document
+
+from app.services.federated_retriever import CollectionSource, FederatedRetriever
+
+
+def _doc(name: str, tokens: int = 100) -> Document:
+    return Document(page_content=name, metadata={"tokens": tokens})
+
+
+def _source(name: str, results: list[tuple[str, float]], quota: int, **kwargs) -> CollectionSource:
+    return CollectionSource(name, lambda query, vector, k: [(_doc(n), s) for n, s in results], quota, **kwargs)
+
+
+def _retriever(docs, conversations, token_budget: int = 1600) -> FederatedRetriever:
+    return FederatedRetriever(
+        [
+            _source("docs", docs, quota=3, required=True),
+            _source("conversations", conversations, quota=2, weight=0.8, min_score=0.5),
+        ],
+        token_budget=token_budget,
+        timeout_ms=1000,
+    )
+
+
+def test_low_relevance_conversation_dropped():
+    """먼 대화(코사인 0.02)는 최소 유사도 미만으로 제외, 문서 청크보다 앞서지 않음"""
+    print("=" * 80)
+    print("[최소 유사도 테스트]")
+    print("=" * 80)
+
+    retriever = _retriever(
+        docs=[("d1", 0.62), ("d2", 0.55), ("d3", 0.41)],
+        conversations=[("c1", 0.71), ("c2", 0.02)],
+    )
+    selected = [doc.page_content for doc in retriever.search("질문", [0.0])]
+    print(f"결과: {selected}")
+    assert selected == ["d1", "c1", "d2", "d3"]  # c1: 0.8 × 0.71 = 0.568
+
+    stats = retriever.stats()["collections"]["conversations"]
+    assert stats["returned"] == 2 and stats["below_min"] == 1 and stats["selected"] == 1
+    print("[성공] 최소 유사도 미만 대화 제외")
+
+
+def test_single_result_keeps_absolute_score():
+    """결과가 1개뿐이어도 1.0으로 올리지 않고 절대 유사도로 문서와 비교"""
+    print("\n" + "=" * 80)
+    print("[절대 척도 비교 테스트]")
+    print("=" * 80)
+
+    # 대화 0.8 × 0.55 = 0.44 < d2 0.58: 예산(2개)은 문서 두 개로 채워짐
+    retriever = _retriever(
+        docs=[("d1", 0.64), ("d2", 0.58), ("d3", 0.30)],
+        conversations=[("c1", 0.55)],
+        token_budget=250,
+    )
+    selected = [doc.page_content for doc in retriever.search("질문", [0.0])]
+    print(f"결과: {selected}")
+    assert selected == ["d1", "d2"]
+
+    # 대화가 더 가까우면 가중치를 곱해도 앞섬
+    retriever = _retriever(docs=[("d1", 0.52), ("d2", 0.50)], conversations=[("c1", 0.90)], token_budget=250)
+    assert [doc.page_content for doc in retriever.search("질문", [0.0])] == ["c1", "d1"]
+    print("[성공] 컬렉션 간 절대 유사도 비교 정상")
+
+
+def test_optional_failure_and_duplicates():
+    """보조 컬렉션이 실패하면 문서만, 같은 본문은 한 번만"""
+    print("\n" + "=" * 80)
+    print("[보조 컬렉션 실패 / 중복 테스트]")
+    print("=" * 80)
+
+    def broken(query, vector, k):
+        raise RuntimeError("컬렉션 없음")
+
+    retriever = FederatedRetriever(
+        [
+            _source("docs", [("d1", 0.7), ("d1", 0.7), ("d2", 0.6)], quota=3, required=True),
+            CollectionSource("conversations", broken, quota=2, min_score=0.5),
+        ],
+        token_budget=1600,
+        timeout_ms=1000,
+    )
+    selected = [doc.page_content for doc in retriever.search("질문", [0.0])]
+    assert selected == ["d1", "d2"]
+    assert retriever.stats()["collections"]["conversations"]["errors"] == 1
+    print("[성공] 실패 / 중복 처리 정상")
+
+
+if __name__ == "__main__":
+    test_low_relevance_conversation_dropped()
+    test_single_result_keeps_absolute_score()
+    test_optional_failure_and_duplicates()
+    print("\n모든 테스트 통과")
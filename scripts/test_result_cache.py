@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+LLM 분석 결과 캐시 테스트 스크립트 (OpenAI 호출 없음)
+
+Usage:
+    python scripts/test_result_cache.py
+"""
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services import result_cache
+from app.services.result_cache import ResultCache, cached_result, make_key
+
+
+def test_lru_eviction():
+    """최대 항목 초과 시 가장 오래 사용되지 않은 항목부터 제거"""
+    print("=" * 80)
+    print("[LRU 제거 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResultCache(str(Path(tmp_dir) / "result_cache.sqlite3"), max_entries=2)
+        cache.put("f", "a", {"v": 1})
+        cache.put("f", "b", {"v": 2})
+        assert cache.get("f", "a") == {"v": 1}  # a 사용 → b가 가장 오래됨
+        cache.put("f", "c", {"v": 3})
+
+        assert cache.get("f", "b") is result_cache._MISS
+        assert cache.get("f", "c") == {"v": 3}
+
+        stats = cache.stats()
+        print(f"통계: {stats}")
+        assert stats["size"] <= 2 and stats["evictions"] >= 1
+        assert stats["functions"]["f"]["hits"] == 2
+        print("[성공] LRU 제거 정상")
+
+
+def test_batch_get_put():
+    """여러 키를 한 번에 조회 / 저장, 적중 사용 시각은 모아서 기록"""
+    print("\n" + "=" * 80)
+    print("[일괄 조회 / 저장 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResultCache(str(Path(tmp_dir) / "result_cache.sqlite3"), max_entries=100)
+        cache.put_many("f", {"a": {"v": 1}, "b": {"v": 2}})
+
+        assert cache.get_many("f", ["a", "b", "c"]) == {"a": {"v": 1}, "b": {"v": 2}}
+        assert set(cache._touched) == {"a", "b"}  # 조회 시에는 UPDATE 없이 메모리에만 기록
+
+        stats = cache.stats()
+        assert not cache._touched
+        assert stats["functions"]["f"]["hits"] == 2 and stats["functions"]["f"]["misses"] == 1
+        assert stats["functions"]["f"]["stores"] == 2
+        print(f"통계: {stats['functions']}")
+        print("[성공] 일괄 조회 / 저장 정상")
+
+
+def test_decorator_sync_async_and_versioning():
+    """동기/비동기 함수가 같은 이름이면 결과 공유, 버전이 다르면 다른 키"""
+    print("\n" + "=" * 80)
+    print("[데코레이터 / 버전 테스트]")
+    print("=" * 80)
+
+    calls = []
+
+    @cached_result("test.echo", "v1", "fake-model", key_args=("text",))
+    def echo(text, deadline=None):
+        calls.append(text)
+        return text.upper()
+
+    @cached_result("test.echo", "v1", "fake-model", key_args=("text",))
+    async def aecho(text, deadline=None):
+        calls.append(text)
+        return text.upper()
+
+    @cached_result("test.echo", "v1", "fake-model", key_args=("text",), should_cache=lambda r: False)
+    def never_cached(text):
+        calls.append(text)
+        return text
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResultCache(str(Path(tmp_dir) / "result_cache.sqlite3"), max_entries=100)
+        original = result_cache.get_result_cache
+        result_cache.get_result_cache = lambda: cache
+        try:
+            assert echo("hello") == "HELLO"
+            assert echo("hello", deadline=object()) == "HELLO"  # deadline은 키에서 제외
+            assert asyncio.run(aecho("hello")) == "HELLO"
+            assert calls == ["hello"]
+
+            never_cached("skip")
+            never_cached("skip")
+            assert calls.count("skip") == 2
+        finally:
+            result_cache.get_result_cache = original
+
+    assert make_key("f", "v1", "m", ["x"]) != make_key("f", "v2", "m", ["x"])
+    print(f"통계: {cache.stats()['functions']}")
+    print("[성공] 데코레이터 캐싱 / 버전 분리 정상")
+
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_batch_get_put()
+    test_decorator_sync_async_and_versioning()
+    print("\n모든 테스트 통과")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+시맨틱 캐시 테스트 스크립트 (OpenAI 호출 없음)
+
+Usage:
+    python scripts/test_semantic_cache.py
+"""
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.semantic_cache import SemanticCache
+
+
+def _make_cache(tmp_dir: str, **kwargs) -> SemanticCache:
+    options = {"threshold": 0.95, "ttl_seconds": 3600, "max_entries": 2}
+    options.update(kwargs)
+    return SemanticCache(path=str(Path(tmp_dir) / "semantic_cache.npz"), **options)
+
+
+def test_hit_and_miss():
+    """유사한 벡터는 적중, 다른 벡터는 미스"""
+    print("=" * 80)
+    print("[적중/미스 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir)
+        cache.put("AI 엔지니어가 되려면?", [1.0, 0.0, 0.0], "파이썬부터 시작하세요.")
+
+        assert cache.lookup([0.99, 0.01, 0.0]) == "파이썬부터 시작하세요."
+        assert cache.lookup([0.0, 1.0, 0.0]) is None
+
+        stats = cache.stats()
+        print(f"통계: {stats}")
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        print("[성공] 적중/미스 판단 정상")
+
+
+def test_lru_eviction_and_ttl():
+    """최대 항목 초과 시 LRU 제거, TTL 만료 시 미스"""
+    print("\n" + "=" * 80)
+    print("[LRU 제거 / TTL 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir)
+        cache.put("q1", [1.0, 0.0, 0.0], "a1")
+        cache.put("q2", [0.0, 1.0, 0.0], "a2")
+        cache.lookup([1.0, 0.0, 0.0])  # q1 최근 사용 처리
+        cache.put("q3", [0.0, 0.0, 1.0], "a3")  # q2 제거 대상
+
+        assert cache.lookup([0.0, 1.0, 0.0]) is None
+        assert cache.lookup([1.0, 0.0, 0.0]) == "a1"
+        assert cache.stats()["evictions"] == 1
+
+        expired = _make_cache(tmp_dir, ttl_seconds=-1)
+        expired.put("q", [1.0, 0.0, 0.0], "a")
+        assert expired.lookup([1.0, 0.0, 0.0]) is None
+        assert expired.stats()["expirations"] == 1
+        print("[성공] LRU 제거 및 TTL 만료 정상")
+
+
+def test_persistence_and_invalidation():
+    """flush 후 재로드, invalidate 후 전체 무효화"""
+    print("\n" + "=" * 80)
+    print("[저장 / 무효화 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir)
+        cache.put("q1", [1.0, 0.0, 0.0], "a1")
+        cache.flush()
+
+        reloaded = _make_cache(tmp_dir)
+        assert reloaded.lookup([1.0, 0.0, 0.0]) == "a1"
+
+        reloaded.invalidate()
+        assert reloaded.lookup([1.0, 0.0, 0.0]) is None
+        # 다른 인스턴스(워커)도 버전 파일 변경을 감지해야 함
+        assert cache.lookup([1.0, 0.0, 0.0]) is None
+        print("[성공] 저장/재로드 및 무효화 전파 정상")
+
+
+def test_save_runs_off_caller_thread():
+    """put()은 스냅샷 파일 쓰기를 호출한 스레드(이벤트 루프)에서 실행하지 않음"""
+    print("\n" + "=" * 80)
+    print("[백그라운드 저장 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir)
+        write_threads = []
+        write = cache._write
+
+        def recording_write(snapshot):
+            write_threads.append(threading.get_ident())
+            write(snapshot)
+
+        cache._write = recording_write
+        cache.put("q1", [1.0, 0.0, 0.0], "a1")
+        cache._save_thread.join()
+        assert write_threads and threading.get_ident() not in write_threads
+        assert _make_cache(tmp_dir).lookup([1.0, 0.0, 0.0]) == "a1"
+
+        # 저장 중 invalidate되면 이전 스냅샷으로 파일을 되살리지 않음
+        with cache._lock:
+            snapshot = cache._snapshot()
+        cache.invalidate()
+        write(snapshot)
+        assert _make_cache(tmp_dir).lookup([1.0, 0.0, 0.0]) is None
+        print("[성공] 스냅샷 저장이 백그라운드 스레드에서 실행")
+
+
+if __name__ == "__main__":
+    test_hit_and_miss()
+    test_lru_eviction_and_ttl()
+    test_persistence_and_invalidation()
+    test_save_runs_off_caller_thread()
+    print("\n[테스트 완료]")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+로컬 감정 분류기 테스트 스크립트 (OpenAI 호출 없음)
+
+Usage:
+    python scripts/test_sentiment_classifier.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.sentiment_classifier import NaiveBayesModel, SentimentClassifier, lexicon_score
+
+SAMPLES = [
+    ("정말 좋아요 감사합니다", "긍정"),
+    ("최고예요 너무 만족스러워요", "긍정"),
+    ("별로예요 실망했어요", "부정"),
+    ("최악이에요 짜증나요", "부정"),
+    ("파이썬 공식 문서를 참고하세요", "중립"),
+    ("다음 단계는 프로젝트 설계입니다", "중립"),
+] * 5
+
+
+def test_lexicon_negation():
+    """감정어 앞뒤의 부정 표현은 극성을 반전"""
+    print("=" * 80)
+    print("[감정 사전 / 부정 표현 테스트]")
+    print("=" * 80)
+
+    assert lexicon_score("정말 도움이 됐어요 감사합니다") == (2, 0)
+    assert lexicon_score("별로 좋지 않아요") == (0, 2)
+    assert lexicon_score("안좋아요") == (0, 1)
+    assert lexicon_score("안녕하세요 안내 부탁드려요") == (0, 0)
+    assert lexicon_score("정말 안 좋아요") == (0, 1)
+    # 단어 끝의 "안" / "못"은 부정어가 아님
+    assert lexicon_score("제안 좋아요") == (1, 0)
+    assert lexicon_score("방안 좋네요") == (1, 0)
+    assert lexicon_score("편안 좋아요") == (1, 0)
+    assert lexicon_score("그동안 좋았어요") == (1, 0)
+    assert lexicon_score("연못 좋아요") == (1, 0)
+    print("[성공] 부정 표현 반전 및 오탐 방지 정상")
+
+
+def test_cascade_and_stats():
+    """확신도가 높으면 로컬 결과, 빈 입력은 LLM 위임"""
+    print("\n" + "=" * 80)
+    print("[캐스케이드 / 통계 테스트]")
+    print("=" * 80)
+
+    classifier = SentimentClassifier(NaiveBayesModel.train(SAMPLES), threshold=0.9)
+
+    assert classifier.classify("너무 좋아요 감사합니다").label == "긍정"
+    assert classifier.classify("실망스럽고 최악이에요").label == "부정"
+    assert classifier.classify("") is None
+
+    stats = classifier.stats()
+    print(f"통계: {stats}")
+    assert stats["local"] >= 2
+    print("[성공] 로컬 처리 / 위임 집계 정상")
+
+
+def test_lexicon_only_threshold():
+    """모델이 없으면 감정 사전만으로 판단하고, 약한 신호는 위임"""
+    print("\n" + "=" * 80)
+    print("[감정 사전 단독 모드 테스트]")
+    print("=" * 80)
+
+    classifier = SentimentClassifier(None, threshold=0.85)
+    assert classifier.classify("좋아요") is None  # 매칭 1개 → 확신도 0.5
+    assert classifier.classify("최고예요 정말 좋고 감사하고 만족해요").label == "긍정"
+    print("[성공] 감정 사전 단독 모드 정상")
+
+
+def test_model_roundtrip():
+    """모델 저장/로드 후 같은 확률"""
+    print("\n" + "=" * 80)
+    print("[모델 저장 / 로드 테스트]")
+    print("=" * 80)
+
+    model = NaiveBayesModel.train(SAMPLES)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / "sentiment_nb.json")
+        model.save(path)
+        loaded = NaiveBayesModel.load(path)
+
+    text = "감사합니다 도움이 됐어요"
+    assert loaded.predict_proba(text) == model.predict_proba(text)
+    print("[성공] 저장/로드 후 예측 동일")
+
+
+if __name__ == "__main__":
+    test_lexicon_negation()
+    test_cascade_and_stats()
+    test_lexicon_only_threshold()
+    test_model_roundtrip()
+    print("\n모든 테스트 통과")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+문서 청킹 테스트 스크립트 (OpenAI 호출 없음)
+
+Usage:
+    python scripts/test_text_splitter.py
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.text_splitter import count_tokens, split_document, split_sections
+
+DOC = """# 설치 가이드
+
+## 요구 사항
+Python 3.11 이상이 필요합니다.
+
+```bash
+# 패키지 설치
+pip install -r requirements.txt
+```
+
+## 실행
+""" + "서버를 실행하고 API 문서를 확인합니다. " * 60
+
+
+def test_sections():
+    """제목 경로 생성, 코드 블록 주석 / 본문 없는 제목 무시"""
+    print("=" * 80)
+    print("[섹션 분할 테스트]")
+    print("=" * 80)
+
+    titles = [title for title, _, _ in split_sections(DOC)]
+    print(f"섹션: {titles}")
+    assert titles == ["설치 가이드 > 요구 사항", "설치 가이드 > 실행"]
+    print("[성공] 섹션 분할 정상")
+
+
+def test_chunk_limits_and_offsets():
+    """청크는 토큰 한도 이내, offset은 원문 위치와 일치, 섹션 경계를 넘지 않음"""
+    print("\n" + "=" * 80)
+    print("[청크 한도 / offset 테스트]")
+    print("=" * 80)
+
+    chunks = split_document(DOC, "guide.md", chunk_tokens=120, overlap_tokens=20)
+    for chunk in chunks:
+        assert chunk.tokens <= 120
+        assert DOC[chunk.offset:chunk.offset + len(chunk.text)] == chunk.text
+    assert "pip install" in chunks[0].text and chunks[0].section.endswith("요구 사항")
+    assert all(c.section.endswith("실행") for c in chunks[1:])
+
+    # 이웃 청크는 겹침 구간을 공유
+    second, third = chunks[1], chunks[2]
+    assert third.offset < second.offset + len(second.text)
+
+    print(f"청크 {len(chunks)}개, 메타데이터 예시: {chunks[0].metadata}")
+    print("[성공] 청크 한도 / offset / 겹침 정상")
+
+
+def test_long_token_without_separator():
+    """구분자 없는 긴 문자열도 한도 안으로 분할"""
+    print("\n" + "=" * 80)
+    print("[구분자 없는 입력 테스트]")
+    print("=" * 80)
+
+    text = "가" * 500
+    chunks = split_document(text, "blob.txt", chunk_tokens=100, overlap_tokens=0)
+    assert all(count_tokens(c.text) <= 100 for c in chunks)
+    assert "".join(c.text for c in chunks) == text
+    assert split_document("   ", "empty.txt") == []
+    print("[성공] 글자 단위 분할 / 빈 입력 정상")
+
+
+if __name__ == "__main__":
+    test_sections()
+    test_chunk_limits_and_offsets()
+    test_long_token_without_separator()
+    print("\n모든 테스트 통과")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+중복 벡터 탐색 / 압축 보고 테스트 스크립트 (OpenAI / Chroma 호출 없음)
+
+Usage:
+    python scripts/test_vector_compaction.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.vector_compaction import _compact, find_duplicates
+
+
+class FakeCollection:
+    """Chroma 컬렉션 대신 쓰는 메모리 컬렉션 (get / count / query / delete만 구현)"""
+
+    def __init__(self, ids, documents, embeddings):
+        self.ids, self.documents, self.embeddings = list(ids), list(documents), list(embeddings)
+
+    def count(self):
+        return len(self.ids)
+
+    def get(self, limit, offset, include):
+        end = offset + limit
+        return {"ids": self.ids[offset:end], "documents": self.documents[offset:end],
+                "embeddings": self.embeddings[offset:end]}
+
+    def query(self, query_embeddings, n_results, include):
+        return {"ids": [self.ids[:n_results]]}
+
+    def delete(self, ids):
+        keep = [i for i, item_id in enumerate(self.ids) if item_id not in set(ids)]
+        self.ids = [self.ids[i] for i in keep]
+        self.documents = [self.documents[i] for i in keep]
+        self.embeddings = [self.embeddings[i] for i in keep]
+
+
+def test_exact_and_near_duplicates():
+    """같은 해시는 완전 중복, 임계값 이상 유사한 벡터는 근접 중복 (앞쪽 행 유지)"""
+    print("=" * 80)
+    print("[완전 / 근접 중복 테스트]")
+    print("=" * 80)
+
+    embeddings = np.array([
+        [1.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        [1.0, 0.0, 0.0],    # 0과 본문이 같음
+        [0.999, 0.01, 0.0],  # 0과 거의 같음
+        [0.0, 0.0, 1.0],
+    ], dtype=np.float32)
+    hashes = ["a", "b", "a", "c", "d"]
+
+    duplicates = find_duplicates(hashes, embeddings, threshold=0.98)
+    print(f"결과: {duplicates}")
+    assert duplicates == {2: (0, "exact"), 3: (0, "near")}
+    print("[성공] 완전 / 근접 중복 구분 정상")
+
+
+def test_blocks_match_single_pass():
+    """블록 크기와 관계없이 같은 결과, 중복 묶음은 대표 1개만 남김"""
+    print("\n" + "=" * 80)
+    print("[블록 행렬 곱 테스트]")
+    print("=" * 80)
+
+    rng = np.random.default_rng(0)
+    base = rng.standard_normal((20, 16)).astype(np.float32)
+    # 행 20~39: 앞 20개 벡터에 작은 잡음을 더한 근접 중복
+    embeddings = np.vstack([base, base + rng.normal(0, 0.01, base.shape).astype(np.float32)])
+    hashes = [str(i) for i in range(len(embeddings))]
+
+    single = find_duplicates(hashes, embeddings, threshold=0.99, block_size=1024)
+    blocked = find_duplicates(hashes, embeddings, threshold=0.99, block_size=7)
+    assert single == blocked
+    assert sorted(single) == list(range(20, 40))
+    assert all(kept == row - 20 for row, (kept, _) in single.items())
+    print(f"[성공] 근접 중복 {len(single)}개, 블록 크기 7 / 1024 결과 일치")
+
+
+def test_chain_keeps_representatives():
+    """A~B, B~C지만 A≁C이면 B만 삭제 (삭제된 행은 비교 대상에서 제외)"""
+    print("\n" + "=" * 80)
+    print("[연쇄 유사 테스트]")
+    print("=" * 80)
+
+    angles = np.radians([0.0, 10.0, 20.0])
+    embeddings = np.stack([np.cos(angles), np.sin(angles)], axis=1).astype(np.float32)
+    duplicates = find_duplicates(["a", "b", "c"], embeddings, threshold=0.98)  # cos(10°) ≈ 0.985
+    assert duplicates == {1: (0, "near")}
+    print("[성공] 연쇄 유사 벡터 처리 정상")
+
+
+def test_dry_run_reports_nothing_reclaimed():
+    """dry-run은 중복만 보고하고 삭제 수 / 회수 바이트는 0"""
+    print("\n" + "=" * 80)
+    print("[dry-run 보고 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        collection = FakeCollection(
+            ["c1", "c2", "c3"], ["같은 본문", "같은 본문", "다른 본문"],
+            [[1.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+        )
+        store = SimpleNamespace(_collection=collection)
+        report = _compact(store, tmp_dir, "conversation_retrained", 0.98, 1024, dry_run=True, vacuum=False)
+        assert report["exact_duplicates"] == 1
+        assert report["removed"] == 0 and report["vector_bytes_reclaimed"] == 0
+        assert collection.count() == 3
+
+        report = _compact(store, tmp_dir, "conversation_retrained", 0.98, 1024, dry_run=False, vacuum=False)
+        assert report["removed"] == 1 and report["vector_bytes_reclaimed"] == 3 * 4
+        assert collection.ids == ["c1", "c3"]
+    print("[성공] dry-run은 회수량 0으로 보고")
+
+
+if __name__ == "__main__":
+    test_exact_and_near_duplicates()
+    test_blocks_match_single_pass()
+    test_chain_keeps_representatives()
+    test_dry_run_reports_nothing_reclaimed()
+    print("\n[테스트 완료]")
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+대화 벡터스토어 증분 재학습 테스트 스크립트 (OpenAI 호출 없음)
+
+임시 sqlite DB와 임시 Chroma 디렉토리, 가짜 임베딩 모델로 app/vector_retrain.py를 실행합니다.
+
+Usage:
+    python scripts/test_vector_retrain.py
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# vector_retrain은 import 시점에 환경 변수를 읽으므로 먼저 임시 경로로 설정
+_BOOTSTRAP_DIR = tempfile.mkdtemp(prefix="retrain_test_")
+os.environ["OPENAI_API_KEY"] = os.environ.get("OPENAI_API_KEY") or "sk-test"
+os.environ["DATABASE_URL"] = f"sqlite:///{_BOOTSTRAP_DIR}/bootstrap.db"
+os.environ["CHROMA_PATH"] = f"{_BOOTSTRAP_DIR}/chroma"
+
+from langchain_chroma import Chroma
+from sqlalchemy import create_engine
+
+from app import vector_retrain
+from app.services.vector_compaction import record_compacted_ids
+
+SCHEMA = """
+CREATE TABLE conversation_log (
+    id INTEGER PRIMARY KEY, question TEXT, answer TEXT, sentiment TEXT, topic TEXT, created_at TEXT
+);
+CREATE TABLE feedback_log (id INTEGER PRIMARY KEY, conversation_id INTEGER, feedback TEXT);
+CREATE TABLE conversation_evaluation (conversation_id INTEGER, relevance REAL, clarity REAL, evaluated_at TEXT);
+"""
+
+
+class FakeEmbeddings:
+    """텍스트로 만든 결정적 벡터 (fail_marker가 든 텍스트가 있는 배치는 실패)"""
+
+    def __init__(self):
+        self.fail_marker = None
+        self.requested = []
+
+    def embed_documents(self, texts):
+        if self.fail_marker and any(self.fail_marker in t for t in texts):
+            raise RuntimeError("임베딩 실패")
+        self.requested.extend(texts)
+        return [[float(len(t)), 1.0, (sum(map(ord, t)) % 97) / 97] for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class RetrainEnv:
+    """테스트 1개용 임시 DB / Chroma 디렉토리 (vector_retrain 모듈 설정을 교체)"""
+
+    def __init__(self, tmp_dir: str):
+        self.db = sqlite3.connect(Path(tmp_dir) / "test.db")
+        self.db.executescript(SCHEMA)
+        self.fake = FakeEmbeddings()
+        vector_retrain.engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'test.db'}")
+        vector_retrain.CHROMA_PATH = str(Path(tmp_dir) / "chroma")
+        vector_retrain.settings.RETRAIN_CHUNK_ROWS = 2
+        vector_retrain.get_embeddings = lambda *args, **kwargs: self.fake
+        vector_retrain.cached_embeddings = lambda embeddings, model: embeddings
+
+    def add_conversations(self, ids, question="질문"):
+        self.db.executemany(
+            "INSERT INTO conversation_log VALUES (?, ?, ?, '중립', '취업', '2025-10-01 10:00:00')",
+            [(i, f"{question} {i}", f"답변 {i}") for i in ids],
+        )
+        self.db.commit()
+
+    def feedback(self, conversation_id: int, value: str):
+        self.db.execute("INSERT INTO feedback_log (conversation_id, feedback) VALUES (?, ?)", (conversation_id, value))
+        self.db.commit()
+
+    def evaluate(self, conversation_id: int, score: float, evaluated_at: str):
+        self.db.execute(
+            "INSERT INTO conversation_evaluation VALUES (?, ?, ?, ?)", (conversation_id, score, score, evaluated_at)
+        )
+        self.db.commit()
+
+    def collection(self):
+        return Chroma(
+            collection_name=vector_retrain.COLLECTION_NAME,
+            embedding_function=self.fake,
+            persist_directory=vector_retrain.CHROMA_PATH,
+        )._collection
+
+    def indexed(self) -> set[str]:
+        return set(self.collection().get(include=[])["ids"])
+
+    def watermark(self) -> dict:
+        with open(vector_retrain._watermark_path(), encoding="utf-8") as f:
+            return json.load(f)
+
+
+def test_resume_after_failed_batch():
+    """실패한 배치 직전까지만 워터마크 전진, 다음 실행에서 그 뒤부터 이어서 처리"""
+    print("=" * 80)
+    print("[실패 배치 재개 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        env = RetrainEnv(tmp_dir)
+        env.add_conversations([1, 2])
+        env.add_conversations([3, 4], question="실패")
+        for cid in (1, 2, 3, 4):
+            env.feedback(cid, "like")
+
+        env.fake.fail_marker = "실패"
+        result = vector_retrain.retrain_vectorstore()
+        assert result["indexed"] == 2 and result["failed"] == 2
+        assert result["watermark"] == 2
+        assert env.indexed() == {"conv-1", "conv-2"}
+        # 실패가 있으면 피드백 워터마크는 전진하지 않음
+        assert env.watermark()["last_id"] == 2 and env.watermark()["last_feedback_id"] == 0
+
+        env.fake.fail_marker = None
+        result = vector_retrain.retrain_vectorstore()
+        assert result["indexed"] == 2 and result["failed"] == 0
+        assert result["watermark"] == 4
+        assert env.indexed() == {"conv-1", "conv-2", "conv-3", "conv-4"}
+        assert env.watermark()["last_feedback_id"] == 4
+    print("[성공] 실패 배치 이후부터 재개 정상")
+
+
+def test_idempotent_rerun():
+    """변경이 없으면 다시 실행해도 임베딩 / 추가 / 제거 없음"""
+    print("\n" + "=" * 80)
+    print("[재실행 멱등성 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        env = RetrainEnv(tmp_dir)
+        env.add_conversations([1, 2, 3])
+        env.feedback(1, "like")
+        env.evaluate(2, 9, "2025-10-02 09:00:00")
+        env.evaluate(3, 3, "2025-10-02 09:00:00")
+
+        first = vector_retrain.retrain_vectorstore()
+        assert first["indexed"] == 2 and first["skipped"] == 1
+        requested = len(env.fake.requested)
+
+        second = vector_retrain.retrain_vectorstore()
+        assert (second["indexed"], second["skipped"], second["evicted"], second["failed"]) == (0, 0, 0, 0)
+        assert len(env.fake.requested) == requested
+        assert env.indexed() == {"conv-1", "conv-2"}
+        assert second["after"]["size"] == 2
+    print("[성공] 재실행 시 변경 없음")
+
+
+def test_reconcile_after_new_signals():
+    """워터마크 이후 dislike는 제거, 새 높은 평가는 추가 (이전 평가는 다시 판정하지 않음)"""
+    print("\n" + "=" * 80)
+    print("[새 피드백 / 평가 재판정 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        env = RetrainEnv(tmp_dir)
+        env.add_conversations([1, 2, 3, 4])
+        for cid in (1, 2, 3):
+            env.feedback(cid, "like")
+        vector_retrain.retrain_vectorstore()
+        assert env.indexed() == {"conv-1", "conv-2", "conv-3"}
+
+        env.feedback(2, "dislike")
+        env.evaluate(4, 9, "2025-10-03 09:00:00")
+        result = vector_retrain.retrain_vectorstore()
+        assert result["evicted"] == 1 and result["indexed"] == 1
+        assert env.indexed() == {"conv-1", "conv-3", "conv-4"}
+        assert env.watermark()["last_evaluated_at"] == "2025-10-03 09:00:00"
+
+        # 워터마크 이전 평가만 있으면 재판정 대상이 아님 (직접 지운 벡터가 되살아나지 않음)
+        env.collection().delete(ids=["conv-4"])
+        result = vector_retrain.retrain_vectorstore()
+        assert result["indexed"] == 0
+        assert env.indexed() == {"conv-1", "conv-3"}
+    print("[성공] 변경된 대화만 재판정")
+
+
+def test_full_run_purges_stale_vectors():
+    """--full은 워터마크를 무시하고, 선별되지 않은 기존 벡터를 정리한 뒤 다시 반영"""
+    print("\n" + "=" * 80)
+    print("[전체 재실행 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        env = RetrainEnv(tmp_dir)
+        env.add_conversations([1, 2])
+        env.feedback(1, "like")
+        vector_retrain.retrain_vectorstore()
+
+        env.collection().upsert(
+            ids=["conv-99"], embeddings=[[1.0, 1.0, 1.0]], documents=["이전 방식으로 추가된 대화"],
+            metadatas=[{"source": "conversation_log"}],
+        )
+        result = vector_retrain.retrain_vectorstore(full=True)
+        assert result["indexed"] == 1 and result["watermark"] == 2
+        assert env.indexed() == {"conv-1"}
+    print("[성공] 전체 재실행 정리 정상")
+
+
+def test_compacted_vectors_stay_removed():
+    """중복 압축으로 삭제된 대화는 새 피드백 재판정 / --full에서도 다시 추가하지 않음"""
+    print("\n" + "=" * 80)
+    print("[압축 삭제 유지 테스트]")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        env = RetrainEnv(tmp_dir)
+        env.add_conversations([1, 2, 3])
+        for cid in (1, 2, 3):
+            env.feedback(cid, "like")
+        vector_retrain.retrain_vectorstore()
+
+        # compact_collection이 conv-2를 conv-1의 근접 중복으로 삭제한 상태
+        env.collection().delete(ids=["conv-2"])
+        record_compacted_ids(["conv-2"], vector_retrain.CHROMA_PATH)
+
+        env.feedback(2, "like")
+        result = vector_retrain.retrain_vectorstore()
+        assert result["indexed"] == 0
+        assert env.indexed() == {"conv-1", "conv-3"}
+
+        result = vector_retrain.retrain_vectorstore(full=True)
+        assert result["indexed"] == 2 and result["skipped"] == 1
+        assert env.indexed() == {"conv-1", "conv-3"}
+    print("[성공] 압축으로 삭제한 벡터 유지")
+
+
+if __name__ == "__main__":
+    test_resume_after_failed_batch()
+    test_idempotent_rerun()
+    test_reconcile_after_new_signals()
+    test_full_run_purges_stale_vectors()
+    test_compacted_vectors_stay_removed()
+    print("\n모든 테스트 통과")
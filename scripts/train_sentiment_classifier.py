@@ -0,0 +1,145 @@
+"""
+로컬 감정 분류기 학습 + 보정 스크립트
+-----------------------------------------
+conversation_log에 저장된 LLM 감정 라벨로 문자 n-gram 나이브 베이즈 모델을 학습하고,
+검증 세트에서 확신도 임계값별로 LLM과의 일치율과 절약되는 LLM 호출 비율을 보고합니다.
+보고서는 reports/sentiment_calibration.json에 저장되며, 권장 임계값을
+SENTIMENT_LOCAL_CONFIDENCE로 설정하면 됩니다.
+
+실행 예시:
+    python scripts/train_sentiment_classifier.py
+    python scripts/train_sentiment_classifier.py --target-agreement 0.97
+    python scripts/train_sentiment_classifier.py --holdout 0.3 --report-only
+
+옵션:
+    --holdout FLOAT           검증 세트 비율 (기본 0.2)
+    --target-agreement FLOAT  권장 임계값 기준 LLM 일치율 (기본 0.95)
+    --report-only             보정 보고서만 만들고 모델은 저장하지 않음
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+
+from app.database import SessionLocal
+from app.models.conversation_log import ConversationLog
+from app.services.sentiment_classifier import LABELS, NaiveBayesModel, SentimentClassifier, default_model_path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+REPORT_PATH = PROJECT_ROOT / "reports" / "sentiment_calibration.json"
+THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.97, 0.99)
+
+
+def load_labeled() -> list[tuple[str, str]]:
+    """LLM이 분류한 (답변, 감정) 쌍 - 표준 라벨('긍정', '중립', '부정')만 사용"""
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ConversationLog.answer, ConversationLog.sentiment)
+            .filter(ConversationLog.sentiment.isnot(None))
+            .all()
+        )
+    finally:
+        db.close()
+    samples = []
+    for answer, sentiment in rows:
+        label = (sentiment or "").strip()
+        if answer and label in LABELS:
+            samples.append((answer, label))
+    return samples
+
+
+def calibrate(classifier: SentimentClassifier, holdout: list[tuple[str, str]]) -> list[dict]:
+    """임계값별 로컬 처리 비율(coverage)과 LLM 라벨 일치율"""
+    predictions = []
+    started = time.perf_counter()
+    for text, label in holdout:
+        predictions.append((classifier.predict(text), label))
+    per_call_us = (time.perf_counter() - started) / max(len(holdout), 1) * 1_000_000
+
+    rows = []
+    for threshold in THRESHOLDS:
+        local = [(p, label) for p, label in predictions if p.confidence >= threshold]
+        agree = sum(1 for p, label in local if p.label == label)
+        coverage = len(local) / len(predictions) if predictions else 0.0
+        agreement = agree / len(local) if local else None
+        rows.append({
+            "threshold": threshold,
+            "llm_calls_saved": round(coverage, 3),
+            "local_agreement": round(agreement, 3) if agreement is not None else None,
+            # 로컬에서 처리하지 않은 입력은 LLM이 그대로 분류하므로 일치로 간주
+            "overall_agreement": round(coverage * (agreement or 0.0) + (1 - coverage), 3),
+            "avg_local_latency_us": round(per_call_us, 1),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 감정 분류기 학습 및 보정")
+    parser.add_argument("--holdout", type=float, default=0.2, help="검증 세트 비율")
+    parser.add_argument("--target-agreement", type=float, default=0.95, help="권장 임계값 기준 LLM 일치율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report-only", action="store_true", help="모델 파일을 저장하지 않음")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("🧪 로컬 감정 분류기 학습 / 보정")
+    print("=" * 60)
+
+    samples = load_labeled()
+    if len(samples) < 20:
+        print(f"⚠️ 학습 데이터가 부족합니다 ({len(samples)}건). 대화 로그가 더 쌓인 뒤 실행하세요.")
+        return
+
+    random.Random(args.seed).shuffle(samples)
+    split = int(len(samples) * (1 - args.holdout))
+    train, holdout = samples[:split], samples[split:]
+    distribution = {label: sum(1 for _, l in samples if l == label) for label in LABELS}
+    print(f"   데이터: {len(samples)}건 (학습 {len(train)} / 검증 {len(holdout)}), 분포 {distribution}")
+
+    classifier = SentimentClassifier(NaiveBayesModel.train(train), threshold=1.0)
+    table = calibrate(classifier, holdout)
+
+    print(f"\n{'임계값':>8}{'LLM 절약':>12}{'로컬 일치율':>14}{'전체 일치율':>14}")
+    for row in table:
+        local_agreement = f"{row['local_agreement']:.1%}" if row["local_agreement"] is not None else "-"
+        print(f"{row['threshold']:>8.2f}{row['llm_calls_saved']:>12.1%}{local_agreement:>14}{row['overall_agreement']:>14.1%}")
+
+    eligible = [
+        r for r in table
+        if r["local_agreement"] is not None and r["local_agreement"] >= args.target_agreement
+    ]
+    recommended = min(eligible, key=lambda r: r["threshold"]) if eligible else None
+    if recommended:
+        print(f"\n✅ 권장 SENTIMENT_LOCAL_CONFIDENCE={recommended['threshold']} "
+              f"(LLM 호출 {recommended['llm_calls_saved']:.1%} 절약, 일치율 {recommended['local_agreement']:.1%})")
+    else:
+        print(f"\n⚠️ 일치율 {args.target_agreement:.0%}를 만족하는 임계값이 없습니다. 로컬 분류기를 끄거나 데이터를 늘리세요.")
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "samples": len(samples),
+        "train": len(train),
+        "holdout": len(holdout),
+        "label_distribution": distribution,
+        "target_agreement": args.target_agreement,
+        "recommended_threshold": recommended["threshold"] if recommended else None,
+        "thresholds": table,
+    }
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 보정 보고서 저장: {REPORT_PATH}")
+
+    if not args.report_only:
+        # 보고서는 검증 세트 기준, 배포 모델은 전체 데이터로 다시 학습
+        path = default_model_path()
+        NaiveBayesModel.train(samples).save(path)
+        print(f"💾 모델 저장: {path} (서버 재시작 시 적용)")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()